@@ -1,12 +1,17 @@
 import os
-import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from project_index import ProjectIndex
+from source_scan import ImportAnalyzer, SourceScan
 
 EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
 
-def find_actual_path(base_dir, path_parts):
+def find_actual_path(index, base_dir, path_parts):
     """
     Given a list of path parts (['utils', 'mockProfileData']), 
-    finds the actual casing on disk by traversing step-by-step.
+    finds the actual casing on disk by traversing step-by-step
+    through the project index (see scripts/project_index.py).
     """
     current_path = base_dir
     actual_parts = []
@@ -17,74 +22,60 @@ def find_actual_path(base_dir, path_parts):
             actual_parts.append(part)
             continue
             
-        if not os.path.exists(current_path):
-            return None
-            
-        # List all items in the current directory
-        try:
-            items = os.listdir(current_path)
-        except OSError:
-            return None
-
         # Find the item that matches the part (case-insensitive)
-        found = False
-        for item in items:
-            if item.lower() == part.lower():
-                # If there's an exact match, use it. Otherwise, use the disk version.
-                # If it's a file, we check against common JS extensions
-                item_no_ext = os.path.splitext(item)[0]
-                if item.lower() == part.lower() or item_no_ext.lower() == part.lower():
-                    actual_parts.append(item_no_ext if '.' not in part else item)
-                    current_path = os.path.join(current_path, item)
-                    found = True
-                    break
-        
-        if not found:
+        item = index.actual_case(current_path, part)
+        if item is None:
             return None
             
+        item_no_ext = os.path.splitext(item)[0]
+        actual_parts.append(item_no_ext if '.' not in part else item)
+        current_path = os.path.join(current_path, item)
+            
     return "/".join(actual_parts)
 
+def casing_fixes(index, file_path, imports):
+    """
+    (line, old, new) for every relative import of one file whose casing
+    differs from the disk; ``imports`` are the file's [specifier, kind, line]
+    entries from the source scan (see scripts/source_scan.py).
+    """
+    root = os.path.dirname(file_path)
+    fixes = []
+    for imp_path, _, line in imports:
+        if imp_path.startswith('.'):
+            parts = imp_path.split('/')
+            # Try to find the real path on disk
+            corrected_path = find_actual_path(index, root, parts)
+            
+            if corrected_path and corrected_path != imp_path:
+                fixes.append((line, imp_path, corrected_path))
+    return fixes
+
 def fix_deep_imports():
     project_root = os.getcwd()
-    # Matches: import ... from './path' or require('./path')
-    import_re = re.compile(r'((?:from|require)\s*\(?\s*[\'"])(.+?)([\'"]\s*\)?)')
 
     print("🚀 Starting Deep Path Case Correction...")
+    index = ProjectIndex.load(project_root, exclude_dirs={'node_modules', '.git'})
+    scan = SourceScan(index, [ImportAnalyzer()]).run()
 
-    for root, dirs, files in os.walk(project_root):
-        if 'node_modules' in root or '.git' in root:
+    for rel_path, imports in scan.results['imports'].items():
+        if not rel_path.endswith(EXTENSIONS):
             continue
-            
-        for name in files:
-            if name.endswith(EXTENSIONS):
-                file_path = os.path.join(root, name)
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
+        file_path = index.abspath(rel_path)
+        fixes = casing_fixes(index, file_path, imports)
+        if not fixes:
+            continue
+        
+        # Only files with something to fix are read again, to rewrite them
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
 
-                new_lines = []
-                changed = False
-                
-                for line in lines:
-                    match = import_re.search(line)
-                    if match:
-                        prefix, imp_path, suffix = match.groups()
-                        
-                        if imp_path.startswith('.'):
-                            parts = imp_path.split('/')
-                            # Try to find the real path on disk
-                            corrected_path = find_actual_path(root, parts)
-                            
-                            if corrected_path and corrected_path != imp_path:
-                                print(f"📝 {name}: '{imp_path}' ➔ '{corrected_path}'")
-                                line = line.replace(imp_path, corrected_path)
-                                changed = True
-                    
-                    new_lines.append(line)
+        for line, imp_path, corrected_path in fixes:
+            print(f"📝 {os.path.basename(file_path)}: '{imp_path}' ➔ '{corrected_path}'")
+            lines[line - 1] = lines[line - 1].replace(imp_path, corrected_path)
 
-                if changed:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.writelines(new_lines)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
 
 if __name__ == "__main__":
     fix_deep_imports()
@@ -1,13 +1,131 @@
 const { onCall, HttpsError } = require("firebase-functions/v2/https");
 const { logger } = require("firebase-functions");
-const { exec } = require("child_process");
-const { promisify } = require("util");
+const { spawn } = require("child_process");
+const readline = require("readline");
 const path = require("path");
 const fs = require("fs");
 
 const { FUNCTION_CONFIG } = require("../../../Medishift/functions/config/keysDatabasections/config/keysDatabase");
 
-const execAsync = promisify(exec);
+const WORKER_SCRIPT_PATH = path.join(__dirname, "../organization/teamOrganigramWorker.py");
+const WORKER_REQUEST_TIMEOUT_MS = 50000;
+// Memoized results share the 512MiB instance with Node, the worker's graphs and the analysis itself.
+const WORKER_CACHE_MB = 32;
+
+/**
+ * Long-running teamOrganigramWorker.py process shared by all invocations of this
+ * instance. Requests and responses are newline-delimited JSON matched by id, so the
+ * interpreter starts once instead of once per call and payloads never go through argv.
+ * The worker reads its stdin one line at a time, so requests are sent one at a time and
+ * each timeout only covers that request's own analysis.
+ */
+class OrganigramWorkerClient {
+  constructor(scriptPath) {
+    this.scriptPath = scriptPath;
+    this.process = null;
+    this.nextId = 1;
+    this.current = null;
+    this.queue = [];
+  }
+
+  ensureStarted() {
+    if (this.process) {
+      return;
+    }
+
+    const child = spawn("python3", [this.scriptPath, "--cache-mb", String(WORKER_CACHE_MB)], {
+      stdio: ["pipe", "pipe", "pipe"]
+    });
+    this.process = child;
+
+    readline.createInterface({ input: child.stdout }).on("line", (line) => this.handleLine(line));
+    child.stderr.on("data", (chunk) => {
+      const text = chunk.toString();
+      if (!text.includes("WARNING") && !text.includes("INFO")) {
+        logger.warn(`[OrganigramWorker] stderr: ${text}`);
+      }
+    });
+    child.on("error", (error) => this.handleExit(child, error));
+    // EPIPE when the worker died between two writes; without a listener it would crash the instance.
+    child.stdin.on("error", (error) => this.handleExit(child, error));
+    child.on("exit", (code, signal) => {
+      this.handleExit(child, new Error(`Analysis worker exited (code ${code}, signal ${signal})`));
+    });
+  }
+
+  handleLine(line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (parseError) {
+      logger.error("[OrganigramWorker] Failed to parse worker output", {
+        line: line.substring(0, 500),
+        error: parseError.message
+      });
+      return;
+    }
+
+    const entry = this.current;
+    if (!entry || entry.id !== message.id) {
+      return;
+    }
+    this.current = null;
+    clearTimeout(entry.timer);
+
+    if (message.error) {
+      entry.reject(new Error(message.error));
+    } else {
+      entry.resolve(message.result);
+    }
+    this.pump();
+  }
+
+  handleExit(child, error) {
+    // Late events of a worker that was already replaced are ignored.
+    if (this.process !== child) {
+      return;
+    }
+    this.process = null;
+    const entry = this.current;
+    this.current = null;
+    if (entry) {
+      clearTimeout(entry.timer);
+      entry.reject(error);
+    }
+    this.pump();
+  }
+
+  request(op, data) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ op, data, resolve, reject });
+      this.pump();
+    });
+  }
+
+  pump() {
+    if (this.current || this.queue.length === 0) {
+      return;
+    }
+    this.ensureStarted();
+    const child = this.process;
+    const { op, data, resolve, reject } = this.queue.shift();
+    const id = this.nextId++;
+    const timer = setTimeout(() => {
+      // A stuck worker would block every later request; detach it before killing it
+      // so the next request starts a fresh one.
+      this.handleExit(child, new Error("Analysis timed out"));
+      child.kill();
+    }, WORKER_REQUEST_TIMEOUT_MS);
+
+    this.current = { id, resolve, reject, timer };
+    child.stdin.write(`${JSON.stringify({ id, op, data })}\n`);
+  }
+}
+
+const organigramWorker = new OrganigramWorkerClient(WORKER_SCRIPT_PATH);
+
+// Graphs kept by the worker are namespaced per caller so one user cannot patch another's graph.
+const scopedGraphId = (uid, graphId) => `${uid}:${graphId}`;
 
 exports.analyzeTeamOrganigram = onCall(
   {
@@ -26,7 +144,7 @@ exports.analyzeTeamOrganigram = onCall(
       );
     }
 
-    const { roles, employees, adminRightsHierarchy } = request.data;
+    const { roles, employees, adminRightsHierarchy, graphId, format } = request.data;
 
     if (!roles || !Array.isArray(roles)) {
       throw new HttpsError(
@@ -56,54 +174,34 @@ exports.analyzeTeamOrganigram = onCall(
         adminLevelsCount: adminRightsHierarchy.length
       });
 
-      const scriptPath = path.join(__dirname, "../organization/teamOrganigramAnalyzer.py");
-      
-      if (!fs.existsSync(scriptPath)) {
-        logger.error(`${logPrefix} Python script not found at ${scriptPath}`);
+      if (!fs.existsSync(WORKER_SCRIPT_PATH)) {
+        logger.error(`${logPrefix} Python worker not found at ${WORKER_SCRIPT_PATH}`);
         throw new HttpsError(
           "internal",
           "Analysis service unavailable"
         );
       }
 
-      const inputData = JSON.stringify({
-        roles,
-        employees,
-        adminRightsHierarchy
-      });
-
-      const pythonCommand = `python3 "${scriptPath}" '${inputData.replace(/'/g, "'\\''")}'`;
-
-      logger.info(`${logPrefix} Executing Python script`);
-
-      const { stdout, stderr } = await execAsync(pythonCommand, {
-        maxBuffer: 10 * 1024 * 1024,
-        timeout: 50000
-      });
-
-      if (stderr && !stderr.includes("WARNING") && !stderr.includes("INFO")) {
-        logger.warn(`${logPrefix} Python script stderr: ${stderr}`);
-      }
+      logger.info(`${logPrefix} Sending request to analysis worker`);
 
+      // With a graphId the worker keeps the graph so later edits can go through
+      // applyTeamOrganigramEvents and return only a delta.
       let result;
       try {
-        result = JSON.parse(stdout);
-      } catch (parseError) {
-        logger.error(`${logPrefix} Failed to parse Python output`, {
-          stdout: stdout.substring(0, 500),
-          error: parseError.message
+        result = await organigramWorker.request(graphId ? "openGraph" : "analyze", {
+          graphId: graphId && scopedGraphId(request.auth.uid, graphId),
+          roles,
+          employees,
+          adminRightsHierarchy,
+          format: format === "compact" ? "compact" : "full"
+        });
+      } catch (workerError) {
+        logger.error(`${logPrefix} Analysis worker returned error`, {
+          error: workerError.message
         });
         throw new HttpsError(
           "internal",
-          "Failed to parse analysis results"
-        );
-      }
-
-      if (result.error) {
-        logger.error(`${logPrefix} Python script returned error`, result);
-        throw new HttpsError(
-          "internal",
-          result.error || "Analysis failed"
+          workerError.message || "Analysis failed"
         );
       }
 
@@ -112,9 +210,10 @@ exports.analyzeTeamOrganigram = onCall(
         edgesCount: result.edges?.length || 0
       });
 
+      // The worker knows the graph by its scoped id; clients only ever see their own.
       return {
         success: true,
-        graphData: result
+        graphData: graphId ? { ...result, graphId } : result
       };
     } catch (error) {
       logger.error(`${logPrefix} Error during analysis`, {
@@ -134,3 +233,74 @@ exports.analyzeTeamOrganigram = onCall(
   }
 );
 
+
+exports.applyTeamOrganigramEvents = onCall(
+  {
+    ...FUNCTION_CONFIG,
+    maxInstances: 10,
+    timeoutSeconds: 60,
+    memory: "512MiB"
+  },
+  async (request) => {
+    const logPrefix = `[ApplyTeamOrganigramEvents-${request.auth ? request.auth.uid : "anon"}-${Date.now()}]`;
+
+    if (!request.auth) {
+      throw new HttpsError(
+        "unauthenticated",
+        "User must be authenticated to update team organigram"
+      );
+    }
+
+    const { graphId, events } = request.data;
+
+    if (!graphId || typeof graphId !== "string") {
+      throw new HttpsError(
+        "invalid-argument",
+        "graphId must be provided as a string"
+      );
+    }
+
+    if (!events || !Array.isArray(events)) {
+      throw new HttpsError(
+        "invalid-argument",
+        "events must be provided as an array"
+      );
+    }
+
+    let delta;
+    try {
+      delta = await organigramWorker.request("applyEvents", {
+        graphId: scopedGraphId(request.auth.uid, graphId),
+        events
+      });
+    } catch (workerError) {
+      // Graphs live in one worker of one instance; the client re-runs analyzeTeamOrganigram.
+      if (workerError.message.startsWith("LookupError")) {
+        throw new HttpsError(
+          "not-found",
+          "Organigram graph not loaded, request a full analysis"
+        );
+      }
+
+      logger.error(`${logPrefix} Analysis worker returned error`, {
+        error: workerError.message
+      });
+      throw new HttpsError(
+        "internal",
+        `Update failed: ${workerError.message}`
+      );
+    }
+
+    logger.info(`${logPrefix} Events applied`, {
+      eventsCount: events.length,
+      addedEdgesCount: delta.addedEdges.length,
+      removedEdgesCount: delta.removedEdges.length
+    });
+
+    return {
+      success: true,
+      delta: { ...delta, graphId }
+    };
+  }
+);
+
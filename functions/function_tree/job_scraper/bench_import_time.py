@@ -0,0 +1,138 @@
+"""
+Scraper import-time budget - serverless cold starts
+
+Imports every scraper entry point in a fresh interpreter under ``python -X importtime``
+and reports the cumulative import time of the entry module, best of --repeat runs, with
+its heaviest direct imports. The script exits non-zero when an entry point is over the
+budget or pulls in a module that must stay lazy (optional dependencies and the stdlib
+modules only some commands need, see LAZY_MODULES).
+
+Bytecode is written by a warm-up run first (PYTHONDONTWRITEBYTECODE is cleared for the
+subprocesses), so the timings exclude compiling the sources, as on a deployed function.
+Interpreter startup itself is not counted.
+
+Usage:
+    python3 bench_import_time.py
+    python3 bench_import_time.py --budget-ms 100 --repeat 10 --top 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (module whose import is timed, statement run in the fresh interpreter)
+ENTRY_POINTS = {
+    "scraper": ("scraper", "import scraper"),
+    "one adapter": ("scraper", "import scraper; scraper.ADAPTERS['indeed']"),
+    "main": ("main", "import main"),
+    "test_scraper_python": ("test_scraper_python", "import test_scraper_python"),
+}
+
+# Imported on first use inside scraper.py; none of them may load at import time
+LAZY_MODULES = ("aiohttp", "bs4", "orjson", "defusedxml", "argparse", "email.utils", "urllib.robotparser")
+
+# ~110 ms measured on one slow core, 80 of them asyncio, which every entry point needs;
+# the eager imports this budget guards against added ~45 ms
+DEFAULT_BUDGET_MS = 140.0
+
+
+def run_importtime(statement: str) -> str:
+    """stderr of ``python -X importtime -c statement`` run from the scraper directory."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=HERE, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    return proc.stderr
+
+
+def parse_importtime(output: str) -> List[Tuple[int, int, int, str]]:
+    """[(depth, self us, cumulative us, module)] in the order -X importtime prints them."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip(" ")
+        rows.append(((len(name) - len(stripped) - 1) // 2, int(fields[0]), int(fields[1]), stripped))
+    return rows
+
+
+def entry_cost(rows: List[Tuple[int, int, int, str]], module: str):
+    """(cumulative us, {direct import: cumulative us}) of ``module``, or None if it was not imported.
+
+    -X importtime prints a module after its imports, so its children are the rows just
+    above it that sit one level deeper.
+    """
+    for i, (depth, _, cumulative, name) in enumerate(rows):
+        if name != module:
+            continue
+        children = {}
+        for child_depth, _, child_cumulative, child in reversed(rows[:i]):
+            if child_depth <= depth:
+                break
+            if child_depth == depth + 1:
+                children[child] = child_cumulative
+        return cumulative, children
+    return None
+
+
+def time_entry(module: str, statement: str, repeat: int):
+    """(best cumulative us, direct imports of that run, every module imported)."""
+    run_importtime(statement)  # warm-up: writes the bytecode
+    best = None
+    for _ in range(repeat):
+        rows = parse_importtime(run_importtime(statement))
+        cost = entry_cost(rows, module)
+        if cost is None:
+            raise RuntimeError(f"{module} was not imported")
+        if best is None or cost[0] < best[0]:
+            best = (cost[0], cost[1], {name for _, _, _, name in rows})
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of the scraper entry points")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum cumulative import time per entry point (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per entry point; the best is reported")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest direct imports shown per entry point")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS),
+                        help="Only time this entry point; repeatable (default: all)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"Import time, best of {args.repeat} (budget {args.budget_ms:.0f} ms):")
+    for name in args.entry or ENTRY_POINTS:
+        module, statement = ENTRY_POINTS[name]
+        try:
+            cumulative, children, loaded = time_entry(module, statement, args.repeat)
+        except RuntimeError as e:
+            print(f"  {name:<20} ERROR: {e}")
+            failures.append(f"{name} could not be imported")
+            continue
+        ms = cumulative / 1000
+        print(f"  {name:<20} {ms:9.1f} ms{'  OVER BUDGET' if ms > args.budget_ms else ''}")
+        for child, child_us in sorted(children.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"      {child:<24} {child_us / 1000:9.1f} ms")
+        if ms > args.budget_ms:
+            failures.append(f"{name} takes {ms:.1f} ms to import")
+        eager = [lazy for lazy in LAZY_MODULES if lazy in loaded]
+        if eager:
+            failures.append(f"{name} imports {', '.join(eager)} eagerly")
+
+    for failure in failures:
+        print(f"ERROR: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
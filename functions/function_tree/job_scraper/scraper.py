@@ -13,18 +13,27 @@ Usage examples:
   python scapholf.py --sites jobs.ch indeed aurawoo swissmedicsjobs adecco jobboardfinder \
       --query "nurse" --location "Zurich" --max-pages 3 --concurrency 6 --out-jsonl jobs.jsonl
 
+  # Discover detail pages from sitemaps / RSS / Atom feeds, only entries changed since the last run
+  python scapholf.py --sites all --query "nurse" --discovery auto --state-file discovery_state.json \
+      --max-pages 50 --out-jsonl jobs.jsonl
+
 Notes:
   - LinkedIn & TieTalent adapters are stubs (respect ToS; use official feeds/APIs).
   - Adapters rely on JSON-LD JobPosting when available; selectors are deliberately minimal.
+  - Importing this module stays cheap for serverless cold starts: optional dependencies
+    and the heavier stdlib modules are imported on first use, adapters are instantiated
+    on first lookup (see ADAPTERS). bench_import_time.py checks the budget.
 """
 
 from __future__ import annotations
 
-import argparse
 import asyncio
 import contextlib
 import csv
 import dataclasses
+import gzip
+import importlib
+import io
 import json
 import os
 import random
@@ -32,24 +41,36 @@ import re
 import sys
 import time
 import urllib.parse
-import urllib.robotparser
 from collections import defaultdict, deque
+from collections.abc import Mapping
 from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from functools import lru_cache
 from html import unescape
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
-# Optional fast JSON
-try:
-    import orjson  # type: ignore
-except Exception:  # pragma: no cover
-    orjson = None  # fallback to stdlib json
 
-# Optional BS4
-try:
-    from bs4 import BeautifulSoup  # type: ignore
-except Exception:
-    BeautifulSoup = None
+@lru_cache(maxsize=None)
+def optional_import(name: str) -> Optional[Any]:
+    """Import an optional dependency on first use; None when it is not installed.
+
+    Used for orjson (faster JSON), bs4 (HTML parsing), aiohttp (HTTP) and defusedxml
+    (hardened XML), so a process that never needs them never pays for importing them.
+    """
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def xml_iterparse(source: Any, events: Sequence[str]) -> Iterable[Tuple[str, Any]]:
+    # why: prefer the hardened parser for third-party sitemaps/feeds when installed
+    defused = optional_import("defusedxml.ElementTree")
+    if defused is not None:
+        return defused.iterparse(source, events=events)
+    from xml.etree.ElementTree import iterparse
+    return iterparse(source, events=events)
 
 DEFAULT_UA = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
@@ -85,7 +106,8 @@ class RobotsCache:
         self.user_agent = user_agent
         self.cache: Dict[str, urllib.robotparser.RobotFileParser] = {}
 
-    def can_fetch(self, url: str) -> bool:
+    def _parser(self, url: str) -> urllib.robotparser.RobotFileParser:
+        import urllib.robotparser  # why: pulls in urllib.request and ssl; only needed once crawling
         parsed = urlparse(url)
         robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
         rp = self.cache.get(parsed.netloc)
@@ -95,6 +117,16 @@ class RobotsCache:
                 rp.set_url(robots_url)
                 rp.read()
             self.cache[parsed.netloc] = rp
+        return rp
+
+    def sitemaps(self, url: str) -> List[str]:
+        """Sitemap URLs advertised in robots.txt for the host of ``url``."""
+        with contextlib.suppress(Exception):
+            return list(self._parser(url).site_maps() or [])
+        return []
+
+    def can_fetch(self, url: str) -> bool:
+        rp = self._parser(url)
         with contextlib.suppress(Exception):
             allowed = rp.can_fetch(self.user_agent, url)
             return bool(allowed)
@@ -118,6 +150,7 @@ class RateLimiter:
 
 
 def safe_json_dumps(obj: Any) -> bytes:
+    orjson = optional_import("orjson")
     if orjson:
         # why: keep exact bytes for fast streaming
         return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -130,8 +163,23 @@ def normalize_space(s: Optional[str]) -> Optional[str]:
     return re.sub(r"\s+", " ", unescape(s)).strip() or None
 
 
+# Matches exactly what urlparse() reports as netloc (text between '//' and the next '/', '?' or '#').
+_NETLOC_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)")
+
+
+def url_host(url: str) -> str:
+    m = _NETLOC_RE.match(url)
+    return m.group(1) if m else urlparse(url).netloc
+
+
+@lru_cache(maxsize=256)
+def base_host(url: str) -> str:
+    # why: list pages are classified link-by-link against the same base; parse it once
+    return url_host(url)
+
+
 def same_host(url: str, base: str) -> bool:
-    return urlparse(url).netloc == urlparse(base).netloc
+    return url_host(url) == base_host(base)
 
 
 def default_headers(user_agent: str) -> Dict[str, str]:
@@ -144,19 +192,25 @@ def default_headers(user_agent: str) -> Dict[str, str]:
 
 
 async def http_get(url: str, timeout: float, headers: Dict[str, str], robots: RobotsCache,
-                   limiter: RateLimiter, max_retries: int = 3) -> Optional[str]:
+                   limiter: RateLimiter, max_retries: int = 3, binary: bool = False) -> Optional[Any]:
     if not robots.can_fetch(url):
         sys.stderr.write(f"[robots] Disallowed: {url}\n")
         return None
     await limiter.wait(url)
+    aiohttp = optional_import("aiohttp")
+    if aiohttp is None:
+        # why: retrying cannot install it; fail once instead of sleeping through every attempt
+        sys.stderr.write(f"[fetch] Failed {url}: aiohttp is not installed\n")
+        return None
     backoff = 0.75
     for attempt in range(1, max_retries + 1):
         try:
-            import aiohttp  # local import to avoid hard dep if unused
             async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout), headers=headers) as sess:
                 async with sess.get(url, allow_redirects=True) as resp:
                     if resp.status >= 400:
                         raise RuntimeError(f"HTTP {resp.status}")
+                    if binary:
+                        return await resp.read()  # why: .xml.gz sitemaps are raw gzip, not Content-Encoding
                     ct = resp.headers.get("Content-Type", "")
                     if "text/html" not in ct and "application/xhtml+xml" not in ct:
                         body = await resp.text(errors="ignore")
@@ -294,8 +348,9 @@ def extract_ld_json_jobpostings(html: str, base_url: str, source_name: str) -> L
 
 def html_links(html: str, base_url: str) -> List[str]:
     links: List[str] = []
-    if BeautifulSoup:
-        soup = BeautifulSoup(html, "html.parser")
+    bs4 = optional_import("bs4")
+    if bs4:
+        soup = bs4.BeautifulSoup(html, "html.parser")
         for a in soup.find_all("a", href=True):
             href = a["href"]
             href = urljoin(base_url, href)
@@ -307,6 +362,155 @@ def html_links(html: str, base_url: str) -> List[str]:
     return links
 
 
+# ----------------------------
+# Sitemap / feed discovery
+# ----------------------------
+
+DiscoveryEntry = Tuple[str, Optional[datetime]]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse W3C datetime (sitemaps, Atom) or RFC 822 (RSS pubDate); naive values are taken as UTC."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        import email.utils  # why: only RSS pubDate values get here
+        try:
+            dt = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def is_fresh(lastmod: Optional[datetime], since: Optional[datetime]) -> bool:
+    # why: entries without a date cannot be proven stale, so keep them
+    return since is None or lastmod is None or lastmod >= since
+
+
+_DISCOVERY_CONTAINERS = ("sitemap", "url", "item", "entry")
+
+
+def _local_name(tag: Any) -> str:
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def parse_discovery_document(body: bytes) -> Tuple[List[DiscoveryEntry], List[DiscoveryEntry]]:
+    """Parse a sitemap, sitemap index, RSS or Atom document (optionally gzipped).
+
+    Returns ``(child_sitemaps, pages)`` as ``(url, lastmod)`` pairs. Elements are cleared as
+    they are consumed so 50k-URL sitemaps stay flat in memory.
+    """
+    if body[:2] == b"\x1f\x8b":
+        with contextlib.suppress(Exception):
+            body = gzip.decompress(body)
+    children: List[DiscoveryEntry] = []
+    pages: List[DiscoveryEntry] = []
+    fields: Dict[str, str] = {}
+    try:
+        for event, elem in xml_iterparse(io.BytesIO(body), events=("start", "end")):
+            name = _local_name(elem.tag)
+            if event == "start":
+                if name in _DISCOVERY_CONTAINERS:
+                    fields = {}  # why: drop channel/feed-level <link> seen before the first item
+                continue
+            if name in ("loc", "lastmod", "pubdate", "updated", "published"):
+                fields.setdefault(name, (elem.text or "").strip())
+            elif name == "link":
+                # RSS: <link>url</link>; Atom: <link href="url" rel="alternate"/>
+                href = elem.get("href") or (elem.text or "").strip()
+                if href and elem.get("rel", "alternate") == "alternate":
+                    fields.setdefault("link", href)
+            elif name in _DISCOVERY_CONTAINERS:
+                loc = fields.get("loc") or fields.get("link")
+                date = fields.get("lastmod") or fields.get("updated") or fields.get("pubdate") or fields.get("published")
+                if loc:
+                    # why: the XML parser already decoded entities; html.unescape would turn &copy=2 into ©=2
+                    (children if name == "sitemap" else pages).append((loc, parse_lastmod(date)))
+                fields = {}
+                elem.clear()
+    except Exception as e:
+        sys.stderr.write(f"[discovery] Unparseable document: {e}\n")
+    return children, pages
+
+
+def load_discovery_state(path: Optional[str]) -> Dict[str, str]:
+    if not path or not os.path.exists(path):
+        return {}
+    with contextlib.suppress(Exception):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return {str(k): str(v) for k, v in data.items()}
+    return {}
+
+
+def save_discovery_state(path: Optional[str], state: Dict[str, str]) -> None:
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ----------------------------
+# Link classification rules
+# ----------------------------
+
+DEFAULT_DETAIL_PATTERNS: Tuple[str, ...] = ("job", "stelle", "vacanc", "offer", "position")
+DEFAULT_PAGINATION_PATTERNS: Tuple[str, ...] = ("page=", "seite=", "pagenumber=", "start=", "offset=")
+
+
+class LinkRules:
+    """Detail/pagination patterns compiled into a single case-insensitive regex.
+
+    Patterns are regex fragments matched anywhere in the absolute URL. Both groups sit in
+    optional lookaheads so one ``match`` call at position 0 classifies a link as detail,
+    pagination, both or neither.
+    """
+    def __init__(self, detail: Sequence[str], pagination: Sequence[str]) -> None:
+        self.detail = tuple(detail)
+        self.pagination = tuple(pagination)
+        self.regex = re.compile(
+            f"(?=(?:.*?(?P<page>{self._alternation(self.pagination)}))?)"
+            f"(?=(?:.*?(?P<detail>{self._alternation(self.detail)}))?)",
+            re.IGNORECASE | re.DOTALL,
+        )
+
+    @staticmethod
+    def _alternation(patterns: Tuple[str, ...]) -> str:
+        # An empty alternation must never match; (?!) keeps the group syntax valid.
+        return "|".join(f"(?:{p})" for p in patterns) or "(?!)"
+
+    def is_detail(self, url: str) -> bool:
+        return self.regex.match(url).group("detail") is not None
+
+    def classify(self, links: Iterable[str], url: str) -> Tuple[List[str], Optional[str]]:
+        host = base_host(url)
+        match = self.regex.match
+        job_like: Dict[str, None] = {}
+        next_page = None
+        for href in links:
+            if url_host(href) != host:
+                continue
+            m = match(href)
+            if m.group("detail") is not None:
+                job_like[href] = None
+            if next_page is None and m.group("page") is not None:
+                next_page = href
+        return list(job_like), next_page
+
+
+@lru_cache(maxsize=None)
+def compile_link_rules(detail: Tuple[str, ...], pagination: Tuple[str, ...]) -> LinkRules:
+    return LinkRules(detail, pagination)
+
+
 # ----------------------------
 # Adapter interface & registry
 # ----------------------------
@@ -314,27 +518,30 @@ def html_links(html: str, base_url: str) -> List[str]:
 class BaseAdapter:
     name: str = "base"
     domains: Sequence[str] = ()
+    # Declarative link rules; override per site instead of overriding parse_list_page.
+    detail_patterns: Sequence[str] = DEFAULT_DETAIL_PATTERNS
+    pagination_patterns: Sequence[str] = DEFAULT_PAGINATION_PATTERNS
+    # Discovery sources; when both are empty, robots.txt Sitemap: lines and /sitemap.xml are tried.
+    sitemap_urls: Sequence[str] = ()
+    feed_urls: Sequence[str] = ()
+
+    @property
+    def link_rules(self) -> LinkRules:
+        return compile_link_rules(tuple(self.detail_patterns), tuple(self.pagination_patterns))
 
     def build_seed_urls(self, query: str, location: Optional[str]) -> List[str]:
         raise NotImplementedError
 
     def parse_list_page(self, html: str, url: str) -> Tuple[List[str], Optional[str]]:
-        # Default heuristic: collect in-domain links that look like job detail pages.
-        links = html_links(html, url)
-        job_like = []
-        for href in links:
-            if not same_host(href, url):
-                continue
-            if any(key in href.lower() for key in ("job", "jobs", "stelle", "vacanc", "offer", "position")):
-                job_like.append(href)
-        # Pagination heuristic
-        next_page = None
-        for href in links:
-            low = href.lower()
-            if same_host(href, url) and any(k in low for k in ("page=", "seite=", "pagenumber=", "start=", "offset=")):
-                next_page = href
-                break
-        return list(dict.fromkeys(job_like)), next_page
+        # Default heuristic: in-domain links that look like job detail pages, plus the first pagination link.
+        return self.link_rules.classify(html_links(html, url), url)
+
+    def discovery_urls(self, robots: RobotsCache) -> List[str]:
+        explicit = list(self.sitemap_urls) + list(self.feed_urls)
+        if explicit or not self.domains:
+            return explicit
+        root = f"https://{self.domains[0]}/"
+        return robots.sitemaps(root) or [urljoin(root, "sitemap.xml")]
 
     def parse_job_page(self, html: str, url: str) -> List[JobPosting]:
         jobs = extract_ld_json_jobpostings(html, url, self.name)
@@ -440,16 +647,58 @@ class TieTalentAdapter(BaseAdapter):
         )
 
 
-ADAPTERS: Dict[str, BaseAdapter] = {
-    "jobs.ch": JobsChAdapter(),
-    "indeed": IndeedChAdapter(),
-    "aurawoo": AurawooAdapter(),
-    "swissmedicsjobs": SwissMedicsJobsAdapter(),
-    "adecco": AdeccoChAdapter(),
-    "jobboardfinder": JobboardFinderAdapter(),
-    "linkedin": LinkedInAdapter(),
-    "tietalent": TieTalentAdapter(),
-}
+class AdapterRegistry(Mapping):
+    """Read-only ``{site name: adapter}`` mapping whose adapters are created on first lookup.
+
+    Adapters are registered with their class, or with a ``"module:Class"`` path for
+    adapters kept in their own module, which is then only imported when that site is
+    used. Listing the names (``keys()``, ``in``) never creates or imports anything.
+    """
+
+    def __init__(self) -> None:
+        self._factories: Dict[str, Any] = {}
+        self._instances: Dict[str, BaseAdapter] = {}
+        self._aliases: Dict[str, str] = {}
+
+    def register(self, name: str, factory: Any, aliases: Sequence[str] = ()) -> None:
+        self._factories[name] = factory
+        self._instances.pop(name, None)
+        for alias in aliases:
+            self._aliases[alias] = name
+
+    def canonical(self, name: str) -> str:
+        """Registered name for a site name or one of its synonyms (e.g. "jobsch" -> "jobs.ch")."""
+        return self._aliases.get(name, name)
+
+    def __getitem__(self, name: str) -> BaseAdapter:
+        adapter = self._instances.get(name)
+        if adapter is None:
+            factory = self._factories[name]
+            if isinstance(factory, str):
+                module_name, _, attr = factory.partition(":")
+                factory = getattr(importlib.import_module(module_name), attr)
+            adapter = self._instances[name] = factory()
+        return adapter
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+
+ADAPTERS = AdapterRegistry()
+ADAPTERS.register("jobs.ch", JobsChAdapter, aliases=("jobsch", "jobs"))
+ADAPTERS.register("indeed", IndeedChAdapter, aliases=("indeed.ch", "indeedch"))
+ADAPTERS.register("aurawoo", AurawooAdapter)
+ADAPTERS.register("swissmedicsjobs", SwissMedicsJobsAdapter)
+ADAPTERS.register("adecco", AdeccoChAdapter)
+ADAPTERS.register("jobboardfinder", JobboardFinderAdapter)
+ADAPTERS.register("linkedin", LinkedInAdapter)
+ADAPTERS.register("tietalent", TieTalentAdapter)
 
 # ----------------------------
 # Crawler
@@ -467,6 +716,9 @@ class ScapholfCrawler:
         timeout: float,
         user_agent: str,
         allow_domains: Optional[Sequence[str]] = None,
+        discovery: str = "crawl",
+        since: Optional[Dict[str, datetime]] = None,
+        max_discovery_docs: int = 20,
     ) -> None:
         self.adapters = adapters
         self.query = query
@@ -480,6 +732,11 @@ class ScapholfCrawler:
         self.allow_domains = set(allow_domains or [])
         self.visited: Set[str] = set()
         self.out_queue: asyncio.Queue[JobPosting] = asyncio.Queue()
+        self.discovery = discovery
+        self.since = since or {}
+        self.max_discovery_docs = max_discovery_docs
+        # site -> oldest lastmod among the fresh entries it left unread (None: nothing left)
+        self.discovered_sites: Dict[str, Optional[datetime]] = {}
 
     def domain_allowed(self, url: str) -> bool:
         if not self.allow_domains:
@@ -489,6 +746,81 @@ class ScapholfCrawler:
 
     async def crawl_site(self, adapter: BaseAdapter) -> None:
         seeds = adapter.build_seed_urls(self.query, self.location)
+        if self.discovery != "crawl":
+            if await self.discover_site(adapter) or self.discovery == "sitemap":
+                return
+        await self.crawl_listing(adapter, seeds)
+
+    async def discover_detail_urls(self, adapter: BaseAdapter) -> Tuple[Dict[str, Optional[datetime]], bool]:
+        """Walk sitemap indexes / sitemaps / feeds for fresh detail-page URLs.
+
+        Returns ``({url: lastmod}, complete)``; ``complete`` is False when a document could
+        not be fetched or --max-discovery-docs stopped the walk before every one was read.
+        """
+        since = self.since.get(adapter.name)
+        rules = adapter.link_rules
+        queue: deque[str] = deque(adapter.discovery_urls(self.robots))
+        seen: Set[str] = set()
+        found: Dict[str, Optional[datetime]] = {}
+        docs = 0
+        complete = True
+        while queue and docs < self.max_discovery_docs:
+            doc_url = queue.popleft()
+            if doc_url in seen or not self.domain_allowed(doc_url):
+                continue
+            seen.add(doc_url)
+            async with self.semaphore:
+                body = await http_get(doc_url, self.timeout, self.headers, self.robots, self.limiter, binary=True)
+            if not body:
+                complete = False
+                continue
+            docs += 1
+            children, pages = parse_discovery_document(body)
+            queue.extend(loc for loc, lastmod in children if is_fresh(lastmod, since))
+            for loc, lastmod in pages:
+                if is_fresh(lastmod, since) and rules.is_detail(loc):
+                    found.setdefault(loc, lastmod)
+        complete = complete and not any(url not in seen and self.domain_allowed(url) for url in queue)
+        return found, complete
+
+    async def fetch_detail(self, url: str) -> Optional[str]:
+        async with self.semaphore:
+            return await http_get(url, self.timeout, self.headers, self.robots, self.limiter)
+
+    async def discover_site(self, adapter: BaseAdapter) -> bool:
+        """Fetch detail pages found via discovery; False when none could be fetched."""
+        found, complete = await self.discover_detail_urls(adapter)
+        pending = deque(found)
+        unread: List[Optional[datetime]] = []
+        fetched = 0
+        while pending and fetched < self.max_pages_per_site:
+            # why: fetch up to the remaining page budget at once; failures are topped up next round
+            batch: List[str] = []
+            while pending and len(batch) < self.max_pages_per_site - fetched:
+                url = pending.popleft()
+                if url in self.visited or not self.domain_allowed(url):
+                    continue
+                self.visited.add(url)
+                batch.append(url)
+            pages = await asyncio.gather(*(self.fetch_detail(url) for url in batch))
+            for url, html in zip(batch, pages):
+                if not html:
+                    unread.append(found[url])
+                    continue
+                fetched += 1
+                for job in adapter.parse_job_page(html, url):
+                    await self.out_queue.put(job)
+        if fetched == 0:
+            return False
+        # why: the --state-file cutoff may only move past entries that were actually read.
+        # Unread entries without a lastmod pass is_fresh anyway; unread documents could hold anything.
+        if complete:
+            unread.extend(found[url] for url in pending)
+            dated = [lastmod for lastmod in unread if lastmod is not None]
+            self.discovered_sites[adapter.name] = min(dated) if dated else None
+        return True
+
+    async def crawl_listing(self, adapter: BaseAdapter, seeds: Sequence[str]) -> None:
         pages_crawled = 0
         queue: deque[str] = deque(seeds)
 
@@ -572,6 +904,7 @@ class Writer:
 # ----------------------------
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    import argparse  # why: only the CLI needs it, not importers of the crawler
     p = argparse.ArgumentParser(prog="scapholf", description="Polite, extensible job scraper")
     p.add_argument("--sites", nargs="+", required=True,
                    help="Sites to scrape: jobs.ch indeed aurawoo swissmedicsjobs adecco jobboardfinder linkedin tietalent or 'all'")
@@ -585,6 +918,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     p.add_argument("--out-jsonl", default=None, help="Write JSONL to this path")
     p.add_argument("--out-csv", default=None, help="Write CSV to this path")
     p.add_argument("--domain-allow", nargs="*", default=None, help="Restrict to these domain suffixes")
+    p.add_argument("--discovery", choices=("crawl", "sitemap", "auto"), default="crawl",
+                   help="crawl: HTML search pages; sitemap: sitemaps/feeds only; auto: sitemaps/feeds, fall back to crawl")
+    p.add_argument("--since", default=None, help="Only discover entries modified since this ISO date (overrides --state-file)")
+    p.add_argument("--state-file", default=None, help="JSON file recording the last discovery run per site")
+    p.add_argument("--max-discovery-docs", type=int, default=20, help="Max sitemap/feed documents per site")
     return p.parse_args(argv)
 
 
@@ -596,12 +934,7 @@ def resolve_adapters(site_names: Sequence[str]) -> List[BaseAdapter]:
         names = [s.lower() for s in site_names]
     adapters: List[BaseAdapter] = []
     for n in names:
-        key = n
-        # map synonyms
-        if n in ("jobsch", "jobs", "jobs.ch"):
-            key = "jobs.ch"
-        if n in ("indeed", "indeed.ch", "indeedch"):
-            key = "indeed"
+        key = ADAPTERS.canonical(n)
         if key not in ADAPTERS:
             raise SystemExit(f"Unknown site: {n}")
         adapters.append(ADAPTERS[key])
@@ -610,6 +943,13 @@ def resolve_adapters(site_names: Sequence[str]) -> List[BaseAdapter]:
 
 async def main_async(args: argparse.Namespace) -> int:
     adapters = resolve_adapters(args.sites)
+    run_started = datetime.now(timezone.utc)
+    state = load_discovery_state(args.state_file)
+    since: Dict[str, datetime] = {}
+    for adp in adapters:
+        cutoff = parse_lastmod(args.since or state.get(adp.name))
+        if cutoff:
+            since[adp.name] = cutoff
     crawler = ScapholfCrawler(
         adapters=adapters,
         query=args.query,
@@ -620,9 +960,16 @@ async def main_async(args: argparse.Namespace) -> int:
         timeout=args.timeout,
         user_agent=args.user_agent,
         allow_domains=args.domain_allow,
+        discovery=args.discovery,
+        since=since,
+        max_discovery_docs=args.max_discovery_docs,
     )
 
     jobs = await crawler.run()
+    if crawler.discovered_sites:
+        state.update({name: (oldest_unread or run_started).isoformat()
+                      for name, oldest_unread in crawler.discovered_sites.items()})
+        save_discovery_state(args.state_file, state)
 
     # Dedupe by (title, company, location, url)
     seen_keys: Set[Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]] = set()
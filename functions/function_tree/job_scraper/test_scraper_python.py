@@ -1,7 +1,9 @@
 import asyncio
+import gzip
 import json
 import sys
-from scraper import ADAPTERS, ScapholfCrawler, DEFAULT_UA
+from datetime import datetime, timedelta, timezone
+from scraper import ADAPTERS, ScapholfCrawler, DEFAULT_UA, is_fresh, parse_discovery_document, parse_lastmod
 
 async def test_pharmacist_jobs_geneva():
     print("=" * 60)
@@ -99,6 +101,93 @@ async def test_pharmacist_jobs_geneva():
     
     return results
 
+# ----------------------------
+# Offline checks: sitemap / feed discovery (no network)
+# ----------------------------
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://x.ch/jobs/1</loc><lastmod>2026-03-01T08:00:00+01:00</lastmod></url>
+  <url><loc>https://x.ch/jobs/2</loc></url>
+</urlset>"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://x.ch/sitemap-jobs.xml.gz</loc><lastmod>2026-03-02</lastmod></sitemap>
+</sitemapindex>"""
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <title>Jobs</title><link>https://x.ch/</link>
+  <item><title>Nurse</title><link>https://x.ch/jobs/3</link><pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <link rel="self" href="https://x.ch/feed.atom"/>
+  <entry>
+    <link rel="self" href="https://x.ch/api/jobs/4"/>
+    <link href="https://x.ch/jobs/4"/>
+    <updated>2026-03-03T12:00:00Z</updated>
+  </entry>
+</feed>"""
+
+
+def test_discovery_urlset():
+    children, pages = parse_discovery_document(URLSET)
+    assert children == []
+    assert pages == [
+        ("https://x.ch/jobs/1", datetime(2026, 3, 1, 7, 0, tzinfo=timezone.utc)),
+        ("https://x.ch/jobs/2", None),
+    ]
+
+
+def test_discovery_sitemap_index():
+    children, pages = parse_discovery_document(SITEMAP_INDEX)
+    assert children == [("https://x.ch/sitemap-jobs.xml.gz", datetime(2026, 3, 2, tzinfo=timezone.utc))]
+    assert pages == []
+
+
+def test_discovery_gzipped_body():
+    assert parse_discovery_document(gzip.compress(URLSET)) == parse_discovery_document(URLSET)
+
+
+def test_discovery_rss_pubdate():
+    children, pages = parse_discovery_document(RSS)
+    # The channel-level <link> is not an item
+    assert pages == [("https://x.ch/jobs/3", datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc))]
+
+
+def test_discovery_atom_link_href():
+    children, pages = parse_discovery_document(ATOM)
+    assert pages == [("https://x.ch/jobs/4", datetime(2026, 3, 3, 12, 0, tzinfo=timezone.utc))]
+
+
+def test_discovery_escaped_loc():
+    body = b"<urlset><url><loc>https://x.ch/job?id=1&amp;copy=2&amp;region=ge</loc></url></urlset>"
+    children, pages = parse_discovery_document(body)
+    assert pages == [("https://x.ch/job?id=1&copy=2&region=ge", None)]
+
+
+def test_lastmod_cutoff():
+    cutoff = parse_lastmod("2026-03-01T00:00:00Z")
+    assert parse_lastmod("2026-03-01T00:00:00") == cutoff  # naive values are UTC
+    assert is_fresh(cutoff, cutoff)  # exactly at the cutoff is kept
+    assert not is_fresh(cutoff - timedelta(seconds=1), cutoff)
+    assert is_fresh(None, cutoff)  # undated entries cannot be proven stale
+    assert is_fresh(cutoff - timedelta(days=365), None)
+
+
+def run_offline_tests():
+    tests = [test for name, test in sorted(globals().items()) if name.startswith(("test_discovery_", "test_lastmod_"))]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n{len(tests)} offline checks passed")
+
 if __name__ == "__main__":
-    asyncio.run(test_pharmacist_jobs_geneva())
+    if "--offline" in sys.argv:
+        run_offline_tests()
+    else:
+        asyncio.run(test_pharmacist_jobs_geneva())
 
@@ -240,6 +240,7 @@ module.exports.runScheduledScraper = jobScraperScheduler.runScheduledScraper;
 // TEAM ORGANIGRAM ANALYZER - Export from api/teamOrganigram.js
 const teamOrganigram = require('./api/teamOrganigram');
 module.exports.analyzeTeamOrganigram = teamOrganigram.analyzeTeamOrganigram;
+module.exports.applyTeamOrganigramEvents = teamOrganigram.applyTeamOrganigramEvents;
 
 // =========================================================================
 //  🔐 CUSTOM CLAIMS & AUTH - Token Management
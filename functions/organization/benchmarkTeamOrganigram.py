@@ -0,0 +1,177 @@
+"""
+Team Organigram Benchmark - synthetic organizations
+
+Times TeamOrganigramGraphBuilder.build_graph on a generated organization and compares it
+against the previous nested-loop matching (kept here as LegacyTeamOrganigramGraphBuilder).
+Both builders must produce the same graph; the script exits non-zero otherwise.
+
+Usage:
+    python3 benchmarkTeamOrganigram.py --employees 10000 --roles 500
+    python3 benchmarkTeamOrganigram.py --employees 10000 --roles 500 --skip-legacy
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from teamOrganigramAnalyzer import GraphNode, TeamOrganigramGraphBuilder
+
+
+RIGHTS = [f"right_{i}" for i in range(40)]
+
+
+def generate_organization(employee_count: int, role_count: int, admin_ratio: float = 0.05,
+                          level_count: int = 5, seed: int = 42) -> Dict[str, List[Dict]]:
+    """Build a reproducible {roles, employees, adminRightsHierarchy} payload."""
+    rng = random.Random(seed)
+
+    employees = []
+    for i in range(employee_count):
+        is_admin = rng.random() < admin_ratio
+        employees.append({
+            "uid": f"emp{i}",
+            "firstName": f"First{i}",
+            "lastName": f"Last{i}",
+            "email": f"emp{i}@example.ch",
+            "isAdmin": is_admin,
+            "rights": rng.sample(RIGHTS, rng.randint(0, 12)) if is_admin else [],
+        })
+
+    roles = [{
+        "workerType": f"role{r}",
+        "title": f"Role {r}",
+        "level": rng.randint(1, 20),
+        "quantity": 0,
+        "assignedEmployees": [],
+    } for r in range(role_count)]
+    for emp in employees:
+        if not emp["isAdmin"]:
+            for role in rng.sample(roles, rng.randint(1, 2)):
+                role["assignedEmployees"].append({"uid": emp["uid"]})
+
+    hierarchy = [{
+        "name": f"level{level}",
+        "label": f"Level {level}",
+        "level": level,
+        "rights": RIGHTS[: max(1, len(RIGHTS) - level * (len(RIGHTS) // level_count))],
+    } for level in range(level_count)]
+
+    return {"roles": roles, "employees": employees, "adminRightsHierarchy": hierarchy}
+
+
+class LegacyTeamOrganigramGraphBuilder(TeamOrganigramGraphBuilder):
+    """Previous O(E*R*A) / per-pair list scan matching, for comparison only."""
+
+    def _build_admin_nodes(self, admin_rights_hierarchy: List[Dict], employees: List[Dict]) -> List[GraphNode]:
+        admin_nodes = []
+        admin_employees = [emp for emp in employees if emp.get('isAdmin', False)]
+
+        for admin_level in admin_rights_hierarchy:
+            node_id = f"admin:{admin_level.get('name', 'unknown')}"
+            level_rights = admin_level.get('rights', [])
+            level_num = admin_level.get('level', 0)
+
+            matching_admins = []
+            for emp in admin_employees:
+                emp_rights = emp.get('rights', [])
+                if level_num == 0:
+                    if len(emp_rights) == 0 or len(emp_rights) >= len(level_rights):
+                        matching_admins.append(emp)
+                else:
+                    has_matching = any(right in emp_rights for right in level_rights)
+                    has_fewer = len(emp_rights) > 0 and len(emp_rights) < len(level_rights)
+                    if has_matching and has_fewer:
+                        matching_admins.append(emp)
+
+            node = GraphNode(
+                id=node_id,
+                type="admin_level",
+                name=admin_level.get('label') or admin_level.get('name', 'Unknown'),
+                metadata={
+                    "level": level_num,
+                    "rights": level_rights,
+                    "color": admin_level.get('color'),
+                    "employees": matching_admins,
+                    "rightsCount": len(level_rights)
+                }
+            )
+            self.nodes[node_id] = node
+            admin_nodes.append(node)
+
+        return sorted(admin_nodes, key=lambda n: n.metadata.get('level', 0))
+
+    def _connect_employees_to_roles(self, employee_nodes: List[GraphNode], role_nodes: List[GraphNode]) -> None:
+        for emp_node in employee_nodes:
+            if emp_node.metadata.get('isAdmin'):
+                continue
+
+            emp_uid = emp_node.metadata.get('uid')
+            for role_node in role_nodes:
+                assigned = role_node.metadata.get('assignedEmployees', [])
+                is_assigned = any(
+                    (assigned_emp.get('uid') or assigned_emp.get('id')) == emp_uid
+                    for assigned_emp in assigned
+                )
+
+                if is_assigned:
+                    self.edges.append(self._assigned_to_edge(emp_node, role_node))
+
+    def _connect_admins_to_rights(self, employee_nodes: List[GraphNode], admin_nodes: List[GraphNode]) -> None:
+        for emp_node in employee_nodes:
+            if not emp_node.metadata.get('isAdmin'):
+                continue
+
+            emp_rights = set(emp_node.metadata.get('rights', []))
+
+            for admin_node in admin_nodes:
+                admin_rights = set(admin_node.metadata.get('rights', []))
+                level = admin_node.metadata.get('level', 0)
+
+                if level == 0 or bool(emp_rights.intersection(admin_rights)):
+                    self.edges.append(self._has_right_edge(emp_node, admin_node))
+
+
+def time_build(builder_cls, data: Dict[str, List[Dict]], repeat: int):
+    best = float("inf")
+    graph = None
+    for _ in range(repeat):
+        builder = builder_cls()
+        start = time.perf_counter()
+        graph = builder.build_graph(data["roles"], data["employees"], data["adminRightsHierarchy"])
+        best = min(best, time.perf_counter() - start)
+    return best, graph
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark TeamOrganigramGraphBuilder on synthetic data")
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--roles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per builder; the best time is reported")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the indexed builder")
+    args = parser.parse_args(argv)
+
+    data = generate_organization(args.employees, args.roles)
+    print(f"Synthetic organization: {args.employees} employees, {args.roles} roles, "
+          f"{len(data['adminRightsHierarchy'])} admin levels")
+
+    indexed_time, indexed_graph = time_build(TeamOrganigramGraphBuilder, data, args.repeat)
+    print(f"  indexed builder: {indexed_time * 1000:9.1f} ms  "
+          f"({len(indexed_graph.nodes)} nodes, {len(indexed_graph.edges)} edges)")
+
+    if args.skip_legacy:
+        return 0
+
+    legacy_time, legacy_graph = time_build(LegacyTeamOrganigramGraphBuilder, data, 1)
+    print(f"  legacy builder:  {legacy_time * 1000:9.1f} ms")
+    print(f"  speedup:         {legacy_time / indexed_time:9.1f}x")
+
+    if (legacy_graph.nodes, legacy_graph.edges) != (indexed_graph.nodes, indexed_graph.edges):
+        print("ERROR: indexed and legacy builders produced different graphs")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
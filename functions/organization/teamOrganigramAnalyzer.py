@@ -4,17 +4,37 @@ Team Organigram Analyzer - Role and Admin Rights Dependency Graph Builder
 This analyzer builds a dependency graph for roles and admin rights:
 1. Identifying roles (horizontal dependencies)
 2. Identifying admin rights hierarchy (vertical flow)
-3. Finding paths from roles to admin rights
+3. Finding paths from roles to admin rights (see OrganigramGraphIndex)
 4. Generating graph structure for visualization
 
 Adapted from taint analysis pattern for organizational structure analysis.
 """
 
+import argparse
+import hashlib
 import json
 import sys
-from typing import Dict, List, Set, Optional
+from collections import defaultdict
+from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass
 
+# Optional fast JSON / binary encoders for large payloads
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except Exception:
+    msgpack = None
+
+# Optional vectorized admin/level matching
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
 
 @dataclass
 class GraphNode:
@@ -41,6 +61,127 @@ class GraphData:
     employeeNodes: List[Dict]
 
 
+def employee_key(emp: Dict) -> Optional[str]:
+    """Employees are identified by uid, falling back to id."""
+    return emp.get('uid') or emp.get('id')
+
+
+def unique_rights(rights: List[str]) -> List[str]:
+    """Rights without duplicates, in their original order (stable across runs, unlike list(set))."""
+    return list(dict.fromkeys(rights))
+
+
+def popcount(mask: int) -> int:
+    """Number of rights in a mask (int.bit_count needs Python 3.10)."""
+    return bin(mask).count("1")
+
+
+def admin_matches_level(emp_mask: int, level_mask: int, is_root: bool) -> bool:
+    """
+    Whether an admin employee belongs to an admin level.
+    
+    Level 0 takes admins without explicit rights or with at least as many distinct
+    rights as it defines; other levels take admins sharing a right with them while
+    holding fewer.
+    """
+    rights_count = popcount(emp_mask)
+    if is_root:
+        return rights_count == 0 or rights_count >= popcount(level_mask)
+    return bool(emp_mask & level_mask) and 0 < rights_count < popcount(level_mask)
+
+
+class RightsTable:
+    """
+    Interns right names as small integer ids, in first-seen order.
+    
+    Right ``i`` is bit ``1 << i`` of a rights mask, so matching and inheritance
+    checks are bitwise operations on masks computed once per request.
+    """
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+    
+    def intern(self, rights: List[str]) -> List[int]:
+        interned = []
+        for right in rights:
+            right_id = self.ids.get(right)
+            if right_id is None:
+                right_id = self.ids[right] = len(self.names)
+                self.names.append(right)
+            interned.append(right_id)
+        return interned
+    
+    def mask(self, rights: List[str]) -> int:
+        mask = 0
+        for right_id in self.intern(rights):
+            mask |= 1 << right_id
+        return mask
+    
+    def has(self, mask: int, right: str) -> bool:
+        right_id = self.ids.get(right)
+        return right_id is not None and bool(mask >> right_id & 1)
+
+
+class AdminRightsMatrix:
+    """
+    Admin x admin-level relations computed from rights masks.
+    
+    ``members[position]`` lists the admin rows belonging to a level (its metadata.employees)
+    and ``granted[row]`` the level positions an admin gets a has_right edge to. With NumPy
+    installed and a large enough matrix, each level is checked against the whole column
+    of admins at once.
+    """
+    
+    NUMPY_MIN_CELLS = 4096
+    
+    def __init__(self, admin_masks: List[int], level_masks: List[int], root_levels: List[bool]):
+        self.admin_masks = admin_masks
+        self.level_masks = level_masks
+        self.root_levels = root_levels
+        if np is not None and len(admin_masks) * len(level_masks) >= self.NUMPY_MIN_CELLS:
+            self._compute_numpy()
+        else:
+            self._compute_python()
+    
+    def _compute_python(self) -> None:
+        levels = list(enumerate(zip(self.level_masks, self.root_levels)))
+        self.members: List[List[int]] = [[] for _ in self.level_masks]
+        self.granted: List[List[int]] = []
+        for row, emp_mask in enumerate(self.admin_masks):
+            granted_row = []
+            for position, (level_mask, is_root) in levels:
+                if is_root or emp_mask & level_mask:
+                    granted_row.append(position)
+                if admin_matches_level(emp_mask, level_mask, is_root):
+                    self.members[position].append(row)
+            self.granted.append(granted_row)
+    
+    def _compute_numpy(self) -> None:
+        words = max(1, (max(self.admin_masks + self.level_masks).bit_length() + 63) // 64)
+        admin_words = self._to_words(self.admin_masks, words)
+        level_words = self._to_words(self.level_masks, words)
+        admin_counts = np.array([popcount(mask) for mask in self.admin_masks])[:, None]
+        level_counts = np.array([popcount(mask) for mask in self.level_masks])[None, :]
+        is_root = np.array(self.root_levels, dtype=bool)[None, :]
+        
+        shares = ((admin_words[:, None, :] & level_words[None, :, :]) != 0).any(axis=2)
+        granted = is_root | shares
+        members = np.where(
+            is_root,
+            (admin_counts == 0) | (admin_counts >= level_counts),
+            shares & (admin_counts > 0) & (admin_counts < level_counts)
+        )
+        self.members = [np.flatnonzero(members[:, position]).tolist() for position in range(len(self.level_masks))]
+        self.granted = [np.flatnonzero(row).tolist() for row in granted]
+    
+    @staticmethod
+    def _to_words(masks: List[int], words: int):
+        """Pack masks into a (len(masks), words) uint64 array."""
+        packed = b"".join(mask.to_bytes(words * 8, "little") for mask in masks)
+        return np.frombuffer(packed, dtype="<u8").reshape(len(masks), words)
+
+
 class TeamOrganigramGraphBuilder:
     """
     Builds a directed graph representing role dependencies and admin rights hierarchy.
@@ -49,11 +190,18 @@ class TeamOrganigramGraphBuilder:
     - Role dependency visualization (horizontal)
     - Admin rights hierarchy visualization (vertical)
     - Pathfinding between roles and admin rights
+    
+    Employee/role matching goes through a uid -> roles index and admin/level matching
+    through rights bitmasks (see AdminRightsMatrix), both built once per call, so the
+    build is linear in input size.
     """
     
     def __init__(self):
         self.nodes = {}
         self.edges = []
+        self.rights = RightsTable()
+        self.roles_by_uid: Dict[str, List[GraphNode]] = {}
+        self.admin_matrix: Optional[AdminRightsMatrix] = None
     
     def build_graph(self, roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict]) -> GraphData:
         """
@@ -69,8 +217,10 @@ class TeamOrganigramGraphBuilder:
         """
         self.nodes.clear()
         self.edges.clear()
+        self.rights = RightsTable()
         
         role_nodes = self._build_role_nodes(roles)
+        self.roles_by_uid = self._index_roles_by_uid(role_nodes)
         admin_nodes = self._build_admin_nodes(admin_rights_hierarchy, employees)
         employee_nodes = self._build_employee_nodes(employees)
         
@@ -96,97 +246,158 @@ class TeamOrganigramGraphBuilder:
             "metadata": node.metadata
         }
     
+    def _role_node(self, role: Dict) -> GraphNode:
+        """Create the node for one role."""
+        return GraphNode(
+            id=f"role:{role.get('workerType', 'unknown')}",
+            type="role",
+            name=role.get('title') or role.get('workerType', 'Unknown'),
+            metadata={
+                "workerType": role.get('workerType'),
+                "level": role.get('level', 999),
+                "color": role.get('color'),
+                "color1": role.get('color1'),
+                "quantity": role.get('quantity', 0),
+                "assignedEmployees": role.get('assignedEmployees', [])
+            }
+        )
+    
+    def _admin_level_node(self, admin_level: Dict) -> GraphNode:
+        """Create the node for one admin level; matching employees are filled in later."""
+        level_rights = admin_level.get('rights', [])
+        return GraphNode(
+            id=f"admin:{admin_level.get('name', 'unknown')}",
+            type="admin_level",
+            name=admin_level.get('label') or admin_level.get('name', 'Unknown'),
+            metadata={
+                "level": admin_level.get('level', 0),
+                "rights": level_rights,
+                "color": admin_level.get('color'),
+                "employees": [],
+                "rightsCount": len(level_rights)
+            }
+        )
+    
+    def _employee_node(self, emp: Dict) -> Optional[GraphNode]:
+        """Create the node for one employee, or None when it has no uid/id."""
+        emp_id = employee_key(emp)
+        if not emp_id:
+            return None
+        
+        full_name = f"{emp.get('firstName', '')} {emp.get('lastName', '')}".strip() or 'Unknown'
+        return GraphNode(
+            id=f"employee:{emp_id}",
+            type="employee",
+            name=full_name,
+            metadata={
+                "uid": emp_id,
+                "firstName": emp.get('firstName'),
+                "lastName": emp.get('lastName'),
+                "email": emp.get('email'),
+                "photoURL": emp.get('photoURL'),
+                "isAdmin": emp.get('isAdmin', False),
+                "rights": emp.get('rights', []),
+                "roles": emp.get('roles', [])
+            }
+        )
+    
+    def _depends_on_edge(self, current: GraphNode, next_role: GraphNode) -> Dict:
+        return {
+            "source": current.id,
+            "target": next_role.id,
+            "type": "depends_on",
+            "metadata": {"dependency": "hierarchical"}
+        }
+    
+    def _inherits_edge(self, current: GraphNode, next_level: GraphNode) -> Dict:
+        next_mask = self.rights.mask(next_level.metadata.get('rights', []))
+        inherited = [
+            right for right in unique_rights(current.metadata.get('rights', []))
+            if self.rights.has(next_mask, right)
+        ]
+        return {
+            "source": current.id,
+            "target": next_level.id,
+            "type": "inherits",
+            "metadata": {
+                "flow": "vertical",
+                "rightsInherited": inherited
+            }
+        }
+    
+    def _assigned_to_edge(self, emp_node: GraphNode, role_node: GraphNode) -> Dict:
+        return {
+            "source": emp_node.id,
+            "target": role_node.id,
+            "type": "assigned_to",
+            "metadata": {"assignment": "role"}
+        }
+    
+    def _has_right_edge(self, emp_node: GraphNode, admin_node: GraphNode) -> Dict:
+        return {
+            "source": emp_node.id,
+            "target": admin_node.id,
+            "type": "has_right",
+            "metadata": {
+                "rights": unique_rights(emp_node.metadata.get('rights', [])),
+                "level": admin_node.metadata.get('level', 0)
+            }
+        }
+    
     def _build_role_nodes(self, roles: List[Dict]) -> List[GraphNode]:
         """Create nodes for each role."""
         role_nodes = []
         
         for role in roles:
-            node_id = f"role:{role.get('workerType', 'unknown')}"
-            node = GraphNode(
-                id=node_id,
-                type="role",
-                name=role.get('title') or role.get('workerType', 'Unknown'),
-                metadata={
-                    "workerType": role.get('workerType'),
-                    "level": role.get('level', 999),
-                    "color": role.get('color'),
-                    "color1": role.get('color1'),
-                    "quantity": role.get('quantity', 0),
-                    "assignedEmployees": role.get('assignedEmployees', [])
-                }
-            )
-            self.nodes[node_id] = node
+            node = self._role_node(role)
+            self.nodes[node.id] = node
             role_nodes.append(node)
         
         return sorted(role_nodes, key=lambda n: n.metadata.get('level', 999))
     
+    def _index_roles_by_uid(self, role_nodes: List[GraphNode]) -> Dict[str, List[GraphNode]]:
+        """Map each assigned employee uid to its roles, in role order, without duplicates."""
+        roles_by_uid = defaultdict(list)
+        for role_node in role_nodes:
+            for assigned_emp in role_node.metadata.get('assignedEmployees', []):
+                assigned_roles = roles_by_uid[employee_key(assigned_emp)]
+                if not assigned_roles or assigned_roles[-1] is not role_node:
+                    assigned_roles.append(role_node)
+        return dict(roles_by_uid)
+    
     def _build_admin_nodes(self, admin_rights_hierarchy: List[Dict], employees: List[Dict]) -> List[GraphNode]:
         """Create nodes for admin rights hierarchy."""
         admin_nodes = []
-        admin_employees = [emp for emp in employees if emp.get('isAdmin', False)]
         
         for admin_level in admin_rights_hierarchy:
-            node_id = f"admin:{admin_level.get('name', 'unknown')}"
-            level_rights = admin_level.get('rights', [])
-            level_num = admin_level.get('level', 0)
-            
-            matching_admins = []
-            for emp in admin_employees:
-                emp_rights = emp.get('rights', [])
-                if level_num == 0:
-                    if len(emp_rights) == 0 or len(emp_rights) >= len(level_rights):
-                        matching_admins.append(emp)
-                else:
-                    has_matching = any(right in emp_rights for right in level_rights)
-                    has_fewer = len(emp_rights) > 0 and len(emp_rights) < len(level_rights)
-                    if has_matching and has_fewer:
-                        matching_admins.append(emp)
-            
-            node = GraphNode(
-                id=node_id,
-                type="admin_level",
-                name=admin_level.get('label') or admin_level.get('name', 'Unknown'),
-                metadata={
-                    "level": level_num,
-                    "rights": level_rights,
-                    "color": admin_level.get('color'),
-                    "employees": matching_admins,
-                    "rightsCount": len(level_rights)
-                }
-            )
-            self.nodes[node_id] = node
+            node = self._admin_level_node(admin_level)
+            self.nodes[node.id] = node
             admin_nodes.append(node)
         
-        return sorted(admin_nodes, key=lambda n: n.metadata.get('level', 0))
+        admin_nodes.sort(key=lambda n: n.metadata.get('level', 0))
+        admin_employees = [emp for emp in employees if emp.get('isAdmin', False)]
+        self.admin_matrix = AdminRightsMatrix(
+            [self.rights.mask(emp.get('rights', [])) for emp in admin_employees],
+            [self.rights.mask(node.metadata.get('rights', [])) for node in admin_nodes],
+            [node.metadata.get('level', 0) == 0 for node in admin_nodes]
+        )
+        # has_right edges are only drawn for admins that get an employee node
+        self.keyed_admin_rows = [row for row, emp in enumerate(admin_employees) if employee_key(emp)]
+        
+        for admin_node, rows in zip(admin_nodes, self.admin_matrix.members):
+            admin_node.metadata['employees'] = [admin_employees[row] for row in rows]
+        
+        return admin_nodes
     
     def _build_employee_nodes(self, employees: List[Dict]) -> List[GraphNode]:
         """Create nodes for employees."""
         employee_nodes = []
         
         for emp in employees:
-            emp_id = emp.get('uid') or emp.get('id')
-            if not emp_id:
+            node = self._employee_node(emp)
+            if node is None:
                 continue
-                
-            node_id = f"employee:{emp_id}"
-            full_name = f"{emp.get('firstName', '')} {emp.get('lastName', '')}".strip() or 'Unknown'
-            
-            node = GraphNode(
-                id=node_id,
-                type="employee",
-                name=full_name,
-                metadata={
-                    "uid": emp_id,
-                    "firstName": emp.get('firstName'),
-                    "lastName": emp.get('lastName'),
-                    "email": emp.get('email'),
-                    "photoURL": emp.get('photoURL'),
-                    "isAdmin": emp.get('isAdmin', False),
-                    "rights": emp.get('rights', []),
-                    "roles": emp.get('roles', [])
-                }
-            )
-            self.nodes[node_id] = node
+            self.nodes[node.id] = node
             employee_nodes.append(node)
         
         return employee_nodes
@@ -198,32 +409,12 @@ class TeamOrganigramGraphBuilder:
             next_role = role_nodes[i + 1]
             
             if current.metadata.get('level', 999) < next_role.metadata.get('level', 999):
-                self.edges.append({
-                    "source": current.id,
-                    "target": next_role.id,
-                    "type": "depends_on",
-                    "metadata": {"dependency": "hierarchical"}
-                })
+                self.edges.append(self._depends_on_edge(current, next_role))
     
     def _build_admin_rights_flow(self, admin_nodes: List[GraphNode]) -> None:
         """Create vertical inheritance edges for admin rights."""
         for i in range(len(admin_nodes) - 1):
-            current = admin_nodes[i]
-            next_level = admin_nodes[i + 1]
-            
-            current_rights = set(current.metadata.get('rights', []))
-            next_rights = set(next_level.metadata.get('rights', []))
-            inherited = list(current_rights.intersection(next_rights))
-            
-            self.edges.append({
-                "source": current.id,
-                "target": next_level.id,
-                "type": "inherits",
-                "metadata": {
-                    "flow": "vertical",
-                    "rightsInherited": inherited
-                }
-            })
+            self.edges.append(self._inherits_edge(admin_nodes[i], admin_nodes[i + 1]))
     
     def _connect_employees_to_roles(self, employee_nodes: List[GraphNode], role_nodes: List[GraphNode]) -> None:
         """Connect employees to their assigned roles."""
@@ -232,48 +423,443 @@ class TeamOrganigramGraphBuilder:
                 continue
                 
             emp_uid = emp_node.metadata.get('uid')
-            for role_node in role_nodes:
-                assigned = role_node.metadata.get('assignedEmployees', [])
-                is_assigned = any(
-                    (assigned_emp.get('uid') or assigned_emp.get('id')) == emp_uid
-                    for assigned_emp in assigned
-                )
-                
-                if is_assigned:
-                    self.edges.append({
-                        "source": emp_node.id,
-                        "target": role_node.id,
-                        "type": "assigned_to",
-                        "metadata": {"assignment": "role"}
-                    })
+            for role_node in self.roles_by_uid.get(emp_uid, ()):
+                self.edges.append(self._assigned_to_edge(emp_node, role_node))
     
     def _connect_admins_to_rights(self, employee_nodes: List[GraphNode], admin_nodes: List[GraphNode]) -> None:
         """Connect admin employees to their rights levels."""
-        for emp_node in employee_nodes:
-            if not emp_node.metadata.get('isAdmin'):
-                continue
-            
-            emp_rights = set(emp_node.metadata.get('rights', []))
+        admin_emp_nodes = [emp_node for emp_node in employee_nodes if emp_node.metadata.get('isAdmin')]
+        
+        for emp_node, row in zip(admin_emp_nodes, self.keyed_admin_rows):
+            for position in self.admin_matrix.granted[row]:
+                self.edges.append(self._has_right_edge(emp_node, admin_nodes[position]))
+
+
+EdgeKey = Tuple[str, str, str]
+
+
+class IncrementalOrganigramGraph:
+    """
+    A built organigram graph kept in memory and patched from change events.
+    
+    Events look like {"entity": "employee" | "role" | "adminLevel",
+    "action": "add" | "update" | "remove", "data": {...}}. Employees are keyed by
+    uid (or id), roles by workerType and admin levels by name, exactly like their
+    node ids. "update" merges data into the stored object, "add" replaces it.
+    
+    Only the edges touching changed entities are recomputed; the depends_on and
+    inherits chains are rebuilt only when a role or admin level changed.
+    """
+    
+    def __init__(self, roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict]):
+        self.builder = TeamOrganigramGraphBuilder()
+        self.roles: Dict[str, Dict] = {}
+        self.employees: Dict[str, Dict] = {}
+        self.levels: Dict[str, Dict] = {}
+        self.nodes: Dict[str, GraphNode] = {}
+        self.edges: Dict[EdgeKey, Dict] = {}
+        self.edge_keys_by_node: Dict[str, Set[EdgeKey]] = defaultdict(set)
+        self.roles_by_uid: Dict[str, Set[str]] = defaultdict(set)
+        self.employee_masks: Dict[str, int] = {}
+        self.level_masks: Dict[str, int] = {}
+        self.level_members: Dict[str, Set[str]] = {}
+        self.employee_order: Dict[str, int] = {}
+        self._next_order = 0
+        
+        events = (
+            [{"entity": "role", "action": "add", "data": role} for role in roles]
+            + [{"entity": "adminLevel", "action": "add", "data": level} for level in admin_rights_hierarchy]
+            + [{"entity": "employee", "action": "add", "data": emp} for emp in employees]
+        )
+        self.apply_events(events)
+    
+    def to_dict(self) -> Dict:
+        """Full graph in the analyze_team_organigram format (edge order is not significant)."""
+        node_dict = self.builder._node_to_dict
+        return {
+            "nodes": [node_dict(node) for node in self.nodes.values()],
+            "edges": list(self.edges.values()),
+            "roleNodes": [node_dict(node) for node in self._sorted_roles()],
+            "adminNodes": [node_dict(node) for node in self._sorted_levels()],
+            "employeeNodes": [node_dict(self.nodes[node_id]) for node_id in self.employees]
+        }
+    
+    def apply_events(self, events: List[Dict]) -> Dict:
+        """
+        Apply change events and return the resulting delta.
+        
+        Returns:
+            Dictionary with addedNodes, updatedNodes, removedNodes (ids), addedEdges and
+            removedEdges ({source, target, type}); an edge whose metadata changed is
+            reported as removed and added.
+        """
+        self._nodes_before: Dict[str, Optional[Dict]] = {}
+        self._edges_before: Dict[EdgeKey, Optional[Dict]] = {}
+        dirty_employees: Set[str] = set()
+        dirty_levels: Set[str] = set()
+        roles_changed = False
+        levels_changed = False
+        
+        for event in events:
+            entity = event.get('entity')
+            action = event.get('action', 'update')
+            data = event.get('data') or {}
             
-            for admin_node in admin_nodes:
-                admin_rights = set(admin_node.metadata.get('rights', []))
-                level = admin_node.metadata.get('level', 0)
-                
-                has_matching = level == 0 or bool(emp_rights.intersection(admin_rights))
-                
-                if has_matching:
-                    self.edges.append({
-                        "source": emp_node.id,
-                        "target": admin_node.id,
-                        "type": "has_right",
-                        "metadata": {
-                            "rights": list(emp_rights),
-                            "level": level
-                        }
-                    })
-
-
-def analyze_team_organigram(roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict]) -> Dict:
+            if entity == 'employee':
+                node_id = self._apply_employee_event(action, data)
+                if node_id:
+                    dirty_employees.add(node_id)
+            elif entity == 'role':
+                dirty_employees.update(self._apply_role_event(action, data))
+                roles_changed = True
+            elif entity == 'adminLevel':
+                dirty_levels.add(self._apply_level_event(action, data))
+                levels_changed = True
+            else:
+                raise ValueError(f"Unknown event entity: {entity}")
+        
+        changed_levels = set(dirty_levels)
+        for level_id in dirty_levels:
+            self._recompute_level_members(level_id)
+        for node_id in dirty_employees:
+            changed_levels.update(self._recompute_employee_membership(node_id))
+        for level_id in changed_levels:
+            if level_id in self.levels:
+                self._refresh_level_employees(level_id)
+        
+        for node_id in dirty_employees:
+            self._replace_edges(
+                self._incident_edges(node_id, ('assigned_to', 'has_right'), as_source=True),
+                self._employee_edges(node_id)
+            )
+        for level_id in dirty_levels:
+            self._replace_edges(
+                self._incident_edges(level_id, ('has_right',), as_source=False),
+                self._level_edges(level_id)
+            )
+        if roles_changed:
+            self._replace_edges(self._edges_of_type('depends_on'), self._role_chain_edges())
+        if levels_changed:
+            self._replace_edges(self._edges_of_type('inherits'), self._level_chain_edges())
+        
+        return self._collect_delta()
+    
+    # Event application
+    
+    def _apply_employee_event(self, action: str, data: Dict) -> Optional[str]:
+        emp_id = employee_key(data)
+        if not emp_id:
+            return None
+        node_id = f"employee:{emp_id}"
+        self._remember_node(node_id)
+        
+        if action == 'remove':
+            self.employees.pop(node_id, None)
+            self.employee_order.pop(node_id, None)
+            self.employee_masks.pop(node_id, None)
+            self.nodes.pop(node_id, None)
+            return node_id
+        
+        emp = {**self.employees[node_id], **data} if action == 'update' and node_id in self.employees else data
+        if node_id not in self.employee_order:
+            self.employee_order[node_id] = self._next_order
+            self._next_order += 1
+        self.employees[node_id] = emp
+        self.employee_masks[node_id] = self.builder.rights.mask(emp.get('rights', []))
+        self.nodes[node_id] = self.builder._employee_node(emp)
+        return node_id
+    
+    def _apply_role_event(self, action: str, data: Dict) -> Set[str]:
+        """Apply a role event; returns employee node ids whose assignments may have changed."""
+        node_id = f"role:{data.get('workerType', 'unknown')}"
+        self._remember_node(node_id)
+        
+        previous = self.roles.get(node_id)
+        affected_uids = self._assigned_uids(previous) if previous else set()
+        for uid in affected_uids:
+            self.roles_by_uid[uid].discard(node_id)
+        
+        if action == 'remove':
+            self.roles.pop(node_id, None)
+            self.nodes.pop(node_id, None)
+        else:
+            role = {**previous, **data} if action == 'update' and previous else data
+            self.roles[node_id] = role
+            self.nodes[node_id] = self.builder._role_node(role)
+            for uid in self._assigned_uids(role):
+                self.roles_by_uid[uid].add(node_id)
+                affected_uids.add(uid)
+        
+        return {f"employee:{uid}" for uid in affected_uids if f"employee:{uid}" in self.employees}
+    
+    def _apply_level_event(self, action: str, data: Dict) -> str:
+        node_id = f"admin:{data.get('name', 'unknown')}"
+        self._remember_node(node_id)
+        
+        previous = self.levels.get(node_id)
+        if action == 'remove':
+            self.levels.pop(node_id, None)
+            self.level_masks.pop(node_id, None)
+            self.nodes.pop(node_id, None)
+            self.level_members.pop(node_id, None)
+        else:
+            level = {**previous, **data} if action == 'update' and previous else data
+            self.levels[node_id] = level
+            self.level_masks[node_id] = self.builder.rights.mask(level.get('rights', []))
+            self.nodes[node_id] = self.builder._admin_level_node(level)
+        return node_id
+    
+    def _assigned_uids(self, role: Dict) -> Set[str]:
+        return {employee_key(assigned_emp) for assigned_emp in role.get('assignedEmployees', [])}
+    
+    # Level membership
+    
+    def _admin_employee(self, node_id: str) -> Optional[Dict]:
+        emp = self.employees.get(node_id)
+        return emp if emp and emp.get('isAdmin', False) else None
+    
+    def _is_root_level(self, level_id: str) -> bool:
+        return self.nodes[level_id].metadata.get('level', 0) == 0
+    
+    def _recompute_level_members(self, level_id: str) -> None:
+        if level_id not in self.levels:
+            return
+        level_mask = self.level_masks[level_id]
+        is_root = self._is_root_level(level_id)
+        self.level_members[level_id] = {
+            node_id for node_id in self.employees
+            if self._admin_employee(node_id) is not None
+            and admin_matches_level(self.employee_masks[node_id], level_mask, is_root)
+        }
+    
+    def _recompute_employee_membership(self, node_id: str) -> Set[str]:
+        """Update level memberships for one employee; returns the levels listing it before or after."""
+        emp = self._admin_employee(node_id)
+        emp_mask = self.employee_masks.get(node_id, 0)
+        
+        changed = set()
+        for level_id, members in self.level_members.items():
+            is_member = emp is not None and admin_matches_level(
+                emp_mask, self.level_masks[level_id], self._is_root_level(level_id)
+            )
+            if is_member or node_id in members:
+                # why: a member's employee dict is embedded in the level node, so any change shows
+                (members.add if is_member else members.discard)(node_id)
+                changed.add(level_id)
+        return changed
+    
+    def _refresh_level_employees(self, level_id: str) -> None:
+        self._remember_node(level_id)
+        members = sorted(self.level_members.get(level_id, ()), key=self.employee_order.__getitem__)
+        self.nodes[level_id].metadata['employees'] = [self.employees[node_id] for node_id in members]
+    
+    # Edges
+    
+    def _sorted_roles(self) -> List[GraphNode]:
+        return sorted((self.nodes[node_id] for node_id in self.roles), key=lambda n: n.metadata.get('level', 999))
+    
+    def _sorted_levels(self) -> List[GraphNode]:
+        return sorted((self.nodes[node_id] for node_id in self.levels), key=lambda n: n.metadata.get('level', 0))
+    
+    def _employee_edges(self, node_id: str) -> List[Dict]:
+        emp_node = self.nodes.get(node_id)
+        if emp_node is None:
+            return []
+        if not emp_node.metadata.get('isAdmin'):
+            return [
+                self.builder._assigned_to_edge(emp_node, self.nodes[role_id])
+                for role_id in self.roles_by_uid.get(emp_node.metadata['uid'], ())
+            ]
+        return [
+            self.builder._has_right_edge(emp_node, self.nodes[level_id])
+            for level_id in self.levels
+            if self._admin_has_right(emp_node, level_id)
+        ]
+    
+    def _level_edges(self, level_id: str) -> List[Dict]:
+        if level_id not in self.levels:
+            return []
+        level_node = self.nodes[level_id]
+        edges = []
+        for node_id in self.employees:
+            emp_node = self.nodes[node_id]
+            if emp_node.metadata.get('isAdmin') and self._admin_has_right(emp_node, level_id):
+                edges.append(self.builder._has_right_edge(emp_node, level_node))
+        return edges
+    
+    def _admin_has_right(self, emp_node: GraphNode, level_id: str) -> bool:
+        return self._is_root_level(level_id) or bool(self.employee_masks[emp_node.id] & self.level_masks[level_id])
+    
+    def _role_chain_edges(self) -> List[Dict]:
+        role_nodes = self._sorted_roles()
+        return [
+            self.builder._depends_on_edge(current, next_role)
+            for current, next_role in zip(role_nodes, role_nodes[1:])
+            if current.metadata.get('level', 999) < next_role.metadata.get('level', 999)
+        ]
+    
+    def _level_chain_edges(self) -> List[Dict]:
+        admin_nodes = self._sorted_levels()
+        return [self.builder._inherits_edge(current, next_level) for current, next_level in zip(admin_nodes, admin_nodes[1:])]
+    
+    def _incident_edges(self, node_id: str, edge_types, as_source: bool) -> Set[EdgeKey]:
+        position = 0 if as_source else 1
+        return {
+            key for key in self.edge_keys_by_node.get(node_id, ())
+            if key[2] in edge_types and key[position] == node_id
+        }
+    
+    def _edges_of_type(self, edge_type: str) -> Set[EdgeKey]:
+        return {key for key in self.edges if key[2] == edge_type}
+    
+    def _replace_edges(self, existing: Set[EdgeKey], desired: List[Dict]) -> None:
+        """Make the edges in ``existing`` equal to ``desired``."""
+        desired_by_key = {(edge['source'], edge['target'], edge['type']): edge for edge in desired}
+        for key in existing - desired_by_key.keys():
+            self._remember_edge(key)
+            del self.edges[key]
+            self.edge_keys_by_node[key[0]].discard(key)
+            self.edge_keys_by_node[key[1]].discard(key)
+        for key, edge in desired_by_key.items():
+            if self.edges.get(key) != edge:
+                self._remember_edge(key)
+                self.edges[key] = edge
+                self.edge_keys_by_node[key[0]].add(key)
+                self.edge_keys_by_node[key[1]].add(key)
+    
+    # Delta tracking
+    
+    def _remember_node(self, node_id: str) -> None:
+        if node_id not in self._nodes_before:
+            node = self.nodes.get(node_id)
+            # Nodes are rebuilt, never mutated in place, so a metadata copy is a safe snapshot.
+            self._nodes_before[node_id] = {**self.builder._node_to_dict(node), "metadata": dict(node.metadata)} if node else None
+    
+    def _remember_edge(self, key: EdgeKey) -> None:
+        if key not in self._edges_before:
+            self._edges_before[key] = self.edges.get(key)
+    
+    def _collect_delta(self) -> Dict:
+        delta = {"addedNodes": [], "updatedNodes": [], "removedNodes": [], "addedEdges": [], "removedEdges": []}
+        
+        for node_id, before in self._nodes_before.items():
+            node = self.nodes.get(node_id)
+            after = self.builder._node_to_dict(node) if node else None
+            if before is None and after is not None:
+                delta["addedNodes"].append(after)
+            elif before is not None and after is None:
+                delta["removedNodes"].append(node_id)
+            elif before != after:
+                delta["updatedNodes"].append(after)
+        
+        for key, before in self._edges_before.items():
+            after = self.edges.get(key)
+            if before == after:
+                continue
+            if before is not None:
+                delta["removedEdges"].append({"source": key[0], "target": key[1], "type": key[2]})
+            if after is not None:
+                delta["addedEdges"].append(after)
+        
+        return delta
+
+
+# Edge metadata that never varies per edge type; dropped from the compact format.
+CONSTANT_EDGE_METADATA = {
+    "depends_on": {"dependency": "hierarchical"},
+    "assigned_to": {"assignment": "role"},
+}
+
+
+def compact_graph(result: Dict) -> Dict:
+    """
+    Normalize a full analysis result into the compact format.
+    
+    - every node is emitted once in ``nodes``; roleNodes/adminNodes/employeeNodes list ids
+    - rights are integer ids into the shared ``rights`` table
+    - admin levels list member employee ids instead of embedding employee objects, and
+      roles list assigned employee ids
+    - has_right edges carry only the level (the rights live on the employee node), and
+      constant edge metadata is omitted
+    """
+    rights = RightsTable()
+    nodes = []
+    for node in result["nodes"]:
+        metadata = dict(node["metadata"])
+        if "rights" in metadata:
+            metadata["rights"] = rights.intern(metadata["rights"])
+        if node["type"] == "admin_level":
+            metadata["employees"] = [
+                f"employee:{employee_key(emp)}" for emp in metadata["employees"] if employee_key(emp)
+            ]
+        elif node["type"] == "role":
+            metadata["assignedEmployees"] = [
+                f"employee:{employee_key(emp)}" for emp in metadata["assignedEmployees"] if employee_key(emp)
+            ]
+        nodes.append({**node, "metadata": metadata})
+    
+    edges = []
+    for edge in result["edges"]:
+        compact_edge = {"source": edge["source"], "target": edge["target"], "type": edge["type"]}
+        if edge["type"] == "has_right":
+            compact_edge["metadata"] = {"level": edge["metadata"]["level"]}
+        elif edge["type"] == "inherits":
+            compact_edge["metadata"] = {"rightsInherited": rights.intern(edge["metadata"]["rightsInherited"])}
+        elif edge["metadata"] != CONSTANT_EDGE_METADATA.get(edge["type"]):
+            compact_edge["metadata"] = edge["metadata"]
+        edges.append(compact_edge)
+    
+    return {
+        "format": "compact",
+        "rights": rights.names,
+        "nodes": nodes,
+        "edges": edges,
+        "roleNodes": [node["id"] for node in result["roleNodes"]],
+        "adminNodes": [node["id"] for node in result["adminNodes"]],
+        "employeeNodes": [node["id"] for node in result["employeeNodes"]]
+    }
+
+
+def encode_result(result: Dict, encoding: str = "json") -> bytes:
+    """
+    Serialize an analysis result.
+    
+    Args:
+        result: Output of analyze_team_organigram
+        encoding: "json" (compact separators, orjson when installed) or "msgpack"
+        
+    Returns:
+        Encoded bytes
+    """
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack encoding requested but the msgpack package is not installed")
+        return msgpack.packb(result, use_bin_type=True)
+    if encoding != "json":
+        raise ValueError(f"Unknown encoding: {encoding}")
+    if orjson is not None:
+        return orjson.dumps(result)
+    return json.dumps(result, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def input_fingerprint(roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict],
+                      output_format: str = "full") -> str:
+    """
+    Content hash of an analysis input, used as a result cache key.
+    
+    Object keys are canonicalized (sorted); list order is kept because it determines
+    node and edge order in the result.
+    """
+    payload = [roles, employees, admin_rights_hierarchy, output_format]
+    if orjson is not None:
+        canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def analyze_team_organigram(roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict],
+                            output_format: str = "full") -> Dict:
     """
     Main entry point for team organigram analysis.
     
@@ -281,6 +867,7 @@ def analyze_team_organigram(roles: List[Dict], employees: List[Dict], admin_righ
         roles: List of role definitions
         employees: List of employee data
         admin_rights_hierarchy: List of admin rights levels
+        output_format: "full" (nodes repeated per category) or "compact" (see compact_graph)
         
     Returns:
         Dictionary with graph data structure
@@ -288,24 +875,187 @@ def analyze_team_organigram(roles: List[Dict], employees: List[Dict], admin_righ
     builder = TeamOrganigramGraphBuilder()
     graph_data = builder.build_graph(roles, employees, admin_rights_hierarchy)
     
-    return {
+    result = {
         "nodes": graph_data.nodes if isinstance(graph_data.nodes, list) else [graph_data.nodes],
         "edges": graph_data.edges,
         "roleNodes": graph_data.roleNodes if isinstance(graph_data.roleNodes, list) else [graph_data.roleNodes],
         "adminNodes": graph_data.adminNodes if isinstance(graph_data.adminNodes, list) else [graph_data.adminNodes],
         "employeeNodes": graph_data.employeeNodes if isinstance(graph_data.employeeNodes, list) else [graph_data.employeeNodes]
     }
+    if output_format == "compact":
+        return compact_graph(result)
+    if output_format != "full":
+        raise ValueError(f"Unknown output format: {output_format}")
+    return result
+
+
+class OrganigramGraphIndex:
+    """
+    Query index over a built organigram graph (analyze_team_organigram "full" result).
+    
+    Builds adjacency lists once, an inverted right -> employees index over effective
+    rights, and the transitive closure of the inherits edges, so queries are dictionary
+    lookups. An employee effectively holds its own rights; the only rights granted by
+    membership are those of a root level (level 0) to the admins without any rights of
+    their own that it lists (see admin_matches_level). Levels above 0 list admins holding
+    fewer rights than the level, which says nothing about the rights they lack. Path
+    searches are breadth-first over outgoing edges and memoized per source node.
+    """
+    
+    def __init__(self, result: Dict):
+        self.nodes: Dict[str, Dict] = {node["id"]: node for node in result["nodes"]}
+        self.out_edges: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self.in_edges: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for edge in result["edges"]:
+            self.out_edges[edge["source"]].append((edge["target"], edge["type"]))
+            self.in_edges[edge["target"]].append((edge["source"], edge["type"]))
+        
+        self.level_members: Dict[str, List[str]] = {}
+        self.effective_rights_by_employee: Dict[str, Set[str]] = defaultdict(set)
+        for node_id, node in self.nodes.items():
+            if node["type"] == "employee":
+                self.effective_rights_by_employee[node_id].update(node["metadata"].get("rights", []))
+            elif node["type"] == "admin_level":
+                members = [
+                    f"employee:{employee_key(emp)}" for emp in node["metadata"].get("employees", [])
+                    if employee_key(emp)
+                ]
+                self.level_members[node_id] = members
+        for level_id, members in self.level_members.items():
+            metadata = self.nodes[level_id]["metadata"]
+            if metadata.get("level", 0) != 0:
+                continue
+            for member_id in members:
+                member = self.nodes.get(member_id)
+                if member is not None and not member["metadata"].get("rights"):
+                    self.effective_rights_by_employee[member_id].update(metadata.get("rights", []))
+        
+        self.employees_by_right: Dict[str, Set[str]] = defaultdict(set)
+        for employee_id, rights in self.effective_rights_by_employee.items():
+            for right in rights:
+                self.employees_by_right[right].add(employee_id)
+        
+        self.inherited_by = self._inherits_closure()
+        self._bfs_parents: Dict[str, Dict[str, Optional[str]]] = {}
+    
+    @classmethod
+    def from_input(cls, roles: List[Dict], employees: List[Dict], admin_rights_hierarchy: List[Dict]):
+        return cls(analyze_team_organigram(roles, employees, admin_rights_hierarchy))
+    
+    def _inherits_closure(self) -> Dict[str, Set[str]]:
+        """Map each admin level to every level reachable from it through inherits edges."""
+        closure: Dict[str, Set[str]] = {}
+        for level_id in self.level_members:
+            if level_id in closure:
+                continue
+            # Iterative post-order DFS; levels on the current path are skipped to survive cycles.
+            stack = [(level_id, iter(self._inherits_targets(level_id)))]
+            on_path = {level_id}
+            closure[level_id] = set()
+            while stack:
+                node_id, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    on_path.discard(node_id)
+                    if stack:
+                        closure[stack[-1][0]] |= closure[node_id] | {node_id}
+                elif child in closure and child not in on_path:
+                    closure[node_id] |= closure[child] | {child}
+                elif child not in on_path:
+                    closure[child] = set()
+                    on_path.add(child)
+                    stack.append((child, iter(self._inherits_targets(child))))
+        return closure
+    
+    def _inherits_targets(self, level_id: str) -> List[str]:
+        return [target for target, edge_type in self.out_edges.get(level_id, ()) if edge_type == "inherits"]
+    
+    def employees_with_right(self, right: str) -> List[str]:
+        """Employee node ids that effectively hold ``right``."""
+        return sorted(self.employees_by_right.get(right, ()))
+    
+    def effective_rights(self, employee_id: str) -> List[str]:
+        return sorted(self.effective_rights_by_employee.get(employee_id, ()))
+    
+    def inheritors(self, level_id: str) -> Dict[str, List[str]]:
+        """Levels inheriting from ``level_id`` (transitively) and the employees listed in them."""
+        levels = self.inherited_by.get(level_id, set())
+        employees = {member_id for inheriting in levels for member_id in self.level_members.get(inheriting, ())}
+        return {"levels": sorted(levels), "employees": sorted(employees)}
+    
+    def path(self, source: str, target: str) -> Optional[List[str]]:
+        """Shortest directed path of node ids from ``source`` to ``target``, or None."""
+        parents = self._bfs_parents.get(source)
+        if parents is None:
+            parents = self._bfs_parents[source] = self._bfs(source)
+        if target not in parents:
+            return None
+        path = [target]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return path[::-1]
+    
+    def reachable(self, source: str) -> List[str]:
+        if source not in self._bfs_parents:
+            self._bfs_parents[source] = self._bfs(source)
+        return sorted(node_id for node_id in self._bfs_parents[source] if node_id != source)
+    
+    def _bfs(self, source: str) -> Dict[str, Optional[str]]:
+        parents: Dict[str, Optional[str]] = {source: None}
+        frontier = [source]
+        while frontier:
+            next_frontier = []
+            for node_id in frontier:
+                for target, _ in self.out_edges.get(node_id, ()):
+                    if target not in parents:
+                        parents[target] = node_id
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return parents
+    
+    def query(self, request: Dict):
+        """
+        Answer one query dict, as sent to the worker's query op.
+        
+        Supported types: employeesWithRight {right}, effectiveRights {employee},
+        path {source, target}, inheritors {level}, reachable {source}.
+        """
+        query_type = request.get("type")
+        if query_type == "employeesWithRight":
+            return self.employees_with_right(request["right"])
+        if query_type == "effectiveRights":
+            return self.effective_rights(request["employee"])
+        if query_type == "path":
+            return self.path(request["source"], request["target"])
+        if query_type == "inheritors":
+            return self.inheritors(request["level"])
+        if query_type == "reachable":
+            return self.reachable(request["source"])
+        raise ValueError(f"Unknown query type: {query_type}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        input_data = json.loads(sys.argv[1])
+    # One-shot mode: payload as argv, or on stdin with '-' (no argv size limit).
+    # For repeated calls use teamOrganigramWorker.py, which keeps the interpreter warm.
+    # For many facilities at once use teamOrganigramBatch.py (JSONL in, JSONL out).
+    parser = argparse.ArgumentParser(description="Team organigram analysis (one-shot)")
+    parser.add_argument("payload", nargs="?", help="JSON {roles, employees, adminRightsHierarchy}, or '-' for stdin")
+    parser.add_argument("--format", choices=("full", "compact"), default="full", dest="output_format")
+    parser.add_argument("--encoding", choices=("json", "msgpack"), default="json")
+    args = parser.parse_args()
+    
+    if args.payload:
+        raw_input = sys.stdin.read() if args.payload == '-' else args.payload
+        input_data = json.loads(raw_input)
         roles = input_data.get('roles', [])
         employees = input_data.get('employees', [])
         admin_rights_hierarchy = input_data.get('adminRightsHierarchy', [])
         
-        result = analyze_team_organigram(roles, employees, admin_rights_hierarchy)
-        print(json.dumps(result, indent=2))
+        result = analyze_team_organigram(roles, employees, admin_rights_hierarchy, args.output_format)
+        sys.stdout.buffer.write(encode_result(result, args.encoding))
+        if args.encoding == "json":
+            sys.stdout.buffer.write(b"\n")
     else:
-        print(json.dumps({"error": "No input data provided"}, indent=2))
+        print(json.dumps({"error": "No input data provided"}))
 
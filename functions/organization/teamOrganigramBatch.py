@@ -0,0 +1,172 @@
+"""
+Team Organigram Batch - analyze many facilities in one invocation
+
+Streams a JSONL file (or stdin) of {id?, roles, employees, adminRightsHierarchy}
+records through a process pool and streams one result line per record:
+
+    {"id": "facility-1", "summary": {...}, "result": {...}}
+    {"id": "facility-2", "error": "ValueError: ..."}
+
+Records are parsed inside the pool workers, so the parent only moves raw lines.
+Output keeps input order by default; --unordered emits lines as soon as they are
+ready (each line is tagged with the record id, or its 1-based line number).
+
+Summary statistics per record:
+    orphanEmployees       employees without any edge (no role, no admin level)
+    overPrivilegedAdmins  admins without any explicit rights who still hold rights
+                          through the admin levels listing them (a rights-less admin
+                          joins the root level, level 0, and gets all of its rights)
+
+An admin with explicit rights is not flagged even when a level grants more: with
+rights ["billing"] in a level of ["billing", "payroll"], payroll comes from a level
+the admin was matched to on an explicit right, which is how levels are meant to work.
+
+Usage:
+    python3 teamOrganigramBatch.py facilities.jsonl -o results.jsonl --jobs 8
+    python3 teamOrganigramBatch.py - --summary-only < facilities.jsonl
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from teamOrganigramAnalyzer import OrganigramGraphIndex, analyze_team_organigram, compact_graph, encode_result
+
+
+# Set once per pool worker by _init_worker.
+_OPTIONS: Dict = {}
+
+
+def summarize(result: Dict) -> Dict:
+    """Audit statistics for one full-format analysis result."""
+    index = OrganigramGraphIndex(result)
+    employee_ids = [node["id"] for node in result["nodes"] if node["type"] == "employee"]
+
+    orphans = [
+        node_id for node_id in employee_ids
+        if not index.out_edges.get(node_id) and not index.in_edges.get(node_id)
+    ]
+
+    levels_by_admin: Dict[str, List[str]] = defaultdict(list)
+    for level_id, members in index.level_members.items():
+        if index.nodes[level_id]["metadata"].get("rights"):
+            for member_id in members:
+                levels_by_admin[member_id].append(level_id)
+
+    over_privileged = []
+    for node_id in employee_ids:
+        metadata = index.nodes[node_id]["metadata"]
+        if not metadata.get("isAdmin") or metadata.get("rights") or node_id not in levels_by_admin:
+            continue
+        over_privileged.append({
+            "id": node_id,
+            "levels": sorted(levels_by_admin[node_id]),
+            "extraRights": index.effective_rights(node_id),
+        })
+
+    return {
+        "employees": len(employee_ids),
+        "nodes": len(result["nodes"]),
+        "edges": len(result["edges"]),
+        "orphanEmployees": orphans,
+        "overPrivilegedAdmins": over_privileged,
+    }
+
+
+def _init_worker(options: Dict) -> None:
+    _OPTIONS.update(options)
+
+
+def process_line(item: Tuple[int, str]) -> Tuple[bool, bytes]:
+    """Analyze one raw JSONL record; returns (ok, encoded output line)."""
+    line_number, line = item
+    record_id = line_number
+    try:
+        record = json.loads(line)
+        record_id = record.get("id", line_number)
+        result = analyze_team_organigram(
+            record.get("roles", []),
+            record.get("employees", []),
+            record.get("adminRightsHierarchy", []),
+        )
+        output = {"id": record_id, "summary": summarize(result)}
+        if not _OPTIONS.get("summary_only"):
+            output["result"] = compact_graph(result) if _OPTIONS.get("format") == "compact" else result
+        return True, encode_result(output)
+    except Exception as e:
+        return False, encode_result({"id": record_id, "error": f"{type(e).__name__}: {e}"})
+
+
+def read_records(stream) -> Iterator[Tuple[int, str]]:
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            yield line_number, line
+
+
+def run_batch(stream, out, jobs: int, ordered: bool = True, summary_only: bool = False,
+              output_format: str = "full", chunksize: int = 4) -> Dict:
+    """Stream records from ``stream`` to ``out`` (binary) and return run totals."""
+    options = {"summary_only": summary_only, "format": output_format}
+    totals = {"records": 0, "errors": 0}
+    start = time.perf_counter()
+
+    if jobs <= 1:
+        _init_worker(options)
+        results = map(process_line, read_records(stream))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(options,))
+        mapper = pool.imap if ordered else pool.imap_unordered
+        results = mapper(process_line, read_records(stream), chunksize)
+
+    try:
+        for ok, encoded in results:
+            totals["records"] += 1
+            if not ok:
+                totals["errors"] += 1
+            out.write(encoded + b"\n")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    totals["seconds"] = round(time.perf_counter() - start, 3)
+    return totals
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch team organigram analysis over a JSONL file")
+    parser.add_argument("input", help="JSONL file with one {id?, roles, employees, adminRightsHierarchy} per line, or '-'")
+    parser.add_argument("-o", "--output", help="Output JSONL path (default: stdout)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (1 = in-process)")
+    parser.add_argument("--unordered", action="store_true", help="Emit results as they finish instead of in input order")
+    parser.add_argument("--summary-only", action="store_true", help="Omit the graph, only emit summary statistics")
+    parser.add_argument("--format", choices=("full", "compact"), default="full", dest="output_format")
+    parser.add_argument("--chunksize", type=int, default=4, help="Records handed to a worker at a time")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        totals = run_batch(stream, out, args.jobs, ordered=not args.unordered, summary_only=args.summary_only,
+                           output_format=args.output_format, chunksize=max(1, args.chunksize))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+
+    print(f"Analyzed {totals['records']} records ({totals['errors']} errors) in {totals['seconds']}s",
+          file=sys.stderr)
+    return 1 if totals["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
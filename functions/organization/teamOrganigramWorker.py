@@ -0,0 +1,378 @@
+"""
+Team Organigram Worker - persistent analysis process
+
+Keeps one Python interpreter warm so callers do not pay interpreter startup and argv
+size limits on every analysis. Requests are newline-delimited JSON read from stdin
+(default) or from a Unix socket; every request gets exactly one compact JSON line back:
+
+    -> {"id": 1, "op": "analyze", "data": {"roles": [...], "employees": [...], "adminRightsHierarchy": [...]}}
+    <- {"id": 1, "result": {...}}
+    <- {"id": 1, "error": "..."}
+
+Supported ops:
+    analyze       analysis of data {roles, employees, adminRightsHierarchy}; data.format
+                  "compact" returns the normalized payload (see compact_graph)
+    openGraph     same (including data.format), but also keeps the graph in memory
+                  under data.graphId
+    applyEvents   applies data.events to graph data.graphId and returns only the delta
+    query         answers data.queries (see OrganigramGraphIndex.query) against graph
+                  data.graphId, or against an inline {roles, employees, adminRightsHierarchy}
+    ping          liveness check
+
+analyze results are memoized by input fingerprint (see input_fingerprint) in a bounded
+LRU (--cache-mb), optionally backed by a size-bounded on-disk tier (--cache-dir,
+--cache-dir-mb) that survives worker restarts.
+
+A {"ready": true} line is written once warm-up is done.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Union
+
+from teamOrganigramAnalyzer import (
+    IncrementalOrganigramGraph,
+    OrganigramGraphIndex,
+    analyze_team_organigram,
+    compact_graph,
+    encode_result,
+    input_fingerprint,
+)
+
+
+WARMUP_PAYLOAD = {
+    "roles": [{"workerType": "warmup", "title": "Warm-up", "level": 1,
+               "assignedEmployees": [{"uid": "w1"}]}],
+    "employees": [{"uid": "w1", "firstName": "Warm", "lastName": "Up"},
+                  {"uid": "w2", "isAdmin": True, "rights": ["warmup"]}],
+    "adminRightsHierarchy": [{"name": "warmup", "level": 0, "rights": ["warmup"]}],
+}
+
+
+def dumps(obj) -> str:
+    """Serialize without whitespace (orjson when installed); responses are parsed by a machine, not read."""
+    return encode_result(obj).decode("utf-8")
+
+
+class ResultCache:
+    """
+    Size-bounded LRU of encoded analysis results keyed by input fingerprint.
+
+    Results are kept as encoded JSON bytes so a hit is spliced into the response
+    without a decode/encode round trip. With ``cache_dir`` set, results are also
+    written there as ``<fingerprint>.json`` (atomically, via a temporary file) and
+    loaded back on a memory miss. The directory is bounded by ``disk_max_bytes``:
+    the least recently used files are deleted first, starting with what an earlier
+    worker left behind (by modification time).
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 disk_max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.size = 0
+        self.disk_entries: "OrderedDict[str, int]" = OrderedDict()
+        self.disk_size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_entries()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            encoded = self.entries.get(key)
+            if encoded is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return encoded
+        encoded = self._read_disk(key)
+        with self._lock:
+            if encoded is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store(key, encoded)
+        return encoded
+
+    def put(self, key: str, encoded: bytes) -> None:
+        with self._lock:
+            self._store(key, encoded)
+        self._write_disk(key, encoded)
+
+    def stats(self) -> Dict:
+        return {"entries": len(self.entries), "bytes": self.size, "hits": self.hits, "misses": self.misses,
+                "diskEntries": len(self.disk_entries), "diskBytes": self.disk_size}
+
+    def _store(self, key: str, encoded: bytes) -> None:
+        if len(encoded) > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.entries[key] = encoded
+        self.size += len(encoded)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_disk_entries(self) -> None:
+        found = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json") and entry.is_file():
+                st = entry.stat()
+                found.append((st.st_mtime, entry.name[:-len(".json")], st.st_size))
+        with self._disk_lock:
+            for _, key, size in sorted(found):
+                self.disk_entries[key] = size
+                self.disk_size += size
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self.disk_size > self.disk_max_bytes and self.disk_entries:
+            key, size = self.disk_entries.popitem(last=False)
+            self.disk_size -= size
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                encoded = f.read()
+        except OSError:
+            return None
+        with self._disk_lock:
+            if key in self.disk_entries:
+                self.disk_entries.move_to_end(key)
+        return encoded
+
+    def _write_disk(self, key: str, encoded: bytes) -> None:
+        if not self.cache_dir or len(encoded) > self.disk_max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the in-memory result is still served.
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self._disk_lock:
+            self.disk_size += len(encoded) - self.disk_entries.pop(key, 0)
+            self.disk_entries[key] = len(encoded)
+            self._evict_disk()
+
+
+class OrganigramWorker:
+    """
+    Dispatches worker requests to analysis ops.
+
+    At most ``max_concurrency`` requests are processed at once; further requests
+    block until a slot frees up. Only the Unix socket server handles requests in
+    parallel; serve_stdio answers one line before reading the next.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_graphs: int = 32, cache: Optional[ResultCache] = None):
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self.max_graphs = max_graphs
+        self.graphs: "OrderedDict[str, IncrementalOrganigramGraph]" = OrderedDict()
+        # Query indexes per open graph; dropped whenever the graph changes.
+        self.graph_indexes: Dict[str, OrganigramGraphIndex] = {}
+        self._graphs_lock = threading.Lock()
+        self.cache = cache if cache is not None else ResultCache()
+        self.ops: Dict[str, Callable[[Dict], Union[Dict, bytes]]] = {
+            "analyze": self._analyze,
+            "openGraph": self._open_graph,
+            "applyEvents": self._apply_events,
+            "query": self._query,
+            "ping": self._ping,
+        }
+
+    def warm_up(self) -> None:
+        """Run one tiny analysis so the first real request hits warm code paths (not cached)."""
+        encode_result(analyze_team_organigram(
+            WARMUP_PAYLOAD["roles"], WARMUP_PAYLOAD["employees"], WARMUP_PAYLOAD["adminRightsHierarchy"]
+        ))
+
+    def handle(self, request: Dict) -> Dict:
+        request_id = request.get("id")
+        op = self.ops.get(request.get("op", "analyze"))
+        if op is None:
+            return {"id": request_id, "error": f"Unknown op: {request.get('op')}"}
+
+        with self._slots:
+            try:
+                return {"id": request_id, "result": op(request.get("data") or {})}
+            except Exception as e:
+                return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+    def handle_line(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return dumps({"id": None, "error": f"Invalid JSON request: {e}"})
+        if not isinstance(request, dict):
+            return dumps({"id": None, "error": "Request must be a JSON object"})
+        response = self.handle(request)
+        if isinstance(response.get("result"), bytes):
+            # Pre-encoded (memoized) results are spliced in as-is.
+            return '{"id":%s,"result":%s}' % (dumps(response["id"]), response["result"].decode("utf-8"))
+        return dumps(response)
+
+    def _analyze(self, data: Dict) -> bytes:
+        args = (
+            data.get("roles", []),
+            data.get("employees", []),
+            data.get("adminRightsHierarchy", []),
+            data.get("format", "full"),
+        )
+        key = input_fingerprint(*args)
+        encoded = self.cache.get(key)
+        if encoded is None:
+            encoded = encode_result(analyze_team_organigram(*args))
+            self.cache.put(key, encoded)
+        return encoded
+
+    def _open_graph(self, data: Dict) -> Dict:
+        graph_id = data.get("graphId")
+        if not graph_id:
+            raise ValueError("graphId is required")
+        graph = IncrementalOrganigramGraph(
+            data.get("roles", []),
+            data.get("employees", []),
+            data.get("adminRightsHierarchy", []),
+        )
+        with self._graphs_lock:
+            self.graphs[graph_id] = graph
+            self.graphs.move_to_end(graph_id)
+            self.graph_indexes.pop(graph_id, None)
+            while len(self.graphs) > self.max_graphs:
+                evicted_id, _ = self.graphs.popitem(last=False)
+                self.graph_indexes.pop(evicted_id, None)
+            result = graph.to_dict()
+        if data.get("format", "full") == "compact":
+            result = compact_graph(result)
+        return {"graphId": graph_id, **result}
+
+    def _apply_events(self, data: Dict) -> Dict:
+        graph_id = data.get("graphId")
+        with self._graphs_lock:
+            graph = self.graphs.get(graph_id)
+            if graph is None:
+                # Callers fall back to openGraph; graphs do not survive worker restarts.
+                raise LookupError(f"Unknown graph: {graph_id}")
+            self.graphs.move_to_end(graph_id)
+            self.graph_indexes.pop(graph_id, None)
+            return {"graphId": graph_id, **graph.apply_events(data.get("events", []))}
+
+    def _query(self, data: Dict) -> Dict:
+        graph_id = data.get("graphId")
+        if graph_id:
+            with self._graphs_lock:
+                graph = self.graphs.get(graph_id)
+                if graph is None:
+                    raise LookupError(f"Unknown graph: {graph_id}")
+                index = self.graph_indexes.get(graph_id)
+                if index is None:
+                    index = self.graph_indexes[graph_id] = OrganigramGraphIndex(graph.to_dict())
+        else:
+            index = OrganigramGraphIndex.from_input(
+                data.get("roles", []),
+                data.get("employees", []),
+                data.get("adminRightsHierarchy", []),
+            )
+        return {"results": [index.query(query) for query in data.get("queries", [])]}
+
+    def _ping(self, data: Dict) -> Dict:
+        return {"pong": True, "pid": os.getpid(), "cache": self.cache.stats()}
+
+
+def serve_stdio(worker: OrganigramWorker) -> None:
+    """Serve requests from stdin until EOF, one response line per request line."""
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        sys.stdout.write(worker.handle_line(line) + "\n")
+        sys.stdout.flush()
+
+
+def serve_unix_socket(worker: OrganigramWorker, socket_path: str) -> None:
+    """Serve requests over a Unix socket; each connection may send many request lines."""
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                self.wfile.write((worker.handle_line(line) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with Server(socket_path, RequestHandler) as server:
+        sys.stdout.write(dumps({"ready": True, "socket": socket_path}) + "\n")
+        sys.stdout.flush()
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Persistent team organigram analysis worker")
+    parser.add_argument("--socket", help="Serve on this Unix socket path instead of stdin/stdout")
+    parser.add_argument("--max-concurrency", type=int, default=4,
+                        help="Maximum number of requests analyzed at the same time over --socket "
+                             "(stdin requests are handled one at a time)")
+    parser.add_argument("--max-graphs", type=int, default=32,
+                        help="Maximum number of incremental graphs kept in memory (least recently used evicted)")
+    parser.add_argument("--cache-mb", type=int, default=32,
+                        help="Memory budget for memoized analysis results in MiB (0 disables)")
+    parser.add_argument("--cache-dir", help="Also persist memoized results in this directory")
+    parser.add_argument("--cache-dir-mb", type=int, default=256,
+                        help="Disk budget of --cache-dir in MiB; least recently used results are deleted first")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip the warm-up analysis")
+    args = parser.parse_args(argv)
+
+    worker = OrganigramWorker(max_concurrency=args.max_concurrency, max_graphs=args.max_graphs,
+                              cache=ResultCache(args.cache_mb * 1024 * 1024, args.cache_dir,
+                                                args.cache_dir_mb * 1024 * 1024))
+    if not args.no_warmup:
+        worker.warm_up()
+
+    if args.socket:
+        serve_unix_socket(worker, args.socket)
+    else:
+        sys.stdout.write(dumps({"ready": True}) + "\n")
+        sys.stdout.flush()
+        serve_stdio(worker)
+
+
+if __name__ == "__main__":
+    main()
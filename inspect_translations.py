@@ -1,12 +1,36 @@
 #!/usr/bin/env python3
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
 import os
 import json
 import re
+import select
+import sqlite3
+import struct
+import sys
+import time
+from types import MappingProxyType
+from bisect import bisect_right
 from pathlib import Path
 from collections import defaultdict
+from datetime import datetime
+
+# Optional fast JSON parser for locale files
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+from project_index import ProjectIndex
+from source_scan import Analyzer, SourceScan
 
 LOCALES_DIR = Path(__file__).parent / 'public' / 'locales'
 SRC_DIR = Path(__file__).parent / 'src'
+CACHE_PATH = Path(__file__).parent / '.translation-inspect-cache.json'
+FRONTEND_I18N_PATH = SRC_DIR / 'i18n.js'
 LANGUAGES = ['en', 'fr', 'de', 'it']
 NS_MAPPING = {
     'home': 'pages/home',
@@ -47,49 +71,334 @@ def get_all_files(directory):
                 files.append(os.path.join(root, filename))
     return files
 
-def extract_translation_keys(content):
-    keys = set()
-    
-    patterns = [
-        r"t\(['\"`]([^'\"`]+)['\"`]",
-        r"t\(['\"`]([^'\"`]+)['\"`]\s*,\s*['\"`]",
-        r"i18n\.t\(['\"`]([^'\"`]+)['\"`]",
-        r"i18next\.t\(['\"`]([^'\"`]+)['\"`]",
-        r"\.t\(['\"`]([^'\"`]+)['\"`]",
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            key = match.group(1)
-            if key and '{{' not in key and '${' not in key and not key.startswith('http') and len(key) > 0:
-                keys.add(key)
+SUSPICIOUS_KEYWORDS = [
+    'title', 'label', 'placeholder', 'text', 'message', 'error', 'success',
+    'warning', 'info', 'description', 'button', 'submit', 'cancel', 'save',
+    'delete', 'edit', 'add', 'remove', 'close', 'open', 'confirm', 'reject',
+    'approve', 'decline', 'accept', 'logout', 'login', 'register', 'forgot',
+    'reset', 'change', 'profile', 'settings', 'help', 'support', 'contact',
+    'about', 'terms', 'privacy', 'language', 'theme', 'notifications', 'messages',
+    'dashboard', 'home', 'back', 'next', 'continue', 'finish', 'required',
+    'optional', 'select', 'search', 'filter', 'sort', 'show', 'hide', 'view',
+    'preview', 'download', 'upload', 'expand', 'collapse', 'enable', 'disable',
+    'activate', 'deactivate'
+]
+KEYWORD_ORDER = {keyword: index for index, keyword in enumerate(SUSPICIOUS_KEYWORDS)}
+KEYWORD_LENGTHS = sorted({len(keyword) for keyword in SUSPICIOUS_KEYWORDS})
+
+# One pattern for both finding kinds, compiled once: key usages t('key') / i18n.t('key') /
+# .t('key'), and the ": 'Literal'" / "= 'Literal'" tail of a suspicious assignment.
+# Only "t(" or the ":"/"=" is consumed (the rest is a lookahead), so every literal start
+# stays reachable; the keyword in front of ":"/"=" is checked against KEYWORD_ORDER.
+SOURCE_SCAN_RE = re.compile(
+    r"t\((?=['\"`](?P<key>[^'\"`]+)['\"`])"
+    r"|[:=](?=[^\S\n]*['\"`](?P<text>(?i:[A-Z])[^'\"`\n]{3,})['\"`])"
+)
+
+def keywords_before(content, end):
+    """Suspicious keywords (case-insensitive) ending right before ``end``, with their start offsets."""
+    while end > 0 and content[end - 1] != '\n' and content[end - 1].isspace():
+        end -= 1
+    found = []
+    for length in KEYWORD_LENGTHS:
+        if length > end:
+            break
+        keyword = content[end - length:end].lower()
+        if keyword in KEYWORD_ORDER:
+            found.append((keyword, end - length))
+    return found
+
+def is_translation_key(key):
+    return key and '{{' not in key and '${' not in key and not key.startswith('http') and len(key) > 0
+
+def is_hardcoded_text(text):
+    return (text and
+            'http' not in text and
+            'className' not in text and
+            'id=' not in text and
+            'src=' not in text and
+            len(text) > 3 and
+            '{{' not in text and
+            '${' not in text)
+
+def scan_source(content):
+    """Find translation key usages and suspicious hardcoded literals in one pass.
     
-    return keys
+    Returns (key_sites, hardcoded): key_sites is a list of (key, line) in source order;
+    hardcoded is a list of {line, text, context} ordered by line, then keyword, then column.
+    Lines that start with // or * are not checked for hardcoded strings.
+    """
+    key_sites = []
+    hits = []
+    line_starts = None
+    for match in SOURCE_SCAN_RE.finditer(content):
+        if line_starts is None:
+            line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+        position = match.start()
+        line_num = bisect_right(line_starts, position)
+        key = match.group('key')
+        if key is not None:
+            if is_translation_key(key):
+                key_sites.append((key, line_num))
+            continue
+        text = match.group('text')
+        if not is_hardcoded_text(text):
+            continue
+        # "preview: 'X'" is a hit for both "preview" and "view"
+        for keyword, start in keywords_before(content, position):
+            hits.append((line_num, KEYWORD_ORDER[keyword], start, text))
+    
+    hardcoded = []
+    lines = content.split('\n') if hits else []
+    for line_num, _, _, text in sorted(hits):
+        line = lines[line_num - 1].strip()
+        if line.startswith('//') or line.startswith('*'):
+            continue
+        hardcoded.append({
+            'line': line_num,
+            'text': text[:100],
+            'context': line[:150]
+        })
+    return key_sites, hardcoded
+
+def extract_translation_keys(content):
+    return {key for key, _ in scan_source(content)[0]}
 
 def load_locale_file(lang, namespace):
     file_path = LOCALES_DIR / lang / f"{namespace}.json"
     if file_path.exists():
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw.decode('utf-8'))
         except Exception as e:
             print(f"Warning: Error loading {file_path}: {e}")
             return None
     return None
 
 def get_all_keys_from_object(obj, prefix=''):
+    """Dotted leaf keys of a nested locale object, in file order (iterative)."""
     keys = []
-    if isinstance(obj, dict):
-        for key, value in obj.items():
+    if not isinstance(obj, dict):
+        return keys
+    stack = [(iter(obj.items()), prefix)]
+    while stack:
+        item = next(stack[-1][0], None)
+        if item is None:
+            stack.pop()
+            continue
+        key, value = item
+        parent = stack[-1][1]
+        full_key = f"{parent}.{key}" if parent else key
+        if isinstance(value, dict):
+            stack.append((iter(value.items()), full_key))
+        else:
+            keys.append(full_key)
+    return keys
+
+class LocaleTable:
+    """Flattened view of one locale file.
+    
+    leaf_keys lists the dotted leaf keys in file order (key listings, legacy check).
+    entries maps every path get_nested_value can resolve to a non-None value: leaves
+    to their value and nested objects to the OBJECT marker, so lookups and the missing
+    check are single dict accesses.
+    """
+    
+    OBJECT = MappingProxyType({})
+    
+    __slots__ = ('leaf_keys', 'entries', '_leaf_set')
+    
+    def __init__(self, leaf_keys, entries):
+        self.leaf_keys = leaf_keys
+        self.entries = entries
+        self._leaf_set = None
+    
+    @classmethod
+    def from_data(cls, data):
+        """Flatten parsed JSON in one iterative pass."""
+        leaf_keys = []
+        entries = {}
+        if not isinstance(data, dict):
+            return cls(leaf_keys, entries)
+        # (items, listing prefix, lookup path or None at the root, reachable by get_nested_value)
+        stack = [(iter(data.items()), '', None, True)]
+        while stack:
+            items, prefix, path, reachable = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            key, value = item
             full_key = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, dict) and not isinstance(value, list):
-                keys.extend(get_all_keys_from_object(value, full_key))
+            child_path = key if path is None else f"{path}.{key}"
+            # get_nested_value splits on '.', so keys containing one are unreachable
+            child_reachable = reachable and '.' not in key
+            is_object = isinstance(value, dict)
+            if child_reachable and value is not None:
+                entries[child_path] = cls.OBJECT if is_object else value
+            if is_object:
+                stack.append((iter(value.items()), full_key, child_path, child_reachable))
             else:
-                keys.append(full_key)
-    return keys
+                leaf_keys.append(full_key)
+        return cls(leaf_keys, entries)
+    
+    @classmethod
+    def from_cache(cls, cached):
+        entries = dict(cached['entries'])
+        for path in cached['objects']:
+            entries[path] = cls.OBJECT
+        return cls(cached['leafKeys'], entries)
+    
+    def to_cache(self):
+        return {
+            'leafKeys': self.leaf_keys,
+            'entries': {path: value for path, value in self.entries.items() if value is not self.OBJECT},
+            'objects': [path for path, value in self.entries.items() if value is self.OBJECT]
+        }
+    
+    @property
+    def leaf_set(self):
+        if self._leaf_set is None:
+            self._leaf_set = set(self.leaf_keys)
+        return self._leaf_set
+    
+    def has(self, key_path):
+        return key_path in self.entries
+    
+    def get(self, key_path):
+        return self.entries.get(key_path)
+
+class LocaleStore:
+    """Locale tables per physical file.
+    
+    Every public/locales/<lang>/<path>.json is read, parsed and flattened at most once
+    (or restored from the inspection cache); namespaces aliasing the same file, e.g.
+    blog/blogArticles -> pages/blog, share one LocaleTable.
+    """
+    
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.tables = {}
+    
+    def table(self, lang, file_namespace):
+        """LocaleTable of public/locales/<lang>/<file_namespace>.json, or None if missing, invalid or empty."""
+        key = (lang, file_namespace)
+        if key not in self.tables:
+            self.tables[key] = self._load(lang, file_namespace)
+        return self.tables[key]
+    
+    def namespace(self, lang, namespace):
+        return self.table(lang, NS_MAPPING.get(namespace, namespace))
+    
+    def invalidate(self, file_path):
+        """Forget the table of a changed locale file so the next lookup reloads it."""
+        rel_path = Path(file_path).relative_to(LOCALES_DIR)
+        lang = rel_path.parts[0]
+        self.tables.pop((lang, Path(*rel_path.parts[1:]).with_suffix('').as_posix()), None)
+    
+    def _load(self, lang, file_namespace):
+        file_path = LOCALES_DIR / lang / f"{file_namespace}.json"
+        if not file_path.exists():
+            return None
+        if self.cache is not None:
+            cached = self.cache.lookup('locales', file_path)
+            if cached is not None:
+                return LocaleTable.from_cache(cached) if cached['present'] else None
+        data = load_locale_file(lang, file_namespace)
+        if data is None:
+            return None
+        table = LocaleTable.from_data(data) if data else None
+        if self.cache is not None:
+            self.cache.store('locales', file_path, {'present': table is not None, **(table.to_cache() if table else {})})
+        return table
+
+class InspectionCache:
+    """Persistent parsed locale files keyed by path, mtime/size and content hash.
+    
+    A file whose mtime and size are unchanged is not read at all; otherwise it is
+    hashed and only re-parsed when its content actually changed. Entries of files
+    not seen during a run are dropped on save. Source files are cached by the
+    source scanner instead (see scan_sources).
+    """
+    
+    VERSION = 4
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sections = {}
+        self.seen = set()
+        self.dirty = False
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            stored = orjson.loads(raw) if orjson is not None else json.loads(raw.decode('utf-8'))
+            if stored.get('version') == self.VERSION:
+                self.sections = stored.get('sections', {})
+        except (OSError, ValueError):
+            pass
+    
+    @staticmethod
+    def _key(file_path):
+        return os.path.relpath(file_path, Path(__file__).parent)
+    
+    @staticmethod
+    def content_hash(raw):
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+    
+    def lookup(self, section, file_path):
+        """Return the cached result for file_path, or None when it must be recomputed."""
+        key = self._key(file_path)
+        self.seen.add((section, key))
+        entry = self.sections.get(section, {}).get(key)
+        if entry is None:
+            return None
+        stat = os.stat(file_path)
+        if entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['result']
+        with open(file_path, 'rb') as f:
+            digest = self.content_hash(f.read())
+        if entry['hash'] != digest:
+            return None
+        entry['mtime'], entry['size'] = stat.st_mtime_ns, stat.st_size
+        self.dirty = True
+        return entry['result']
+    
+    def store(self, section, file_path, result, raw=None):
+        key = self._key(file_path)
+        stat = os.stat(file_path)
+        if raw is None:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        self.sections.setdefault(section, {})[key] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': self.content_hash(raw),
+            'result': result
+        }
+        self.seen.add((section, key))
+        self.dirty = True
+    
+    def save(self):
+        for section, entries in self.sections.items():
+            for key in [key for key in entries if (section, key) not in self.seen]:
+                del entries[key]
+                self.dirty = True
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        payload = {'version': self.VERSION, 'sections': self.sections}
+        with open(tmp_path, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(payload))
+            else:
+                f.write(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
 
 def get_nested_value(obj, key_path):
+    if isinstance(obj, LocaleTable):
+        return obj.get(key_path)
     keys = key_path.split('.')
     value = obj
     for key in keys:
@@ -107,131 +416,893 @@ def parse_translation_key(key):
         return {'namespace': namespace, 'key': key_path}
     return {'namespace': 'common', 'key': key}
 
+class UsedKeyIndex:
+    """Index of the translation keys used in code.
+
+    Holds the parsed (namespace, key) pairs for constant-time membership checks and,
+    per namespace, a trie over the dotted key segments for prefix-usage queries
+    ("is anything under dashboard:calendar.* used").
+    """
+    
+    END = None  # trie marker for "a used key ends here"; segments are always strings
+    
+    def __init__(self, used_keys=()):
+        self.pairs = set()
+        self.tries = {}
+        self.counts = defaultdict(int)  # used key -> number of add() calls not yet removed
+        for used_key in used_keys:
+            self.add(used_key)
+    
+    def add(self, used_key):
+        """Count one use of used_key; returns its (namespace, key) pair if that pair is new."""
+        self.counts[used_key] += 1
+        if self.counts[used_key] > 1:
+            return None
+        parsed = parse_translation_key(used_key)
+        namespace, key = parsed['namespace'], parsed['key']
+        node = self.tries.setdefault(namespace, {})
+        for segment in key.split('.'):
+            node = node.setdefault(segment, {})
+        node[self.END] = node.get(self.END, 0) + 1
+        if (namespace, key) in self.pairs:
+            return None
+        self.pairs.add((namespace, key))
+        return namespace, key
+    
+    def remove(self, used_key):
+        """Undo one add(); returns the (namespace, key) pair if its last use was removed."""
+        if self.counts.get(used_key, 0) == 0:
+            return None
+        self.counts[used_key] -= 1
+        if self.counts[used_key]:
+            return None
+        del self.counts[used_key]
+        parsed = parse_translation_key(used_key)
+        namespace, key = parsed['namespace'], parsed['key']
+        path = [self.tries[namespace]]
+        segments = key.split('.')
+        for segment in segments:
+            path.append(path[-1][segment])
+        # "ns:key" and " ns : key" share a pair; it stays while either is used
+        path[-1][self.END] -= 1
+        if path[-1][self.END]:
+            return None
+        del path[-1][self.END]
+        self.pairs.discard((namespace, key))
+        for depth in range(len(segments), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][segments[depth - 1]]
+        if not self.tries[namespace]:
+            del self.tries[namespace]
+        return namespace, key
+    
+    def used_keys(self):
+        return set(self.counts)
+    
+    def __contains__(self, pair):
+        return pair in self.pairs
+    
+    def _prefix_node(self, namespace, prefix):
+        node = self.tries.get(namespace)
+        prefix = prefix[:-2] if prefix.endswith('.*') else prefix.rstrip('.')
+        if node is None or not prefix:
+            return node
+        for segment in prefix.split('.'):
+            node = node.get(segment)
+            if node is None:
+                return None
+        return node
+    
+    def has_prefix(self, namespace, prefix):
+        return self._prefix_node(namespace, prefix) is not None
+    
+    def keys_under(self, namespace, prefix):
+        """Used keys of ``namespace`` equal to ``prefix`` or below it, sorted."""
+        node = self._prefix_node(namespace, prefix)
+        if node is None:
+            return []
+        base = prefix[:-2] if prefix.endswith('.*') else prefix.rstrip('.')
+        keys = []
+        stack = [(node, base)]
+        while stack:
+            node, path = stack.pop()
+            for segment, child in node.items():
+                if segment is self.END:
+                    keys.append(path)
+                else:
+                    stack.append((child, f"{path}.{segment}" if path else segment))
+        return sorted(keys)
+
 def find_hardcoded_strings(content):
-    hardcoded = []
-    lines = content.split('\n')
-    
-    suspicious_keywords = [
-        'title', 'label', 'placeholder', 'text', 'message', 'error', 'success',
-        'warning', 'info', 'description', 'button', 'submit', 'cancel', 'save',
-        'delete', 'edit', 'add', 'remove', 'close', 'open', 'confirm', 'reject',
-        'approve', 'decline', 'accept', 'logout', 'login', 'register', 'forgot',
-        'reset', 'change', 'profile', 'settings', 'help', 'support', 'contact',
-        'about', 'terms', 'privacy', 'language', 'theme', 'notifications', 'messages',
-        'dashboard', 'home', 'back', 'next', 'continue', 'finish', 'required',
-        'optional', 'select', 'search', 'filter', 'sort', 'show', 'hide', 'view',
-        'preview', 'download', 'upload', 'expand', 'collapse', 'enable', 'disable',
-        'activate', 'deactivate'
-    ]
-    
-    for line_num, line in enumerate(lines, 1):
-        if line.strip().startswith('//') or line.strip().startswith('*'):
-            continue
-        
-        for keyword in suspicious_keywords:
-            pattern = rf"{keyword}\s*[:=]\s*['\"`]([A-Z][^'\"`]{{3,}})['\"`]"
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
-                text = match.group(1)
-                if (text and 
-                    'http' not in text and 
-                    'className' not in text and 
-                    'id=' not in text and
-                    'src=' not in text and
-                    len(text) > 3 and
-                    '{{' not in text and
-                    '${' not in text):
-                    hardcoded.append({
-                        'line': line_num,
-                        'text': text[:100],
-                        'context': line.strip()[:150]
-                    })
-    
-    return hardcoded
-
-def main():
-    print('🔍 Starting translation inspection...\n')
+    return scan_source(content)[1]
+
+def scan_file(file_path):
+    """Scan one source file again after a change (--watch).
     
-    all_locale_keys = {}
-    used_keys = set()
-    missing_keys = defaultdict(lambda: defaultdict(list))
-    legacy_keys = defaultdict(lambda: defaultdict(list))
-    hardcoded_strings = {}
+    Returns (file_path, key_sites, hardcoded, error) with key_sites as [key, line]
+    pairs in source order, the same shape as the TranslationAnalyzer facts.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        key_sites, hardcoded = scan_source(content)
+        return file_path, [[key, line] for key, line in key_sites], hardcoded, None
+    except Exception as e:
+        return file_path, [], [], str(e)
+
+class TranslationAnalyzer(Analyzer):
+    """scan_source() as a source scanner analyzer (see scripts/source_scan.py), for the src/ files.
     
-    print('📚 Loading locale files...')
+    Facts are {'sites': [[key, line], ...], 'hardcoded': [...]}, like the scan_file results.
+    """
+    
+    name = 'translations'
+    extensions = ('.js', '.jsx')
+    roots = (SRC_DIR.name,)
+    
+    def analyze(self, rel_path, content):
+        key_sites, hardcoded = scan_source(content)
+        return {'sites': [[key, line] for key, line in key_sites], 'hardcoded': hardcoded}
+
+def scan_sources(jobs=1, use_cache=True):
+    """(index, scan): TranslationAnalyzer run over the src/ files of the shared project index.
+    
+    Uses the same index snapshot as fix_casing.py; both the index and the per-file
+    facts are persisted unless use_cache is False.
+    """
+    cache_path = True if use_cache else None
+    index = ProjectIndex.load(Path(__file__).parent, exclude_dirs={'node_modules', '.git'}, cache_path=cache_path)
+    scan = SourceScan(index, [TranslationAnalyzer()], cache_path=cache_path, jobs=jobs).run()
+    return index, scan
+
+def load_all_locales(store):
+    """{lang: {namespace: LocaleTable}} for NS_MAPPING plus common, served by ``store``."""
+    all_locale_keys = {}
     for lang in LANGUAGES:
         all_locale_keys[lang] = {}
         for ns, file_path in NS_MAPPING.items():
-            data = load_locale_file(lang, file_path)
-            if data:
-                all_locale_keys[lang][ns] = data
+            table = store.table(lang, file_path)
+            if table:
+                all_locale_keys[lang][ns] = table
         
-        common_file = load_locale_file(lang, 'common')
-        if common_file:
-            all_locale_keys[lang]['common'] = common_file
-    
-    print('🔎 Scanning source files for translation keys...')
-    source_files = get_all_files(SRC_DIR)
-    print(f'Found {len(source_files)} source files\n')
-    
-    for file_path in source_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            keys = extract_translation_keys(content)
-            used_keys.update(keys)
-            
-            hardcoded = find_hardcoded_strings(content)
-            if hardcoded:
-                rel_path = os.path.relpath(file_path, SRC_DIR)
-                hardcoded_strings[rel_path] = hardcoded
-        except Exception as e:
-            print(f"Warning: Error reading {file_path}: {e}")
-    
-    print(f'Found {len(used_keys)} unique translation keys in code\n')
+        common_table = store.table(lang, 'common')
+        if common_table:
+            all_locale_keys[lang]['common'] = common_table
+    return all_locale_keys
+
+def iter_missing_keys(used_keys, all_locale_keys, store):
+    """Yield (lang, namespace, key) for every used key absent from its namespace.
     
-    print('🔍 Checking for missing keys...')
-    for used_key in used_keys:
+    Namespaces missing from all_locale_keys (not in NS_MAPPING) are loaded from
+    public/locales/<lang>/<namespace>.json on first use and added to it.
+    """
+    # Sorted so the report does not depend on set iteration order.
+    for used_key in sorted(used_keys):
         parsed = parse_translation_key(used_key)
         namespace = parsed['namespace']
         key = parsed['key']
-        mapped_path = NS_MAPPING.get(namespace, namespace)
         
         for lang in LANGUAGES:
             locale_data = all_locale_keys[lang].get(namespace)
             
             if not locale_data:
-                file_path = LOCALES_DIR / lang / f"{mapped_path}.json"
-                if file_path.exists():
+                locale_data = store.namespace(lang, namespace)
+                if locale_data:
+                    all_locale_keys[lang][namespace] = locale_data
+            
+            if not locale_data or not locale_data.has(key):
+                yield lang, namespace, key
+
+def iter_legacy_keys(all_locale_keys, used_index):
+    """Yield (lang, namespace, key) for every locale key not used in code."""
+    for lang in LANGUAGES:
+        for namespace, locale_data in all_locale_keys[lang].items():
+            for full_key in locale_data.leaf_keys:
+                if (namespace, full_key) not in used_index:
+                    yield lang, namespace, full_key
+
+def group_findings(findings):
+    grouped = defaultdict(lambda: defaultdict(list))
+    for lang, namespace, key in findings:
+        grouped[lang][namespace].append(key)
+    return grouped
+
+def find_missing_keys(used_keys, all_locale_keys, store):
+    """Used keys absent from their namespace, as {lang: {namespace: [key, ...]}}."""
+    return group_findings(iter_missing_keys(used_keys, all_locale_keys, store))
+
+def find_legacy_keys(all_locale_keys, used_index):
+    """Locale keys not used in code, as {lang: {namespace: [key, ...]}}."""
+    return group_findings(iter_legacy_keys(all_locale_keys, used_index))
+
+def flatten_findings(findings):
+    return {(lang, ns, key) for lang, namespaces in findings.items() for ns, keys in namespaces.items() for key in keys}
+
+class InotifyWatcher:
+    """Recursive inotify watch (Linux, via ctypes) yielding batches of changed file paths."""
+    
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    EVENT_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, roots, settle=0.05):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.settle = settle
+        self.dirs = {}
+        for root in roots:
+            self._watch_tree(str(root))
+    
+    def _watch_tree(self, root):
+        for directory, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in ('node_modules', '.git')]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENT_MASK)
+            if wd >= 0:
+                self.dirs[wd] = directory
+    
+    def _read(self):
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += name_length
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._watch_tree(path)
+                    changed.update(get_all_files(path))
+            elif not mask & self.IN_CREATE:
+                # a created file is reported again on close_write
+                changed.add(path)
+        return changed
+    
+    def changes(self):
+        while True:
+            select.select([self.fd], [], [])
+            changed = self._read()
+            # editors save in several steps; collect them into one batch
+            while select.select([self.fd], [], [], self.settle)[0]:
+                changed |= self._read()
+            if changed:
+                yield changed
+
+class PollingWatcher:
+    """Fallback when inotify is unavailable: compares mtimes every ``interval`` seconds."""
+    
+    def __init__(self, roots, interval=0.5):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self._snapshot()
+    
+    def _snapshot(self):
+        snapshot = {}
+        for root in self.roots:
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d not in ('node_modules', '.git')]
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            locale_data = json.load(f)
-                        all_locale_keys[lang][namespace] = locale_data
-                    except Exception as e:
+                        snapshot[path] = os.stat(path).st_mtime_ns
+                    except OSError:
                         pass
-            
-            if not locale_data:
-                missing_keys[lang][namespace].append(key)
-            else:
-                value = get_nested_value(locale_data, key)
-                if value is None:
-                    missing_keys[lang][namespace].append(key)
+        return snapshot
     
-    print('🔍 Checking for legacy keys...')
+    def changes(self):
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed:
+                yield changed
+
+class WatchSession:
+    """In-memory inspection state updated per changed file, for --watch.
+    
+    Starts from ``results``, the TranslationAnalyzer facts keyed by absolute path.
+    """
+    
+    def __init__(self, results, cache=None):
+        self.cache = cache
+        self.store = LocaleStore(cache)
+        self.index = UsedKeyIndex()
+        self.file_keys = {}
+        self.file_hardcoded = {}
+        # (namespace, key) pairs that entered / left the index since the last apply()
+        self.added_pairs = set()
+        self.removed_pairs = set()
+        for file_path, facts in results.items():
+            self.set_source(file_path, (facts['sites'], facts['hardcoded']))
+        self.all_locale_keys = load_all_locales(self.store)
+        self.missing, self.legacy = self.findings()
+        self.added_pairs.clear()
+        self.removed_pairs.clear()
+    
+    def update_source(self, file_path):
+        """Rescan one source file; returns its hardcoded hits that were not there before."""
+        result = None
+        if os.path.exists(file_path):
+            _, key_sites, hardcoded, error = scan_file(file_path)
+            if error is None:
+                result = (key_sites, hardcoded)
+        return self.set_source(file_path, result)
+    
+    def set_source(self, file_path, result):
+        """Replace the (key_sites, hardcoded) of one file, None when it is gone or unreadable."""
+        for key in self.file_keys.pop(file_path, ()):
+            self._pair_changed(self.index.remove(key), self.removed_pairs, self.added_pairs)
+        previous = {(item['text'], item['context']) for item in self.file_hardcoded.pop(file_path, ())}
+        if result is None:
+            return []
+        key_sites, hardcoded = result
+        keys = sorted({key for key, _ in key_sites})
+        self.file_keys[file_path] = keys
+        for key in keys:
+            self._pair_changed(self.index.add(key), self.added_pairs, self.removed_pairs)
+        if hardcoded:
+            self.file_hardcoded[file_path] = hardcoded
+        # compared without line numbers so edits above a literal do not report it again
+        return [item for item in hardcoded if (item['text'], item['context']) not in previous]
+    
+    @staticmethod
+    def _pair_changed(pair, into, out_of):
+        if pair is None:
+            return
+        if pair in out_of:
+            out_of.discard(pair)  # removed and re-added within one batch
+        else:
+            into.add(pair)
+    
+    def reload_locales(self, changed_paths):
+        for path in changed_paths:
+            self.store.invalidate(path)
+        self.all_locale_keys = load_all_locales(self.store)
+    
+    def findings(self):
+        missing = find_missing_keys(self.index.used_keys(), self.all_locale_keys, self.store)
+        return flatten_findings(missing), flatten_findings(find_legacy_keys(self.all_locale_keys, self.index))
+    
+    def incremental_findings(self):
+        """Update the missing/unused sets for the pairs that changed since the last batch."""
+        loaded = {lang: set(namespaces) for lang, namespaces in self.all_locale_keys.items()}
+        missing, legacy = set(self.missing), set(self.legacy)
+        for namespace, key in self.removed_pairs:
+            for lang in LANGUAGES:
+                missing.discard((lang, namespace, key))
+                locale_data = self.all_locale_keys[lang].get(namespace)
+                if locale_data and key in locale_data.leaf_set:
+                    legacy.add((lang, namespace, key))
+        added_keys = [f'{namespace}:{key}' for namespace, key in self.added_pairs]
+        missing |= flatten_findings(find_missing_keys(added_keys, self.all_locale_keys, self.store))
+        if any(set(self.all_locale_keys[lang]) != loaded[lang] for lang in LANGUAGES):
+            # a new key pulled in a namespace outside NS_MAPPING: its keys are new unused candidates
+            return missing, flatten_findings(find_legacy_keys(self.all_locale_keys, self.index))
+        for namespace, key in self.added_pairs:
+            for lang in LANGUAGES:
+                legacy.discard((lang, namespace, key))
+        return missing, legacy
+    
+    def apply(self, changed_paths):
+        """Process one batch of changed paths and return the printable delta lines."""
+        src_root, locales_root = str(SRC_DIR), str(LOCALES_DIR)
+        new_hardcoded = []
+        changed_locales = []
+        for path in sorted(changed_paths):
+            if path.startswith(src_root + os.sep) and path.endswith(('.js', '.jsx')):
+                rel_path = os.path.relpath(path, SRC_DIR)
+                new_hardcoded.extend((rel_path, item) for item in self.update_source(path))
+            elif path.startswith(locales_root + os.sep) and path.endswith('.json'):
+                changed_locales.append(path)
+        if changed_locales:
+            self.reload_locales(changed_locales)
+            missing, legacy = self.findings()
+        else:
+            missing, legacy = self.incremental_findings()
+        self.added_pairs.clear()
+        self.removed_pairs.clear()
+        lines = []
+        for sign, label, entries in (('+', 'missing', missing - self.missing), ('-', 'missing', self.missing - missing),
+                                     ('+', 'unused', legacy - self.legacy), ('-', 'unused', self.legacy - legacy)):
+            for lang, ns, key in sorted(entries):
+                lines.append(f'  {sign} {label:<9} {lang}  {ns}:{key}')
+        for rel_path, item in new_hardcoded:
+            lines.append(f'  + hardcoded {rel_path}:{item["line"]}  "{item["text"][:60]}"')
+        self.missing, self.legacy = missing, legacy
+        return lines
+
+def watch(index, scan, cache=None):
+    """Watch src/ and public/locales/ and print only what changed after each save."""
+    start = time.perf_counter()
+    results = {index.abspath(rel_path): facts for rel_path, facts in scan.results['translations'].items()}
+    session = WatchSession(results, cache)
+    if cache is not None:
+        cache.save()
+    roots = [SRC_DIR, LOCALES_DIR]
+    try:
+        watcher = InotifyWatcher(roots)
+        backend = 'inotify'
+    except (OSError, AttributeError):
+        watcher = PollingWatcher(roots)
+        backend = 'polling'
+    print(f'👀 Watching {SRC_DIR.name}/ and {LOCALES_DIR.relative_to(LOCALES_DIR.parent.parent)}/ ({backend}): '
+          f'{len(session.index.counts)} used keys, {len(session.missing)} missing, {len(session.legacy)} unused '
+          f'({(time.perf_counter() - start) * 1000:.0f} ms)')
+    try:
+        for changed_paths in watcher.changes():
+            batch_start = time.perf_counter()
+            lines = session.apply(changed_paths)
+            if lines:
+                names = ', '.join(sorted(os.path.relpath(path, Path(__file__).parent) for path in changed_paths)[:3])
+                print(f'[{datetime.now():%H:%M:%S}] {names} ({(time.perf_counter() - batch_start) * 1000:.0f} ms)')
+                print('\n'.join(lines), flush=True)
+            if cache is not None:
+                cache.save()
+    except KeyboardInterrupt:
+        pass
+
+def frontend_ns_mapping():
+    """The nsMapping object of src/i18n.js (namespace -> file path), {} if it cannot be read."""
+    try:
+        content = FRONTEND_I18N_PATH.read_text(encoding='utf-8')
+    except OSError:
+        return {}
+    match = re.search(r"const nsMapping = \{(.*?)\};", content, re.DOTALL)
+    if not match:
+        return {}
+    return {ns: path for _, ns, path in re.findall(r"(['\"]?)([\w/]+)\1\s*:\s*['\"]([^'\"]+)['\"]", match.group(1))}
+
+def prune_locale_tree(obj, tries):
+    """Copy of a locale object reduced to what the used-key tries reach.
+    
+    A trie end keeps the whole subtree (t() with returnObjects returns objects) and
+    i18next suffix variants of a used key (key_one, key_other, key_male, ...).
+    """
+    pruned = {}
+    for key, value in obj.items():
+        children = [trie[key] for trie in tries if key in trie]
+        keep_all = any(UsedKeyIndex.END in child for child in children)
+        if not keep_all and '_' in key:
+            bases = [key[:i] for i, char in enumerate(key) if char == '_']
+            keep_all = any(UsedKeyIndex.END in trie.get(base, ()) for trie in tries for base in bases)
+        if keep_all:
+            pruned[key] = value
+        elif children and isinstance(value, dict):
+            subtree = prune_locale_tree(value, children)
+            if subtree:
+                pruned[key] = subtree
+    return pruned
+
+def dump_minified(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def compile_locale_bundles(out_dir, used_keys, keep_prefixes=()):
+    """Write used-keys-only, minified, content-hashed locale bundles and a manifest.
+    
+    Namespace files are reduced to the keys used in code and the allowlisted
+    keep_prefixes (for dynamic keys such as t(`terms.sections.${id}`)). A key without
+    a namespace prefix is kept in every namespace file, since its namespace comes
+    from useTranslation() at runtime. Other locale files are only minified.
+    Returns [(lang, file namespace, bytes before, bytes after, pruned)].
+    """
+    # Bare keys and prefixes ("foo.bar") are indexed under 'common' by parse_translation_key.
+    prefixed = UsedKeyIndex(key for key in used_keys if ':' in key)
+    bare = UsedKeyIndex(key for key in used_keys if ':' not in key)
+    for prefix in keep_prefixes:
+        prefix = prefix[:-2] if prefix.endswith('.*') else prefix.rstrip('.')
+        (prefixed if ':' in prefix else bare).add(prefix)
+    
+    # The frontend mapping wins where both map a namespace (e.g. common -> dashboard/common)
+    mapping = {**NS_MAPPING, **frontend_ns_mapping()}
+    file_namespaces = defaultdict(set)
+    for ns, path in mapping.items():
+        file_namespaces[path].add(ns)
+    for ns in prefixed.tries:
+        file_namespaces[mapping.get(ns, ns)].add(ns)
+    
+    out_dir = Path(out_dir)
+    manifest = {}
+    report = []
     for lang in LANGUAGES:
-        for namespace, locale_data in all_locale_keys[lang].items():
-            all_keys_in_file = get_all_keys_from_object(locale_data)
-            
-            for full_key in all_keys_in_file:
-                found = False
-                for used_key in used_keys:
-                    parsed = parse_translation_key(used_key)
-                    if parsed['namespace'] == namespace and parsed['key'] == full_key:
-                        found = True
-                        break
-                
-                if not found:
-                    legacy_keys[lang][namespace].append(full_key)
+        manifest[lang] = {}
+        for file_path in sorted((LOCALES_DIR / lang).rglob('*.json')):
+            file_ns = file_path.relative_to(LOCALES_DIR / lang).with_suffix('').as_posix()
+            data = load_locale_file(lang, file_ns)
+            if data is None:
+                continue
+            is_namespace = file_ns in file_namespaces and isinstance(data, dict)
+            if is_namespace:
+                tries = [prefixed.tries[ns] for ns in file_namespaces[file_ns] if ns in prefixed.tries]
+                if 'common' in bare.tries:
+                    tries.append(bare.tries['common'])
+                data = prune_locale_tree(data, tries)
+            content = dump_minified(data)
+            digest = hashlib.sha256(content).hexdigest()[:10]
+            bundle_path = out_dir / lang / f"{file_ns}.{digest}.json"
+            bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            bundle_path.write_bytes(content)
+            manifest[lang][file_ns] = bundle_path.relative_to(out_dir).as_posix()
+            report.append((lang, file_ns, file_path.stat().st_size, len(content), is_namespace))
+    
+    (out_dir / 'manifest.json').write_bytes(dump_minified(manifest))
+    return report
+
+def print_bundle_report(report, out_dir):
+    print(f'📦 Locale bundles written to {out_dir} (manifest.json maps lang/namespace to the hashed file)\n')
+    print(f"  {'lang':<5} {'files':>5} {'before':>10} {'after':>10} {'saved':>7}")
+    for lang in LANGUAGES:
+        rows = [row for row in report if row[0] == lang]
+        before = sum(row[2] for row in rows)
+        after = sum(row[3] for row in rows)
+        if rows:
+            print(f'  {lang:<5} {len(rows):>5} {before:>10,} {after:>10,} {1 - after / max(before, 1):>7.1%}')
+    before = sum(row[2] for row in report)
+    after = sum(row[3] for row in report)
+    print(f"  {'all':<5} {len(report):>5} {before:>10,} {after:>10,} {1 - after / max(before, 1):>7.1%}\n")
+    print('  Largest namespace bundles after pruning:')
+    for lang, file_ns, before, after, _ in sorted((row for row in report if row[4]), key=lambda row: -row[3])[:10]:
+        print(f'    {lang}/{file_ns}: {before:,} -> {after:,} bytes')
+    skipped = sorted({file_ns for _, file_ns, _, _, pruned in report if not pruned})
+    if skipped:
+        print(f'\n  Not i18n namespaces, minified only: {", ".join(skipped)}')
+
+def read_keep_prefixes(args):
+    prefixes = list(args.keep_prefix)
+    if args.keep_prefixes_file:
+        with open(args.keep_prefixes_file, 'r', encoding='utf-8') as f:
+            prefixes.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith('#'))
+    return prefixes
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+class JsonReportWriter:
+    """The classic report: findings are collected and written at the end as one
+    indented JSON document plus translation-missing-keys.csv next to it."""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.csv_path = self.path.with_name('translation-missing-keys.csv')
+        self.missing = defaultdict(lambda: defaultdict(list))
+        self.legacy = defaultdict(lambda: defaultdict(list))
+        self.hardcoded = {}
+    
+    def add_missing(self, lang, namespace, key):
+        self.missing[lang][namespace].append(key)
+    
+    def add_legacy(self, lang, namespace, key):
+        self.legacy[lang][namespace].append(key)
+    
+    def add_hardcoded(self, rel_path, item):
+        self.hardcoded.setdefault(rel_path, []).append(item)
+    
+    def add_usage(self, key, rel_path, line):
+        pass  # usage sites are only part of the streamed formats
+    
+    def close(self, summary, used_keys):
+        report_data = {
+            'summary': summary,
+            'missingKeys': {lang: {ns: keys for ns, keys in data.items()}
+                           for lang, data in self.missing.items()},
+            'legacyKeys': {lang: {ns: keys for ns, keys in data.items()}
+                          for lang, data in self.legacy.items()},
+            'hardcodedStrings': self.hardcoded,
+            'usedKeys': sorted(list(used_keys)),
+            'timestamp': datetime.now().isoformat()
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(report_data, f, indent=2, ensure_ascii=False)
+    
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write('Language,Namespace,Key\n')
+            for lang in sorted(self.missing.keys()):
+                for ns in sorted(self.missing[lang].keys()):
+                    for key in self.missing[lang][ns]:
+                        f.write(f'{lang},{ns},{key}\n')
+        return [f'\n📄 Detailed report saved to: {self.path}', f'📊 Missing keys CSV saved to: {self.csv_path}']
+
+class JsonlReportWriter:
+    """Streams one JSON object per finding to disk as soon as it is produced.
+    
+    Records are {"type": "missing"|"legacy", lang, namespace, key},
+    {"type": "hardcoded", file, line, text, context}, {"type": "usage", key, namespace,
+    file, line} and a final {"type": "summary", ...}. The file is written under a
+    temporary name and only replaces the previous report once complete.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self.file = open(self.tmp_path, 'wb')
+    
+    def _write(self, record):
+        self.file.write(dump_minified(record) + b'\n')
+    
+    def add_missing(self, lang, namespace, key):
+        self._write({'type': 'missing', 'lang': lang, 'namespace': namespace, 'key': key})
+    
+    def add_legacy(self, lang, namespace, key):
+        self._write({'type': 'legacy', 'lang': lang, 'namespace': namespace, 'key': key})
+    
+    def add_hardcoded(self, rel_path, item):
+        self._write({'type': 'hardcoded', 'file': rel_path, **item})
+    
+    def add_usage(self, key, rel_path, line):
+        self._write({'type': 'usage', 'key': key, 'namespace': parse_translation_key(key)['namespace'],
+                     'file': rel_path, 'line': line})
+    
+    def close(self, summary, used_keys):
+        self._write({'type': 'summary', **summary, 'timestamp': datetime.now().isoformat()})
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        return [f'\n📄 Report streamed to: {self.path}']
+
+class SqliteReportWriter:
+    """Streams findings into a local SQLite file, one table per finding kind.
+    
+    Rows are inserted in batches while the inspection runs; indexes are created once
+    at the end, which is cheaper than maintaining them on every insert.
+    """
+    
+    SCHEMA = {
+        'missing': ('lang', 'namespace', 'key'),
+        'legacy': ('lang', 'namespace', 'key'),
+        'hardcoded': ('file', 'line', 'text', 'context'),
+        'usage': ('key', 'namespace', 'file', 'line'),
+        'summary': ('name', 'value')
+    }
+    INDEXES = {
+        'missing': [('lang', 'namespace', 'key')],
+        'legacy': [('lang', 'namespace', 'key')],
+        'hardcoded': [('file', 'line')],
+        'usage': [('namespace', 'key'), ('file', 'line')]
+    }
+    BATCH_SIZE = 1000
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.tmp')
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+        self.db = sqlite3.connect(self.tmp_path)
+        for table, columns in self.SCHEMA.items():
+            self.db.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        self.pending = defaultdict(list)
+    
+    def _add(self, table, row):
+        rows = self.pending[table]
+        rows.append(row)
+        if len(rows) >= self.BATCH_SIZE:
+            self._flush(table)
+    
+    def _flush(self, table):
+        rows = self.pending.pop(table, None)
+        if rows:
+            placeholders = ', '.join('?' * len(self.SCHEMA[table]))
+            self.db.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+    
+    def add_missing(self, lang, namespace, key):
+        self._add('missing', (lang, namespace, key))
+    
+    def add_legacy(self, lang, namespace, key):
+        self._add('legacy', (lang, namespace, key))
+    
+    def add_hardcoded(self, rel_path, item):
+        self._add('hardcoded', (rel_path, item['line'], item['text'], item['context']))
+    
+    def add_usage(self, key, rel_path, line):
+        self._add('usage', (key, parse_translation_key(key)['namespace'], rel_path, line))
+    
+    def close(self, summary, used_keys):
+        for table in list(self.pending):
+            self._flush(table)
+        summary = {**summary, 'timestamp': datetime.now().isoformat()}
+        self.db.executemany('INSERT INTO summary VALUES (?, ?)', summary.items())
+        for table, indexes in self.INDEXES.items():
+            for columns in indexes:
+                self.db.execute(f"CREATE INDEX {table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})")
+        self.db.commit()
+        self.db.close()
+        os.replace(self.tmp_path, self.path)
+        return [f'\n📄 Report streamed to: {self.path}']
+
+REPORT_WRITERS = {
+    'json': (JsonReportWriter, 'translation-inspection-report.json'),
+    'jsonl': (JsonlReportWriter, 'translation-inspection-report.jsonl'),
+    'sqlite': (SqliteReportWriter, 'translation-inspection-report.sqlite')
+}
+
+def open_report_writer(report_format, path=None):
+    writer_cls, default_name = REPORT_WRITERS[report_format]
+    return writer_cls(path or Path(__file__).parent / default_name)
+
+def query_report(path, kind, lang=None, namespace=None, key_prefix=None, file_prefix=None):
+    """Yield the rows of one finding kind from a .jsonl or SQLite report as dicts.
+    
+    SQLite reports are filtered in SQL (using the indexes); JSONL reports are filtered
+    while streaming, one line at a time. Filters on columns the kind does not have
+    are ignored.
+    """
+    columns = SqliteReportWriter.SCHEMA[kind]
+    equals = [(column, value) for column, value in (('lang', lang), ('namespace', namespace))
+              if value is not None and column in columns]
+    prefixes = [(column, value) for column, value in (('key', key_prefix), ('file', file_prefix))
+                if value is not None and column in columns]
+    
+    with open(path, 'rb') as f:
+        is_sqlite = f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    
+    if is_sqlite:
+        clauses = [f'{column} = ?' for column, _ in equals]
+        clauses += [f'substr({column}, 1, {len(value)}) = ?' for column, value in prefixes]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        db.row_factory = sqlite3.Row
+        try:
+            for row in db.execute(f'SELECT * FROM {kind}{where}', [value for _, value in equals + prefixes]):
+                yield dict(row)
+        finally:
+            db.close()
+        return
+    
+    with open(path, 'rb') as f:
+        for line in f:
+            record = orjson.loads(line) if orjson is not None else json.loads(line)
+            if record.pop('type', None) != kind:
+                continue
+            if any(record.get(column) != value for column, value in equals):
+                continue
+            if any(not str(record.get(column, '')).startswith(value) for column, value in prefixes):
+                continue
+            yield record
+
+def run_query(args):
+    rows = query_report(args.report, args.kind, args.lang, args.namespace, args.key_prefix, args.file)
+    if args.count:
+        print(sum(1 for _ in rows))
+        return
+    out = sys.stdout.buffer
+    for index, row in enumerate(rows):
+        if args.limit is not None and index >= args.limit:
+            break
+        out.write(dump_minified(row) + b'\n')
+    out.flush()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect translation key usage against public/locales')
+    parser.add_argument('--used-prefix', action='append', default=[], metavar='NS:PREFIX',
+                        help='Only list the used keys under this prefix (e.g. "dashboard:calendar.*") and exit; repeatable')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Scan source files with N worker processes (default: 1, in-process)')
+    parser.add_argument('--cache', default=str(CACHE_PATH),
+                        help='Locale cache file; only changed locale files are re-parsed (default: %(default)s). Source '
+                             'files are cached by the shared source scan (scripts/source_scan.py)')
+    parser.add_argument('--no-cache', action='store_true', help='Scan everything and do not touch any cache')
+    parser.add_argument('--compile-bundles', metavar='OUT_DIR',
+                        help='Write used-keys-only, minified, content-hashed locale bundles to OUT_DIR and exit')
+    parser.add_argument('--keep-prefix', action='append', default=[], metavar='[NS:]PREFIX',
+                        help='Keep this key prefix in compiled bundles (dynamic keys); without NS: in every namespace')
+    parser.add_argument('--keep-prefixes-file', metavar='FILE',
+                        help='File with one --keep-prefix value per line (# comments allowed)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and print only new/resolved missing keys, unused keys and new hardcoded strings on every save')
+    parser.add_argument('--report-format', choices=sorted(REPORT_WRITERS), default='json',
+                        help='json: one report + CSV written at the end (default); jsonl/sqlite: findings '
+                             'and usage sites streamed to disk while inspecting')
+    parser.add_argument('--report', metavar='PATH', help='Report path (default: translation-inspection-report.<format>)')
+    
+    subparsers = parser.add_subparsers(dest='command')
+    query = subparsers.add_parser('query', help='Filter a .jsonl or .sqlite report written with --report-format')
+    query.add_argument('report', help='Report file')
+    query.add_argument('--kind', choices=('missing', 'legacy', 'hardcoded', 'usage'), default='missing')
+    query.add_argument('--lang', help='Only this language (missing/legacy)')
+    query.add_argument('--namespace', help='Only this namespace (missing/legacy/usage)')
+    query.add_argument('--key-prefix', help='Only keys starting with this prefix')
+    query.add_argument('--file', help='Only source files (relative to src/) starting with this prefix (hardcoded/usage)')
+    query.add_argument('--count', action='store_true', help='Print the number of matching rows only')
+    query.add_argument('--limit', type=int, help='Print at most this many rows')
+    return parser.parse_args(argv)
+
+def print_prefix_usage(index, prefixes):
+    for query in prefixes:
+        parsed = parse_translation_key(query)
+        keys = index.keys_under(parsed['namespace'], parsed['key'])
+        print(f"{parsed['namespace']}:{parsed['key']} -> {len(keys)} used keys")
+        for key in keys:
+            print(f'  {key}')
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'query':
+        return run_query(args)
+    print('🔍 Starting translation inspection...\n')
+    
+    # Locale files have their own cache; source files go through the shared source scan.
+    cache = None if args.no_cache else InspectionCache(args.cache)
+    if args.watch:
+        return watch(*scan_sources(args.jobs, not args.no_cache), cache)
+    
+    print('📚 Loading locale files...')
+    store = LocaleStore(cache)
+    all_locale_keys = load_all_locales(store)
+    
+    print('🔎 Scanning source files for translation keys...')
+    index, scan = scan_sources(args.jobs, not args.no_cache)
+    results = scan.results['translations']
+    print(f'Found {len(scan.sizes)} source files\n')
+    for rel_path, error in scan.errors.items():
+        print(f"Warning: Error reading {index.abspath(rel_path)}: {error}")
+    used_keys = {key for facts in results.values() for key, _ in facts['sites']}
+
+    print(f'Found {len(used_keys)} unique translation keys in code\n')
+    
+    if args.compile_bundles:
+        if cache is not None:
+            cache.save()
+        report = compile_locale_bundles(args.compile_bundles, used_keys, read_keep_prefixes(args))
+        print_bundle_report(report, args.compile_bundles)
+        return
+    
+    if args.used_prefix:
+        print_prefix_usage(UsedKeyIndex(used_keys), args.used_prefix)
+        if cache is not None:
+            cache.save()
+        return
+    
+    sources = [(os.path.relpath(index.abspath(rel_path), SRC_DIR), facts['sites'], facts['hardcoded'])
+               for rel_path, facts in results.items()]
+    report_inspection(sources, used_keys, store, all_locale_keys, args.report_format, args.report)
+    if cache is not None:
+        cache.save()
+
+def report_inspection(sources, used_keys, store, all_locale_keys, report_format='json', report_path=None):
+    """Check the used keys against the locales, write the report and print the console summary.
+    
+    ``sources`` are (path relative to src/, key_sites, hardcoded) per scanned file.
+    """
+    used_index = UsedKeyIndex(used_keys)
+    
+    # Findings go straight to the report writer; only per-namespace counts and the
+    # first few hardcoded strings per file are kept for the console summary.
+    writer = open_report_writer(report_format, report_path)
+    hardcoded_counts = {}
+    hardcoded_preview = {}
+    for rel_path, key_sites, hardcoded in sources:
+        for key, line in key_sites:
+            writer.add_usage(key, rel_path, line)
+        if hardcoded:
+            hardcoded_counts[rel_path] = len(hardcoded)
+            hardcoded_preview[rel_path] = hardcoded[:3]
+            for item in hardcoded:
+                writer.add_hardcoded(rel_path, item)
+    
+    print('🔍 Checking for missing keys...')
+    missing_keys = defaultdict(lambda: defaultdict(int))
+    for lang, ns, key in iter_missing_keys(used_keys, all_locale_keys, store):
+        missing_keys[lang][ns] += 1
+        writer.add_missing(lang, ns, key)
+    
+    print('🔍 Checking for legacy keys...')
+    legacy_keys = defaultdict(lambda: defaultdict(int))
+    for lang, ns, key in iter_legacy_keys(all_locale_keys, used_index):
+        legacy_keys[lang][ns] += 1
+        writer.add_legacy(lang, ns, key)
     
     print('\n' + '=' * 80)
     print('📊 INSPECTION RESULTS')
@@ -245,10 +1316,10 @@ def main():
         for ns in sorted(missing_keys[lang].keys()):
             if missing_keys[lang][ns]:
                 has_missing = True
-                lang_total += len(missing_keys[lang][ns])
+                lang_total += missing_keys[lang][ns]
                 if lang not in missing_by_lang:
                     missing_by_lang[lang] = {}
-                missing_by_lang[lang][ns] = len(missing_keys[lang][ns])
+                missing_by_lang[lang][ns] = missing_keys[lang][ns]
         if lang_total > 0:
             print(f'  {lang}: {lang_total} missing keys')
     
@@ -256,7 +1327,7 @@ def main():
         print('\n  Breakdown by namespace (showing top 10 per language):')
         for lang in sorted(missing_keys.keys()):
             ns_entries = sorted(
-                [(ns, len(keys)) for ns, keys in missing_keys[lang].items() if keys],
+                [(ns, count) for ns, count in missing_keys[lang].items() if count],
                 key=lambda x: x[1],
                 reverse=True
             )[:10]
@@ -276,10 +1347,10 @@ def main():
         for ns in sorted(legacy_keys[lang].keys()):
             if legacy_keys[lang][ns]:
                 has_legacy = True
-                lang_total += len(legacy_keys[lang][ns])
+                lang_total += legacy_keys[lang][ns]
                 if lang not in legacy_by_lang:
                     legacy_by_lang[lang] = {}
-                legacy_by_lang[lang][ns] = len(legacy_keys[lang][ns])
+                legacy_by_lang[lang][ns] = legacy_keys[lang][ns]
         if lang_total > 0:
             print(f'  {lang}: {lang_total} legacy keys')
     
@@ -287,7 +1358,7 @@ def main():
         print('\n  Top namespaces with legacy keys:')
         for lang in sorted(legacy_keys.keys()):
             ns_entries = sorted(
-                [(ns, len(keys)) for ns, keys in legacy_keys[lang].items() if keys],
+                [(ns, count) for ns, count in legacy_keys[lang].items() if count],
                 key=lambda x: x[1],
                 reverse=True
             )[:5]
@@ -300,24 +1371,24 @@ def main():
         print('  ✅ No legacy keys found!\n')
     
     print('⚠️  POTENTIALLY HARDCODED STRINGS:\n')
-    hardcoded_files = sorted(hardcoded_strings.keys())
+    hardcoded_files = sorted(hardcoded_counts.keys())
     if hardcoded_files:
-        total_hardcoded = sum(len(items) for items in hardcoded_strings.values())
+        total_hardcoded = sum(hardcoded_counts.values())
         print(f'  Found {total_hardcoded} potential hardcoded strings across {len(hardcoded_files)} files\n')
         print('  Top 20 files with most hardcoded strings:')
         sorted_files = sorted(
-            [(file, len(hardcoded_strings[file])) for file in hardcoded_files],
+            [(file, hardcoded_counts[file]) for file in hardcoded_files],
             key=lambda x: x[1],
             reverse=True
         )[:20]
         
         for file, count in sorted_files:
             print(f'    {file}: {count} occurrences')
-            for item in hardcoded_strings[file][:3]:
+            for item in hardcoded_preview[file]:
                 text_preview = item['text'][:60] + ('...' if len(item['text']) > 60 else '')
                 print(f'      Line {item["line"]}: "{text_preview}"')
-            if len(hardcoded_strings[file]) > 3:
-                print(f'      ... and {len(hardcoded_strings[file]) - 3} more')
+            if count > 3:
+                print(f'      ... and {count - 3} more')
             print()
         if len(hardcoded_files) > 20:
             print(f'  ... and {len(hardcoded_files) - 20} more files with hardcoded strings\n')
@@ -328,8 +1399,8 @@ def main():
     print('✅ Inspection complete!')
     print('=' * 80)
     
-    missing_count = sum(len(keys) for lang in missing_keys.values() for keys in lang.values())
-    legacy_count = sum(len(keys) for lang in legacy_keys.values() for keys in lang.values())
+    missing_count = sum(count for lang in missing_keys.values() for count in lang.values())
+    legacy_count = sum(count for lang in legacy_keys.values() for count in lang.values())
     
     print('\n📈 SUMMARY:')
     print(f'  Total translation keys used: {len(used_keys)}')
@@ -337,38 +1408,14 @@ def main():
     print(f'  Legacy keys: {legacy_count}')
     print(f'  Files with hardcoded strings: {len(hardcoded_files)}')
     
-    import json
-    from datetime import datetime
-    
-    report_data = {
-        'summary': {
-            'totalUsedKeys': len(used_keys),
-            'missingKeysCount': missing_count,
-            'legacyKeysCount': legacy_count,
-            'hardcodedFilesCount': len(hardcoded_files)
-        },
-        'missingKeys': {lang: {ns: keys for ns, keys in data.items()} 
-                       for lang, data in missing_keys.items()},
-        'legacyKeys': {lang: {ns: keys for ns, keys in data.items()} 
-                      for lang, data in legacy_keys.items()},
-        'hardcodedStrings': hardcoded_strings,
-        'usedKeys': sorted(list(used_keys)),
-        'timestamp': datetime.now().isoformat()
+    summary = {
+        'totalUsedKeys': len(used_keys),
+        'missingKeysCount': missing_count,
+        'legacyKeysCount': legacy_count,
+        'hardcodedFilesCount': len(hardcoded_files)
     }
-    
-    report_path = Path(__file__).parent / 'translation-inspection-report.json'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, indent=2, ensure_ascii=False)
-    print(f'\n📄 Detailed report saved to: {report_path}')
-    
-    csv_report_path = Path(__file__).parent / 'translation-missing-keys.csv'
-    with open(csv_report_path, 'w', encoding='utf-8', newline='') as f:
-        f.write('Language,Namespace,Key\n')
-        for lang in sorted(missing_keys.keys()):
-            for ns in sorted(missing_keys[lang].keys()):
-                for key in missing_keys[lang][ns]:
-                    f.write(f'{lang},{ns},{key}\n')
-    print(f'📊 Missing keys CSV saved to: {csv_report_path}')
+    for line in writer.close(summary, used_keys):
+        print(line)
 
 if __name__ == '__main__':
     main()
@@ -1,33 +1,22 @@
 import os
-import re
 from pathlib import Path
 
+from import_suggest import SuggestionIndex
+from project_index import ProjectIndex
+from source_scan import ImportAnalyzer, SourceScan
+
 ROOT_DIR = Path(__file__).parent.parent.absolute()
 EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
 EXCLUDE_DIRS = {'.git', 'node_modules', 'dist', 'build'}
 
 def get_project_skeleton():
-    """Maps filename to its absolute path for quick lookup."""
-    skeleton = {}
-    for root, dirs, files in os.walk(ROOT_DIR):
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        for file in files:
-            full_path = Path(root) / file
-            # Store by filename for suggestions, and full path for verification
-            skeleton[full_path.name] = str(full_path.resolve())
-            skeleton[str(full_path.resolve())] = True
-    return skeleton
+    """Loads the shared project index (filenames, paths and listings, see project_index.py)."""
+    return ProjectIndex.load(ROOT_DIR, exclude_dirs=EXCLUDE_DIRS)
 
-def find_best_match(skeleton, import_str):
-    """Tries to find where the file actually is."""
-    target_file = import_str.split('/')[-1]
-    possible_extensions = ['', '.ts', '.tsx', '.js', '.jsx']
-    
-    for ext in possible_extensions:
-        lookup = f"{target_file}{ext}"
-        if lookup in skeleton:
-            return skeleton[lookup]
-    return None
+def find_best_match(suggestions, import_str, from_file=None):
+    """Tries to find where the file actually is (closest name and location first)."""
+    matches = suggestions.suggest(import_str, from_file, limit=1)
+    return matches[0][0] if matches else None
 
 def get_relative_import(from_file, to_file):
     """Calculates the correct ../ path."""
@@ -45,30 +34,26 @@ def get_relative_import(from_file, to_file):
 def analyze_and_suggest():
     print("🔍 Scanning project and building map...")
     skeleton = get_project_skeleton()
-    import_regex = re.compile(r"from\s+['\"](.*?)['\"]|import\s+['\"](.*?)['\"]")
+    suggestions = SuggestionIndex(skeleton, ['', '.ts', '.tsx', '.js', '.jsx'], ['index.ts', 'index.tsx', 'index.js', 'index.jsx'])
+    scan = SourceScan(skeleton, [ImportAnalyzer()]).run()
     
-    for root, _, files in os.walk(ROOT_DIR):
-        for file in files:
-            if any(file.endswith(ext) for ext in EXTENSIONS):
-                file_path = Path(root) / file
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                matches = import_regex.findall(content)
-                for match in matches:
-                    import_str = next(s for s in match if s)
-                    if import_str.startswith('.'):
-                        # Simple resolution check
-                        potential = (file_path.parent / import_str).resolve()
-                        
-                        # If file doesn't exist, suggest a fix
-                        if not any(os.path.exists(f"{potential}{e}") for e in ['', '.ts', '.tsx', '.js']):
-                            actual_loc = find_best_match(skeleton, import_str)
-                            print(f"\n❌ BROKEN: {file_path.relative_to(ROOT_DIR)}")
-                            print(f"   Current: '{import_str}'")
-                            if actual_loc:
-                                suggestion = get_relative_import(file_path, actual_loc)
-                                print(f"   💡 SUGGESTION: '{suggestion}'")
+    for rel_path, imports in scan.results['imports'].items():
+        if not rel_path.endswith(tuple(EXTENSIONS)):
+            continue
+        file_path = Path(skeleton.abspath(rel_path))
+        for import_str, _, _ in imports:
+            if import_str.startswith('.'):
+                # Simple resolution check
+                potential = os.path.normpath(os.path.join(file_path.parent, import_str))
+                
+                # If file doesn't exist, suggest a fix
+                if not any(skeleton.exists(f"{potential}{e}") for e in ['', '.ts', '.tsx', '.js']):
+                    actual_loc = find_best_match(suggestions, import_str, file_path)
+                    print(f"\n❌ BROKEN: {file_path.relative_to(ROOT_DIR)}")
+                    print(f"   Current: '{import_str}'")
+                    if actual_loc:
+                        suggestion = get_relative_import(file_path, actual_loc)
+                        print(f"   💡 SUGGESTION: '{suggestion}'")
 
 if __name__ == "__main__":
     analyze_and_suggest()
\ No newline at end of file
@@ -1,66 +1,75 @@
+import argparse
+import json
 import os
 import re
-import fnmatch
+import shutil
 from pathlib import Path
 
+from gitignore import FILENAME as GITIGNORE, GitIgnore
+from import_suggest import SuggestionIndex
+from project_index import ProjectIndex
+from source_scan import ImportAnalyzer, SourceScan
+
 # --- CONFIGURATION ---
 ROOT_DIR = Path(__file__).parent.parent.absolute()
 EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
 # Common utility filenames to fallback to if a specific export file isn't found
 FALLBACK_UTILS = ['utils', 'lib', 'classnames', 'cn'] 
+# Always skipped, on top of the .gitignore files
+DEFAULT_IGNORES = ['.git', 'node_modules', 'dist', 'build', '.next']
+IMPORT_SUFFIXES = ['', '.ts', '.tsx', '.js', '.jsx', '.css', '.scss']
+INDEX_FILES = ['index.ts', 'index.tsx', 'index.js', 'index.jsx']
+PLAN_VERSION = 1
+# Fuzzy matches up to this many edits are applied without asking when no other candidate ranks as high
+AUTO_FIX_MAX_DISTANCE = 1
 
 def parse_gitignore():
-    gitignore_path = ROOT_DIR / ".gitignore"
-    patterns = {'.git', 'node_modules', 'dist', 'build', '.next'}
-    if gitignore_path.exists():
-        with open(gitignore_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    patterns.add(line.rstrip('/'))
-    return patterns
-
-def is_ignored(path, patterns):
-    parts = Path(path).parts
-    for part in parts:
-        for pattern in patterns:
-            if fnmatch.fnmatch(part, pattern):
-                return True
-    return False
-
-def get_project_skeleton(ignore_patterns):
+    """Compiled rules of the root and nested .gitignore files (see gitignore.py)."""
+    return GitIgnore(ROOT_DIR, DEFAULT_IGNORES)
+
+def get_project_skeleton(ignore_rules):
+    """Loads the shared project index (see project_index.py); ignored directories are pruned."""
     print("⏳ Mapping project structure...")
-    skeleton = {}
-    for root, dirs, files in os.walk(ROOT_DIR):
-        dirs[:] = [d for d in dirs if not is_ignored(os.path.join(root, d), ignore_patterns)]
-        for file in files:
-            if is_ignored(file, ignore_patterns): continue
-            
-            full_path = Path(root) / file
-            # Store filename -> absolute path
-            # If duplicates exist, keep the shortest path (usually closer to root)
-            if file not in skeleton or len(str(full_path)) < len(str(skeleton[file])):
-                skeleton[file] = str(full_path.resolve())
-            
-            skeleton[str(full_path.resolve())] = True
+    skeleton = ProjectIndex.load(
+        ROOT_DIR,
+        exclude_dirs=(),
+        ignore=ignore_rules,
+        ignore_key=ignore_rules.key,
+        ignore_files=(GITIGNORE,),
+    )
+    print(f"   {len(skeleton.files)} files in {len(skeleton.listings)} directories "
+          f"({skeleton.scanned_dirs} listed, {skeleton.reused_dirs} unchanged since last run)")
     return skeleton
 
-def find_best_match(skeleton, import_str):
-    """Finds the absolute path based on the import name."""
+def shortest_path(skeleton, filename):
+    # If duplicates exist, keep the shortest path (usually closer to root)
+    paths = skeleton.find(filename)
+    return min(paths, key=len) if paths else None
+
+def get_suggestion_index(skeleton):
+    """Case-insensitive, typo-tolerant index of import targets (see import_suggest.py)."""
+    return SuggestionIndex(skeleton, IMPORT_SUFFIXES, INDEX_FILES)
+
+def find_best_match(suggestions, import_str, from_file=None):
+    """Finds the file the import most likely meant.
+    
+    Returns (absolute path, edit distance, unambiguous) or None; candidates are ranked
+    by spelling, casing and closeness to the importing file.
+    """
     target_name = import_str.split('/')[-1]
     
-    # 1. Try exact matches with extensions
-    for ext in ['', '.ts', '.tsx', '.js', '.jsx', '.css', '.scss']:
-        lookup = f"{target_name}{ext}"
-        if lookup in skeleton:
-            return skeleton[lookup]
+    # 1. Exact, differently cased or misspelled names
+    match = suggestions.best(import_str, from_file)
+    if match:
+        return match
             
     # 2. Heuristic: If looking for 'cn', it might be in 'utils.ts'
     if target_name == 'cn':
         for util in FALLBACK_UTILS:
             for ext in ['.ts', '.js', '.tsx']:
-                if f"{util}{ext}" in skeleton:
-                    return skeleton[f"{util}{ext}"]
+                path = shortest_path(suggestions.index, f"{util}{ext}")
+                if path:
+                    return path, 0, True
     return None
 
 def get_relative_import(from_file, to_file):
@@ -68,124 +77,239 @@ def get_relative_import(from_file, to_file):
     to_path = Path(to_file)
     
     rel = os.path.relpath(to_path.parent, from_path)
-    rel_path = os.path.join(rel, to_path.stem)
+    # Stylesheets, images, ... are imported with their extension
+    rel_path = os.path.join(rel, to_path.stem if to_path.suffix in EXTENSIONS else to_path.name)
     
     if not rel_path.startswith('.'):
         rel_path = f"./{rel_path}"
     return rel_path.replace('\\', '/')
 
-def verify_import_exists(base_file, relative_import):
-    """Checks if the proposed relative import actually resolves to a file on disk."""
+def verify_import_exists(skeleton, base_file, relative_import):
+    """Checks if the relative import resolves to a file, using the in-memory path set of the index."""
     try:
         # Resolve the absolute path from the relative string
-        resolved_path = (Path(base_file).parent / relative_import).resolve()
+        resolved_path = os.path.normpath(os.path.join(Path(base_file).parent, relative_import))
+        rel_path = skeleton.relpath(resolved_path)
+        if rel_path is None:
+            # Outside the project: only here the filesystem is asked
+            return any(os.path.isfile(f"{resolved_path}{ext}") for ext in IMPORT_SUFFIXES)
         
         # Check direct file or extensions
-        for ext in ['', '.ts', '.tsx', '.js', '.jsx', '.css', '.scss']:
-            if os.path.isfile(f"{resolved_path}{ext}"):
-                return True
+        files = skeleton.files
+        if any(f"{rel_path}{ext}" in files for ext in IMPORT_SUFFIXES):
+            return True
         
         # Check index files
-        if os.path.isdir(resolved_path):
-             for ext in ['.ts', '.tsx', '.js', '.jsx']:
-                if os.path.isfile(resolved_path / f"index{ext}"):
-                    return True
+        if skeleton.is_dir(resolved_path):
+            prefix = f"{rel_path}/" if rel_path else ""
+            return any(f"{prefix}{name}" in files for name in INDEX_FILES)
         return False
     except Exception:
         return False
 
-def apply_fix(file_path, old_import, new_import):
+class SourceImports(ImportAnalyzer):
+    """The ImportAnalyzer limited to the files fix.py repairs."""
+
+    extensions = tuple(sorted(EXTENSIONS))
+
+def find_broken_imports(skeleton, suggestions, file_path, imports):
+    """Broken relative imports of one file with their suggested fix.
+    
+    ``imports`` are the file's [specifier, kind, line] entries from the source scan.
+    Returns [{"old", "new", "distance", "verified"}, ...]; "new" is None when nothing
+    in the project matches, "distance" counts the edits between the imported and the
+    found name. Each distinct import is reported once per file.
+    """
+    findings = []
+    seen = set()
+    for import_str, _, _ in imports:
+        if not import_str.startswith('.') or import_str in seen:
+            continue
+        seen.add(import_str)
+        if verify_import_exists(skeleton, file_path, import_str):
+            continue
+        
+        match = find_best_match(suggestions, import_str, file_path)
+        if match is None:
+            findings.append({'old': import_str, 'new': None, 'distance': None, 'verified': False})
+            continue
+        actual_loc, distance, unambiguous = match
+        suggestion = get_relative_import(file_path, actual_loc)
+        findings.append({
+            'old': import_str,
+            'new': suggestion,
+            'distance': distance,
+            # Does the suggested path actually exist, and is it a confident match?
+            'verified': (verify_import_exists(skeleton, file_path, suggestion)
+                         and (distance == 0 or (unambiguous and distance <= AUTO_FIX_MAX_DISTANCE))),
+        })
+    return findings
+
+def scan_project(skeleton, jobs, scan=None):
+    """(file_path, findings) for every source file, in walk order.
+    
+    Files are read and parsed by the shared source scanner (see source_scan.py) with
+    ``jobs`` processes, unless the results of a ``scan`` that ran a SourceImports
+    analyzer are passed in; resolution then runs in memory against the index.
+    """
+    if scan is None:
+        scan = SourceScan(skeleton, [SourceImports()], jobs=jobs).run()
+    suggestions = get_suggestion_index(skeleton)
+    wanted = SourceImports()
+    for rel_path, imports in scan.results['imports'].items():
+        if wanted.wants(rel_path):
+            file_path = Path(skeleton.abspath(rel_path))
+            yield file_path, find_broken_imports(skeleton, suggestions, file_path, imports)
+
+def write_atomic(file_path, content):
+    """Replaces the file in one step, so an interrupted run never leaves it half written."""
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def apply_fixes(file_path, fixes):
+    """Rewrites every import in ``fixes`` (old -> new) with a single read and atomic write.
+    
+    Returns the set of old imports that were replaced.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
             content = f.read()
         
-        escaped_old = re.escape(old_import)
-        # Match inside quotes to avoid partial replacements
-        pattern = re.compile(f"(['\"]){escaped_old}(['\"])")
+        # Match inside quotes to avoid partial replacements; longest first
+        alternatives = '|'.join(re.escape(old) for old in sorted(fixes, key=len, reverse=True))
+        pattern = re.compile(f"(['\"])({alternatives})(['\"])")
         
-        if not pattern.search(content):
-            print(f"   ⚠️ Could not safely locate string. Skipping.")
-            return False
-            
-        new_content = pattern.sub(f"\\1{new_import}\\2", content)
+        applied = set()
+        def replace(match):
+            applied.add(match.group(2))
+            return f"{match.group(1)}{fixes[match.group(2)]}{match.group(3)}"
+        new_content = pattern.sub(replace, content)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        return True
+        if applied:
+            write_atomic(file_path, new_content)
+        return applied
     except Exception as e:
         print(f"   ❌ Error writing file: {e}")
-        return False
+        return set()
+
+def report_applied(fixes, applied):
+    """Prints the outcome of apply_fixes; returns (fixed, skipped) counts."""
+    for old in fixes:
+        if old in applied:
+            print(f"   🚀 [FIXED] '{old}' ➔ '{fixes[old]}'")
+        else:
+            print(f"   ⚠️ Could not safely locate '{old}'. Skipping.")
+    return len(applied), len(fixes) - len(applied)
+
+def write_plan(plan_path, plan):
+    with open(plan_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': PLAN_VERSION, 'files': plan}, f, indent=2)
 
-def main():
-    ignore_patterns = parse_gitignore()
-    skeleton = get_project_skeleton(ignore_patterns)
-    import_regex = re.compile(r"(from|import|require)\s+['\"](\..*?)['\"]")
+def apply_plan(plan_path):
+    """Applies the entries marked "apply" in a plan written by --plan; no prompts."""
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    if plan.get('version') != PLAN_VERSION:
+        raise SystemExit(f"❌ Unsupported plan version: {plan.get('version')}")
     
     files_fixed = 0
     errors_skipped = 0
+    for rel_path, items in plan['files'].items():
+        fixes = {item['old']: item['new'] for item in items if item.get('apply') and item.get('new')}
+        errors_skipped += len(items) - len(fixes)
+        if not fixes:
+            continue
+        print(f"📂 FILE:   {rel_path}")
+        fixed, skipped = report_applied(fixes, apply_fixes(ROOT_DIR / rel_path, fixes))
+        files_fixed += fixed
+        errors_skipped += skipped
+    return files_fixed, errors_skipped
 
-    print("\n🔍 Scanning files for semantic errors...\n")
-
-    for root, dirs, files in os.walk(ROOT_DIR):
-        dirs[:] = [d for d in dirs if not is_ignored(os.path.join(root, d), ignore_patterns)]
-        
-        for file in files:
-            if any(file.endswith(ext) for ext in EXTENSIONS):
-                file_path = Path(root) / file
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                except:
-                    continue
-
-                matches = import_regex.finditer(content)
-                
-                for match in matches:
-                    import_str = match.group(2)
-                    
-                    # 1. Check if current import is valid
-                    if verify_import_exists(file_path, import_str):
-                        continue # It's valid, skip it.
-
-                    # It's broken. Let's fix it.
-                    print(f"---------------------------------------------------")
-                    print(f"📂 FILE:   {file_path.relative_to(ROOT_DIR)}")
-                    print(f"❌ BROKEN: '{import_str}'")
-                    
-                    actual_loc = find_best_match(skeleton, import_str)
-                    
-                    if actual_loc:
-                        suggestion = get_relative_import(file_path, actual_loc)
-                        
-                        # VERIFY: Does the suggested path actually exist on disk?
-                        if verify_import_exists(file_path, suggestion):
-                            # SUCCESS: It exists. Auto-fix.
-                            print(f"✅ VERIFIED: '{suggestion}' points to valid file.")
-                            if apply_fix(file_path, import_str, suggestion):
-                                print(f"   🚀 [AUTO-FIXED]")
-                                files_fixed += 1
-                            else:
-                                errors_skipped += 1
-                        else:
-                            # AMBIGUOUS: Suggestion logic worked, but verification failed.
-                            # This usually happens with complex index exports or verifyGLN vs verifyGln cases.
-                            print(f"⚠️ SUGGESTION: '{suggestion}' (Verification Failed)")
-                            user_input = input("   👉 Path seems unsure. Apply anyway? [y/n] ").lower()
-                            if user_input == 'y':
-                                if apply_fix(file_path, import_str, suggestion):
-                                    print("   ✨ Fixed.")
-                                    files_fixed += 1
-                            else:
-                                print("   Skipped.")
-                                errors_skipped += 1
-                    else:
-                        print(f"🤷 NO MATCH FOUND in skeleton.")
-                        errors_skipped += 1
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find and repair broken relative imports")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--plan', metavar='OUT_JSON',
+                      help="Only scan and write the fixes to OUT_JSON (verified ones marked \"apply\"); no prompts, no edits")
+    mode.add_argument('--apply', metavar='PLAN_JSON', help="Apply the fixes marked \"apply\" in a plan; no prompts")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for reading and parsing files (default: %(default)s)")
+    return parser.parse_args(argv)
 
+def print_summary(files_fixed, errors_skipped):
     print(f"\n--- SESSION COMPLETE ---")
     print(f"Fixed: {files_fixed}")
     print(f"Skipped/Unresolved: {errors_skipped}")
 
+def main(argv=None):
+    args = parse_args(argv)
+    if args.apply:
+        print_summary(*apply_plan(args.apply))
+        return
+    
+    skeleton = get_project_skeleton(parse_gitignore())
+    
+    files_fixed = 0
+    errors_skipped = 0
+    plan = {}
+
+    print("\n🔍 Scanning files for semantic errors...\n")
+
+    # Files are parsed in parallel up front; prompts and edits happen here, file by
+    # file, with all accepted fixes of a file written at once.
+    for file_path, findings in scan_project(skeleton, args.jobs):
+        fixes = {}
+        for item in findings:
+            import_str, suggestion = item['old'], item['new']
+            print(f"---------------------------------------------------")
+            print(f"📂 FILE:   {file_path.relative_to(ROOT_DIR)}")
+            print(f"❌ BROKEN: '{import_str}'")
+            
+            if suggestion is None:
+                print(f"🤷 NO MATCH FOUND in skeleton.")
+                errors_skipped += 1
+            elif item['verified']:
+                # SUCCESS: It exists. Auto-fix.
+                fuzzy = f" (closest name, {item['distance']} edit(s) away)" if item['distance'] else ""
+                print(f"✅ VERIFIED: '{suggestion}' points to valid file{fuzzy}.")
+                fixes[import_str] = suggestion
+            else:
+                # AMBIGUOUS: Suggestion logic worked, but verification failed or the
+                # name only loosely matches (see AUTO_FIX_MAX_DISTANCE).
+                print(f"⚠️ SUGGESTION: '{suggestion}' (Verification Failed, {item['distance']} edit(s) away)")
+                if args.plan:
+                    print("   📝 Left for review in the plan.")
+                elif input("   👉 Path seems unsure. Apply anyway? [y/n] ").lower() == 'y':
+                    fixes[import_str] = suggestion
+                else:
+                    print("   Skipped.")
+                    errors_skipped += 1
+            item['apply'] = import_str in fixes
+        
+        if args.plan:
+            if findings:
+                plan[file_path.relative_to(ROOT_DIR).as_posix()] = findings
+        elif fixes:
+            fixed, skipped = report_applied(fixes, apply_fixes(file_path, fixes))
+            files_fixed += fixed
+            errors_skipped += skipped
+
+    if args.plan:
+        write_plan(args.plan, plan)
+        items = [item for findings in plan.values() for item in findings]
+        to_apply = sum(item['apply'] for item in items)
+        unresolved = sum(item['new'] is None for item in items)
+        print(f"\n📝 Plan written to {args.plan}: {to_apply} fixes marked to apply, "
+              f"{len(items) - to_apply - unresolved} to review, {unresolved} without a match")
+        print(f"   Apply with: python3 scripts/fix.py --apply {args.plan}")
+        return
+    print_summary(files_fixed, errors_skipped)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
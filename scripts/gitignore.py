@@ -0,0 +1,193 @@
+"""
+.gitignore matching for the project maintenance scripts.
+
+Implements the gitignore pattern rules that matter in practice: negation (!),
+directory-only patterns (trailing /), anchoring (a / anywhere but at the end ties
+the pattern to the directory of its .gitignore), *, ?, [...] and ** in leading,
+trailing and middle position. Nested .gitignore files are honoured, deeper files
+taking precedence.
+
+Every .gitignore is compiled once into a single regex per entry kind (files and
+directories); within one file the last matching pattern wins. Meant to be used as
+the ``ignore`` filter of a directory walk (see project_index.py), so ignored
+directories are pruned before anything below them is listed.
+"""
+
+import hashlib
+import os
+import re
+
+FILENAME = '.gitignore'
+
+
+def _translate_segment(segment):
+    """Regex for one path segment of a glob (no slashes)."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        if c == '*':
+            while i + 1 < n and segment[i + 1] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(segment[i]))
+        elif c == '[':
+            start = i + 1
+            negated = segment[start:start + 1] in ('!', '^')
+            if negated:
+                start += 1
+            # A ] right after the opening bracket is a literal member of the class.
+            end = segment.find(']', start + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = segment[start:end].replace('\\', '\\\\').replace('[', '\\[').replace(']', '\\]')
+                if body.startswith('^'):
+                    body = '\\' + body
+                out.append(f"[{'^' if negated else ''}{body}]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def translate(pattern):
+    """Regex (for re.fullmatch against a /-separated relative path) of one glob pattern.
+
+    ``pattern`` has its negation and trailing slash already removed.
+    """
+    anchored = '/' in pattern
+    parts = pattern.lstrip('/').split('/')
+    regex = []
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        if part == '**':
+            # a/** matches everything inside a; **/ and /**/ match zero or more directories
+            regex.append('.*' if last else '(?:[^/]*/)*')
+            continue
+        regex.append(_translate_segment(part))
+        if not last:
+            regex.append('/')
+    if not anchored:
+        regex.insert(0, '(?:.*/)?')
+    return ''.join(regex)
+
+
+def parse_lines(lines):
+    """(regex, negated, dir_only) for every pattern line, in file order."""
+    patterns = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line or line.startswith('#'):
+            continue
+        # Trailing spaces are ignored unless escaped with a backslash.
+        while line.endswith(' ') and not line.endswith('\\ '):
+            line = line[:-1]
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        patterns.append((translate(line), negated, dir_only))
+    return patterns
+
+
+class RuleSet:
+    """The compiled patterns of one .gitignore, relative to its directory."""
+
+    def __init__(self, patterns):
+        self.has_negations = any(negated for _, negated, _ in patterns)
+        self.file_re, self.file_negated = self._compile([p for p in patterns if not p[2]])
+        self.dir_re, self.dir_negated = self._compile(patterns)
+
+    @staticmethod
+    def _compile(patterns):
+        if not patterns:
+            return None, ()
+        # Alternatives in reverse order: with fullmatch the first alternative that
+        # matches is the last matching pattern of the file, which is the one that wins.
+        patterns = patterns[::-1]
+        regex = re.compile('|'.join(f'({regex})' for regex, _, _ in patterns), re.DOTALL)
+        return regex, (None,) + tuple(negated for _, negated, _ in patterns)
+
+    def decide(self, rel_path, is_dir):
+        """True (ignored), False (re-included by a negation) or None (no pattern matches)."""
+        regex, negated = (self.dir_re, self.dir_negated) if is_dir else (self.file_re, self.file_negated)
+        if regex is None:
+            return None
+        match = regex.fullmatch(rel_path)
+        if match is None:
+            return None
+        if not self.has_negations:
+            return True
+        return not negated[match.lastindex]
+
+
+class GitIgnore:
+    """Ignore rules of a whole tree: ``extra_patterns`` (treated as lines of the root
+    .gitignore, before it) plus every .gitignore found below ``root``.
+
+    Paths are /-separated and relative to ``root``. Nested .gitignore files are read
+    lazily, the first time a path below their directory is checked.
+    """
+
+    def __init__(self, root, extra_patterns=()):
+        self.root = os.path.abspath(root)
+        self.extra_patterns = list(extra_patterns)
+        self.rules = {}
+
+    @property
+    def key(self):
+        """Changes whenever the extra patterns or the root .gitignore change."""
+        digest = hashlib.sha1('\n'.join(self.extra_patterns).encode('utf-8'))
+        try:
+            with open(os.path.join(self.root, FILENAME), 'rb') as f:
+                digest.update(b'\0' + f.read())
+        except OSError:
+            pass
+        return digest.hexdigest()
+
+    def _rules(self, rel_dir):
+        if rel_dir not in self.rules:
+            lines = self.extra_patterns if rel_dir == '' else []
+            try:
+                with open(os.path.join(self.root, rel_dir, FILENAME), 'r', encoding='utf-8', errors='replace') as f:
+                    lines = lines + f.read().splitlines()
+            except OSError:
+                pass
+            patterns = parse_lines(lines)
+            self.rules[rel_dir] = RuleSet(patterns) if patterns else None
+        return self.rules[rel_dir]
+
+    def match(self, rel_path, is_dir=False):
+        """Whether the entry itself is ignored, assuming its parent directories are not.
+
+        This is the check to apply while walking with pruning.
+        """
+        parts = rel_path.split('/')
+        # Deepest .gitignore first; the first one with a matching pattern decides.
+        for depth in range(len(parts) - 1, -1, -1):
+            rules = self._rules('/'.join(parts[:depth]))
+            if rules is None:
+                continue
+            decision = rules.decide('/'.join(parts[depth:]), is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    __call__ = match
+
+    def is_ignored(self, rel_path, is_dir=False):
+        """Whether ``rel_path`` is ignored, itself or through an ignored parent directory."""
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if self.match('/'.join(parts[:depth]), True):
+                return True
+        return self.match(rel_path, is_dir)
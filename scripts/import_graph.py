@@ -0,0 +1,450 @@
+"""
+Module dependency graph of the JS/TS sources in src/ and functions/.
+
+Every import, export-from, require() and import() is resolved the way the bundler
+and Node do it: relative paths, the tsconfig.json "paths" aliases (e.g. @/*),
+implicit extensions and index files. Imports whose casing does not match the files
+on disk are resolved case-insensitively and reported, since they break on
+case-sensitive filesystems (CI, Cloud Functions).
+
+The report lists:
+  - import cycles (static imports and require(); dynamic import() is a split point),
+  - modules not reachable from the entry points,
+  - the modules with the heaviest transitive static imports, and the heaviest
+    import chain from every entry point: what ends up in the initial bundle of
+    the app and what a Firebase function cold start has to load.
+
+Files are parsed by the shared source scanner (see source_scan.py: process pool,
+per-file cache); resolution runs against the shared project index.
+
+Usage:
+    python3 scripts/import_graph.py
+    python3 scripts/import_graph.py --top 20 --json import-graph.json
+    python3 scripts/import_graph.py --entry src/index.js --entry functions/index.js
+"""
+
+import argparse
+import json
+import os
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+
+from fix import DEFAULT_IGNORES
+from gitignore import FILENAME as GITIGNORE, GitIgnore
+from project_index import ProjectIndex
+from source_scan import DYNAMIC, REQUIRE, STATIC, ImportAnalyzer, SourceScan
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+SOURCE_ROOTS = ('src', 'functions')
+MODULE_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.json')
+INDEX_FILES = tuple(f'index{ext}' for ext in MODULE_EXTENSIONS)
+
+
+def read_aliases(root):
+    """[(prefix, [target prefixes])] from the tsconfig.json "paths" (single * patterns)."""
+    try:
+        with open(os.path.join(root, 'tsconfig.json'), 'r', encoding='utf-8') as f:
+            options = json.load(f).get('compilerOptions', {})
+    except (OSError, ValueError):
+        return []
+    base_url = options.get('baseUrl', '.')
+    aliases = []
+    for pattern, targets in options.get('paths', {}).items():
+        prefix = pattern.split('*', 1)[0]
+        aliases.append((prefix, [os.path.normpath(os.path.join(base_url, target.split('*', 1)[0])).replace(os.sep, '/')
+                                 + ('/' if target.split('*', 1)[0].endswith('/') else '')
+                                 for target in targets]))
+    # Longest prefix first, like TypeScript
+    return sorted(aliases, key=lambda alias: len(alias[0]), reverse=True)
+
+
+class Resolver:
+    """Resolves import specifiers to files of the project index."""
+
+    def __init__(self, index, aliases=()):
+        self.index = index
+        self.aliases = list(aliases)
+
+    def resolve(self, importer, spec):
+        """(target, case_mismatch, external); target is None for unresolved imports."""
+        if spec.startswith('.'):
+            bases = [os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, '/')]
+        else:
+            bases = []
+            for prefix, targets in self.aliases:
+                if spec.startswith(prefix):
+                    bases = [target + spec[len(prefix):] for target in targets]
+                    break
+            if not bases:
+                return None, False, True
+        for base in bases:
+            if base == '..' or base.startswith('../'):
+                continue
+            target = self._resolve_exact(base)
+            if target is not None:
+                return target, False, False
+        for base in bases:
+            if base == '..' or base.startswith('../'):
+                continue
+            target = self._resolve_casefold(base)
+            if target is not None:
+                return target, True, False
+        return None, False, False
+
+    def _resolve_exact(self, base):
+        files = self.index.files
+        for suffix in RESOLVE_SUFFIXES:
+            if f'{base}{suffix}' in files:
+                return f'{base}{suffix}'
+        if base in self.index.listings:
+            for name in INDEX_FILES:
+                if f'{base}/{name}' in files:
+                    return f'{base}/{name}'
+        return None
+
+    def _resolve_casefold(self, base):
+        parts = base.split('/')
+        current = ''
+        for part in parts[:-1]:
+            name = self.index.actual_case(current, part)
+            if name is None:
+                return None
+            current = f'{current}/{name}' if current else name
+        for suffix in RESOLVE_SUFFIXES:
+            name = self.index.actual_case(current, parts[-1] + suffix)
+            if name is not None:
+                target = self._resolve_exact(f'{current}/{name}' if current else name)
+                if target is not None:
+                    return target
+        return None
+
+
+class ModuleImports(ImportAnalyzer):
+    """The ImportAnalyzer limited to the modules of the graph."""
+
+    extensions = MODULE_EXTENSIONS
+    roots = SOURCE_ROOTS
+
+
+def build_graph(index, scan):
+    """ImportGraph of a SourceScan that ran an ImportAnalyzer; other files are ignored."""
+    analyzer = ModuleImports()
+    imports = {module: specs for module, specs in scan.results['imports'].items() if analyzer.wants(module)}
+    return ImportGraph.build(index, imports, scan.sizes, Resolver(index, read_aliases(index.root)))
+
+
+def package_name(spec):
+    parts = spec.split('/')
+    return '/'.join(parts[:2]) if spec.startswith('@') and len(parts) > 1 else parts[0]
+
+
+class ImportGraph:
+    """Resolved module graph: ``edges[module] = [(target, kind), ...]``."""
+
+    def __init__(self):
+        self.sizes = {}
+        self.edges = defaultdict(list)
+        self.externals = Counter()
+        self.unresolved = []
+        self.case_mismatches = []
+
+    @classmethod
+    def build(cls, index, imports, sizes, resolver):
+        """``imports``: {module: [[specifier, kind, line], ...]} as found by the ImportAnalyzer."""
+        graph = cls()
+        for module in sorted(imports):
+            graph.sizes[module] = sizes[module]
+            seen = set()
+            for spec, kind, _ in imports[module]:
+                if (spec, kind) in seen:
+                    continue
+                seen.add((spec, kind))
+                target, case_mismatch, external = resolver.resolve(module, spec)
+                if external:
+                    graph.externals[package_name(spec)] += 1
+                elif target is None:
+                    graph.unresolved.append((module, spec))
+                else:
+                    if case_mismatch:
+                        graph.case_mismatches.append((module, spec, target))
+                    graph.edges[module].append((target, kind))
+                    if target not in imports and target not in graph.sizes:
+                        # Non-module targets (JSON, ...) are leaves with their own weight
+                        try:
+                            graph.sizes[target] = os.path.getsize(index.abspath(target))
+                        except OSError:
+                            graph.sizes[target] = 0
+        return graph
+
+    def successors(self, module, kinds=(STATIC, REQUIRE)):
+        return [target for target, kind in self.edges.get(module, ()) if kind in kinds]
+
+    def reachable(self, entries, kinds=(STATIC, REQUIRE, DYNAMIC)):
+        seen = set(entry for entry in entries if entry in self.sizes)
+        queue = deque(seen)
+        while queue:
+            for target in self.successors(queue.popleft(), kinds):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def components(self, kinds=(STATIC, REQUIRE)):
+        """Strongly connected components (iterative Tarjan), in reverse topological order."""
+        index_of = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        result = []
+        counter = 0
+        for root in self.sizes:
+            if root in index_of:
+                continue
+            work = [(root, iter(self.successors(root, kinds)))]
+            index_of[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index_of:
+                        index_of[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.successors(child, kinds))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index_of[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result.append(component)
+        return result
+
+    def cycles(self):
+        """One shortest cycle per cyclic component, as [a, b, ..., a]."""
+        cycles = []
+        for component in self.components():
+            members = set(component)
+            if len(component) == 1 and component[0] not in self.successors(component[0]):
+                continue
+            start = min(component)
+            parents = {start: None}
+            queue = deque([start])
+            closing = None
+            while queue and closing is None:
+                node = queue.popleft()
+                for target in self.successors(node):
+                    if target == start:
+                        closing = node
+                        break
+                    if target in members and target not in parents:
+                        parents[target] = node
+                        queue.append(target)
+            path = [start]
+            while closing is not None:
+                path.append(closing)
+                closing = parents[closing]
+            # path is start, last, ..., start; reversed it reads in import order
+            cycles.append(path[::-1] if len(path) > 2 else [start, start])
+        return sorted(cycles, key=len)
+
+    def weights(self):
+        """Per module: (modules, bytes) of its transitive static imports, itself included."""
+        components = self.components()
+        component_of = {member: i for i, component in enumerate(components) for member in component}
+        order = {module: i for i, module in enumerate(self.sizes)}
+        sizes = [0] * len(order)
+        for module, i in order.items():
+            sizes[i] = self.sizes[module]
+        closures = []
+        # Reverse topological order: every successor component is already done.
+        for i, component in enumerate(components):
+            bits = 0
+            for member in component:
+                bits |= 1 << order[member]
+                for target in self.successors(member):
+                    if component_of[target] != i:
+                        bits |= closures[component_of[target]]
+            closures.append(bits)
+        weights = {}
+        for i, component in enumerate(components):
+            bits = closures[i]
+            count = total = 0
+            while bits:
+                low = bits & -bits
+                total += sizes[low.bit_length() - 1]
+                count += 1
+                bits ^= low
+            for member in component:
+                weights[member] = (count, total)
+        return weights
+
+    def heaviest_chain(self, entry):
+        """Static import chain from ``entry`` with the largest summed file size.
+
+        The chain runs over components, not modules: a cycle is loaded as a whole, so
+        every step is the list of its component's members, the one the chain entered
+        through first. A step of one module is an ordinary import.
+        """
+        components = self.components()
+        component_of = {member: i for i, component in enumerate(components) for member in component}
+        best = []
+        for i, component in enumerate(components):
+            weight = sum(self.sizes[member] for member in component)
+            step = max(((best[component_of[target]][0], target)
+                        for member in component for target in self.successors(member)
+                        if component_of[target] != i), default=(0, None))
+            best.append((weight + step[0], step[1]))
+        if entry not in component_of:
+            return []
+        chain = []
+        next_module = entry
+        while next_module is not None:
+            component = components[component_of[next_module]]
+            chain.append([next_module] + sorted(member for member in component if member != next_module))
+            next_module = best[component_of[next_module]][1]
+        return chain
+
+
+def default_entries(root):
+    entries = []
+    for candidate in ('src/index.js', 'src/index.tsx', 'src/index.ts'):
+        if os.path.isfile(os.path.join(root, candidate)):
+            entries.append(candidate)
+            break
+    try:
+        with open(os.path.join(root, 'functions', 'package.json'), 'r', encoding='utf-8') as f:
+            main = json.load(f).get('main', 'index.js')
+    except (OSError, ValueError):
+        main = 'index.js'
+    if os.path.isfile(os.path.join(root, 'functions', main)):
+        entries.append(os.path.normpath(os.path.join('functions', main)).replace(os.sep, '/'))
+    return entries
+
+
+def kb(size):
+    return f'{size / 1024:.1f} KB'
+
+
+def print_report(graph, entries, top):
+    edge_count = sum(len(targets) for targets in graph.edges.values())
+    dynamic_count = sum(kind == DYNAMIC for targets in graph.edges.values() for _, kind in targets)
+    print(f"📦 {len(graph.sizes)} modules, {edge_count} internal imports ({dynamic_count} dynamic), "
+          f"{len(graph.externals)} external packages")
+
+    if graph.unresolved:
+        print(f"\n❌ UNRESOLVED IMPORTS ({len(graph.unresolved)}):")
+        for module, spec in graph.unresolved[:top]:
+            print(f"   {module}: '{spec}'")
+        if len(graph.unresolved) > top:
+            print(f"   ... and {len(graph.unresolved) - top} more")
+
+    if graph.case_mismatches:
+        print(f"\n🔠 CASE MISMATCHES ({len(graph.case_mismatches)}), break on case-sensitive filesystems:")
+        for module, spec, target in graph.case_mismatches[:top]:
+            print(f"   {module}: '{spec}' ➔ {target}")
+
+    cycles = graph.cycles()
+    print(f"\n🔁 IMPORT CYCLES ({len(cycles)}):")
+    for cycle in cycles[:top]:
+        print(f"   {' ➔ '.join(cycle)}")
+    if len(cycles) > top:
+        print(f"   ... and {len(cycles) - top} more")
+
+    reachable = graph.reachable(entries)
+    unreachable = sorted(module for module in graph.sizes if module not in reachable)
+    print(f"\n🗑️  UNREACHABLE FROM {', '.join(entries) or '(no entry points)'} ({len(unreachable)}):")
+    for module in unreachable[:top]:
+        print(f"   {module}")
+    if len(unreachable) > top:
+        print(f"   ... and {len(unreachable) - top} more")
+
+    weights = graph.weights()
+    print(f"\n🏋️  HEAVIEST MODULES (transitive static imports, itself included):")
+    for module, (count, total) in sorted(weights.items(), key=lambda item: item[1][1], reverse=True)[:top]:
+        print(f"   {kb(total):>10}  {count:5} modules  {module}")
+
+    for entry in entries:
+        count, total = weights.get(entry, (0, 0))
+        chain = graph.heaviest_chain(entry)
+        print(f"\n⛓️  HEAVIEST CHAIN FROM {entry} (loads {count} modules, {kb(total)} before any dynamic import):")
+        cumulative = 0
+        for step in chain:
+            size = sum(graph.sizes[module] for module in step)
+            cumulative += size
+            if len(step) == 1:
+                print(f"   {kb(cumulative):>10}  {step[0]}")
+            else:
+                print(f"   {kb(cumulative):>10}  {step[0]} (cycle of {len(step)} modules, {kb(size)}):")
+                for module in step[1:]:
+                    print(f"   {'':>10}    ↻ {module}")
+    return cycles, unreachable, weights
+
+
+def write_json(path, graph, entries, cycles, unreachable, weights):
+    data = {
+        'entries': entries,
+        'modules': {module: {'size': graph.sizes[module],
+                             'transitiveModules': weights[module][0],
+                             'transitiveBytes': weights[module][1],
+                             'imports': [{'target': target, 'kind': kind} for target, kind in graph.edges.get(module, ())]}
+                    for module in graph.sizes},
+        'cycles': cycles,
+        'unreachable': unreachable,
+        'heaviestChains': {entry: graph.heaviest_chain(entry) for entry in entries},
+        'unresolved': [{'module': module, 'specifier': spec} for module, spec in graph.unresolved],
+        'caseMismatches': [{'module': module, 'specifier': spec, 'target': target}
+                           for module, spec, target in graph.case_mismatches],
+        'externalPackages': dict(graph.externals.most_common()),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="JS/TS import graph of src/ and functions/: cycles, dead modules, heavy chains")
+    parser.add_argument('--entry', action='append', metavar='PATH',
+                        help="Entry point relative to the repo root; repeatable (default: src/index.js and the functions main)")
+    parser.add_argument('--top', type=int, default=15, help="Rows per section (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="Also write the full graph and findings as JSON")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for parsing (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="Parse every file and do not touch the caches")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    ignore_rules = GitIgnore(ROOT_DIR, DEFAULT_IGNORES)
+    index = ProjectIndex.load(ROOT_DIR, exclude_dirs=(), ignore=ignore_rules, ignore_key=ignore_rules.key,
+                              ignore_files=(GITIGNORE,), cache_path=not args.no_cache)
+    scan = SourceScan(index, [ModuleImports()], cache_path=not args.no_cache, jobs=args.jobs).run()
+    print(f"🔍 {len(scan.results['imports'])} source files ({scan.read_files} parsed, {scan.cached_files} cached)\n")
+
+    graph = build_graph(index, scan)
+    entries = args.entry or default_entries(ROOT_DIR)
+    cycles, unreachable, weights = print_report(graph, entries, args.top)
+    if args.json:
+        write_json(args.json, graph, entries, cycles, unreachable, weights)
+        print(f"\n📄 Full graph written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Ranked suggestions for the file a broken import meant (used by scripts/fix.py and
+scripts/debug-tools.py).
+
+Built once from the shared project index (see project_index.py):
+  - a case-folded name -> candidates map: every source file under its name without
+    extension, other files under their full name, and every directory with an index
+    file under the directory name,
+  - a trigram index over those folded names, for misspelled and slightly renamed
+    targets (ticketDetail vs ticketDetails) within a small edit distance.
+
+Candidates are ranked by edit distance, then exact casing, then path proximity: how
+many of the directory names written in the import appear in the candidate's path and
+how much of its directory the candidate shares with the importing file. Lookups are
+memoized per name, so the repeated imports of a scan cost one dict hit.
+"""
+
+import os
+
+# Imports may name any of these for one another (TS resolves './x.js' to x.ts)
+SCRIPT_EXTENSIONS = frozenset({'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'})
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance of a and b, or limit + 1 as soon as it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_distance(name):
+    """Typos tolerated for a name: none for very short names, where any edit is another word."""
+    if len(name) <= 3:
+        return 0
+    return 1 if len(name) <= 6 else 2
+
+
+class NGramIndex:
+    """Trigram index of strings for approximate (Levenshtein) search.
+
+    One edit changes at most n of a string's n-grams, so a word within k edits of the
+    query shares at least (distinct query n-grams - k * n) of them; only those words
+    get the exact distance computed.
+    """
+
+    N = 3
+
+    def __init__(self, words=()):
+        self.words = []
+        # n-gram -> ids of the words containing it
+        self.postings = {}
+        for word in words:
+            self.add(word)
+
+    @classmethod
+    def grams(cls, word):
+        padded = f"{'^' * (cls.N - 1)}{word}{'$' * (cls.N - 1)}"
+        return {padded[i:i + cls.N] for i in range(len(padded) - cls.N + 1)}
+
+    def add(self, word):
+        word_id = len(self.words)
+        self.words.append(word)
+        for gram in self.grams(word):
+            self.postings.setdefault(gram, []).append(word_id)
+
+    def search(self, word, limit):
+        """[(distance, word)] of every word within ``limit`` edits of ``word``, closest first."""
+        grams = self.grams(word)
+        needed = len(grams) - limit * self.N
+        if needed <= 0:
+            candidates = range(len(self.words))
+        else:
+            shared = {}
+            for gram in grams:
+                for word_id in self.postings.get(gram, ()):
+                    shared[word_id] = shared.get(word_id, 0) + 1
+            candidates = [word_id for word_id, count in shared.items() if count >= needed]
+        found = []
+        for word_id in candidates:
+            distance = edit_distance(word, self.words[word_id], limit)
+            if distance <= limit:
+                found.append((distance, self.words[word_id]))
+        return sorted(found)
+
+
+class SuggestionIndex:
+    """Fuzzy, ranked lookup of import targets among the files of a ProjectIndex.
+
+    ``suffixes`` are the extensions an import may leave out (the first entry may be ''),
+    ``index_files`` the names that make a directory importable.
+    """
+
+    def __init__(self, index, suffixes, index_files):
+        self.index = index
+        self.suffixes = tuple(suffix for suffix in suffixes if suffix)
+        # folded name -> [(actual name, root-relative path of the target file)]
+        self.names = {}
+        for rel_path in sorted(index.files):
+            rel_dir, _, filename = rel_path.rpartition('/')
+            stem, ext = os.path.splitext(filename)
+            # Other files (images, JSON, ...) are imported with their extension
+            self._add(stem if ext in self.suffixes else filename, rel_path)
+            if filename in index_files and rel_dir:
+                self._add(rel_dir.rpartition('/')[2], rel_path)
+        self.grams = NGramIndex(self.names)
+        self._matches = {}
+
+    def _add(self, name, rel_path):
+        entries = self.names.setdefault(name.lower(), [])
+        if all(path != rel_path for _, path in entries):
+            entries.append((name, rel_path))
+
+    def _close_names(self, folded):
+        matches = self._matches.get(folded)
+        if matches is None:
+            limit = max_distance(folded)
+            if limit == 0:
+                matches = [(0, folded)] if folded in self.names else []
+            else:
+                matches = self.grams.search(folded, limit)
+            self._matches[folded] = matches
+        return matches
+
+    def rank(self, import_str, from_file=None):
+        """[(rank key, edit distance, root-relative path)] of every candidate, best first.
+
+        The rank key orders by distance, exact casing and path proximity; ties are then
+        broken by the shorter path.
+        """
+        parts = [part for part in import_str.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+        if not parts:
+            return []
+        name = parts[-1]
+        # An explicit extension (styles.css) only matches files of that type
+        wanted_ext = None
+        for suffix in self.suffixes:
+            if name.endswith(suffix) and len(name) > len(suffix):
+                name = name[:-len(suffix)]
+                wanted_ext = SCRIPT_EXTENSIONS if suffix in SCRIPT_EXTENSIONS else {suffix}
+                break
+        hints = {part.lower() for part in parts[:-1]}
+        from_dir = self.index.relpath(os.path.dirname(from_file)) if from_file else None
+        from_parts = from_dir.split('/') if from_dir else []
+
+        ranked = []
+        for distance, folded in self._close_names(name.lower()):
+            for actual, rel_path in self.names[folded]:
+                if wanted_ext is not None and os.path.splitext(rel_path)[1] not in wanted_ext:
+                    continue
+                dir_parts = rel_path.split('/')[:-1]
+                hits = sum(part.lower() in hints for part in dir_parts)
+                shared = 0
+                for mine, theirs in zip(from_parts, dir_parts):
+                    if mine != theirs:
+                        break
+                    shared += 1
+                ranked.append(((distance, actual != name, -hits, -shared), distance, rel_path))
+        ranked.sort(key=lambda item: (item[0], len(item[2]), item[2]))
+        return ranked
+
+    def suggest(self, import_str, from_file=None, limit=5):
+        """[(absolute path, edit distance)] of the likeliest targets of ``import_str``, best first.
+
+        ``from_file`` (absolute) is the importing file; candidates close to it rank higher.
+        """
+        return [(self.index.abspath(rel_path), distance)
+                for _, distance, rel_path in self.rank(import_str, from_file)[:limit]]
+
+    def best(self, import_str, from_file=None):
+        """(absolute path, distance, unambiguous) of the top suggestion, or None.
+
+        Unambiguous means no other candidate ranks the same on distance, casing and
+        path proximity, so the pick does not come down to path length alone.
+        """
+        ranked = self.rank(import_str, from_file)
+        if not ranked:
+            return None
+        key, distance, rel_path = ranked[0]
+        unambiguous = len(ranked) == 1 or ranked[1][0] != key
+        return self.index.abspath(rel_path), distance, unambiguous
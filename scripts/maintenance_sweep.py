@@ -0,0 +1,136 @@
+"""
+Full maintenance sweep: one tree traversal, one read per source file, every report.
+
+Loads the shared project index once (.gitignore-filtered, like fix.py), runs the
+import and translation analyzers over it in a single source scan (see source_scan.py)
+and produces from those results:
+  - the translation inspection report of inspect_translations.py,
+  - a fix.py plan with the broken relative imports and their suggested fixes,
+  - the import casing fixes fix_casing.py would make,
+  - the import graph summary of import_graph.py (cycles, unreachable modules,
+    heaviest chains).
+
+Nothing in the source tree is modified. Apply the plan with
+``python3 scripts/fix.py --apply <plan>`` and the casing fixes with fix_casing.py.
+
+Usage:
+    python3 scripts/maintenance_sweep.py
+    python3 scripts/maintenance_sweep.py --out-dir reports --skip graph
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(ROOT_DIR))
+
+import fix
+import fix_casing
+import import_graph
+import inspect_translations
+from source_scan import ImportAnalyzer, SourceScan
+
+SECTIONS = ('translations', 'imports', 'casing', 'graph')
+PLAN_NAME = 'import-fix-plan.json'
+
+
+def print_header(title):
+    print('\n' + '=' * 80)
+    print(title)
+    print('=' * 80 + '\n')
+
+
+def sweep_translations(index, scan, out_dir, report_format):
+    store = inspect_translations.LocaleStore()
+    all_locale_keys = inspect_translations.load_all_locales(store)
+    results = scan.results['translations']
+    used_keys = {key for facts in results.values() for key, _ in facts['sites']}
+    print(f'Found {len(results)} source files, {len(used_keys)} unique translation keys in code\n')
+    sources = [(os.path.relpath(index.abspath(rel_path), inspect_translations.SRC_DIR), facts['sites'], facts['hardcoded'])
+               for rel_path, facts in results.items()]
+    report_path = out_dir / inspect_translations.REPORT_WRITERS[report_format][1]
+    inspect_translations.report_inspection(sources, used_keys, store, all_locale_keys, report_format, report_path)
+
+
+def sweep_imports(index, scan, out_dir):
+    plan = {}
+    for file_path, findings in fix.scan_project(index, 1, scan):
+        for item in findings:
+            item['apply'] = item['verified']
+        if findings:
+            plan[file_path.relative_to(ROOT_DIR).as_posix()] = findings
+    plan_path = out_dir / PLAN_NAME
+    fix.write_plan(plan_path, plan)
+    items = [item for findings in plan.values() for item in findings]
+    to_apply = sum(item['apply'] for item in items)
+    unresolved = sum(item['new'] is None for item in items)
+    print(f"❌ {len(items)} broken relative imports in {len(plan)} files: {to_apply} verified fixes, "
+          f"{len(items) - to_apply - unresolved} to review, {unresolved} without a match")
+    print(f"📝 Plan written to {plan_path}")
+    print(f"   Apply with: python3 scripts/fix.py --apply {plan_path}")
+
+
+def sweep_casing(index, scan):
+    count = 0
+    for rel_path, imports in scan.results['imports'].items():
+        if not rel_path.endswith(fix_casing.EXTENSIONS):
+            continue
+        for line, imp_path, corrected_path in fix_casing.casing_fixes(index, index.abspath(rel_path), imports):
+            print(f"📝 {rel_path}:{line}: '{imp_path}' ➔ '{corrected_path}'")
+            count += 1
+    if count:
+        print(f"\n{count} imports to correct; run fix_casing.py from the repo root to apply them.")
+    else:
+        print("✅ No import casing to correct.")
+
+
+def sweep_graph(index, scan, top):
+    graph = import_graph.build_graph(index, scan)
+    import_graph.print_report(graph, import_graph.default_entries(ROOT_DIR), top)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run every source maintenance check in one pass over the tree")
+    parser.add_argument('--out-dir', type=Path, default=ROOT_DIR,
+                        help="Where to write the reports and the import fix plan (default: the repo root)")
+    parser.add_argument('--skip', action='append', default=[], choices=SECTIONS, help="Leave out a section; repeatable")
+    parser.add_argument('--report-format', choices=sorted(inspect_translations.REPORT_WRITERS), default='json',
+                        help="Translation report format (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=10, help="Rows per import graph section (default: %(default)s)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for reading and parsing files (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sections = [section for section in SECTIONS if section not in args.skip]
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    index = fix.get_project_skeleton(fix.parse_gitignore())
+    analyzers = [ImportAnalyzer()]
+    if 'translations' in sections:
+        analyzers.append(inspect_translations.TranslationAnalyzer())
+    scan = SourceScan(index, analyzers, jobs=args.jobs).run()
+    print(f"🔍 {len(scan.sizes)} source files: {scan.read_files} read, {scan.cached_files} unchanged since last run")
+    for rel_path, error in scan.errors.items():
+        print(f"   Warning: Error reading {rel_path}: {error}")
+
+    if 'translations' in sections:
+        print_header('🌐 TRANSLATIONS')
+        sweep_translations(index, scan, args.out_dir, args.report_format)
+    if 'imports' in sections:
+        print_header('🔗 BROKEN IMPORTS')
+        sweep_imports(index, scan, args.out_dir)
+    if 'casing' in sections:
+        print_header('🔠 IMPORT CASING')
+        sweep_casing(index, scan)
+    if 'graph' in sections:
+        print_header('🕸️  IMPORT GRAPH')
+        sweep_graph(index, scan, args.top)
+
+
+if __name__ == "__main__":
+    main()
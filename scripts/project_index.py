@@ -0,0 +1,279 @@
+"""
+Project file index shared by the import repair tools (scripts/fix.py,
+scripts/debug-tools.py and fix_casing.py).
+
+The tree is walked once with os.scandir and kept as:
+  - a directory listing cache (relative dir -> sorted [name, kind] entries),
+  - a basename -> paths multimap for "where does this file live" lookups,
+  - a case-insensitive path trie for resolving imports whose casing is off.
+
+Listings are persisted between runs. On the next run only directories whose mtime
+changed are listed again; the others are reused as-is (a directory's mtime changes
+whenever an entry is added, removed or renamed in it). When the walk is filtered by
+per-directory rule files (``ignore_files``, e.g. .gitignore), a change to such a file
+re-lists the whole subtree below it.
+"""
+
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_EXCLUDE_DIRS = frozenset({'.git', 'node_modules', 'dist', 'build', '.next'})
+CACHE_NAME = '.project-index-cache.json'
+CACHE_VERSION = 3
+
+# Entry kinds in a directory listing; linked directories are listed but not descended into.
+FILE, DIR, LINKED_DIR = 0, 1, 2
+
+
+class _TrieNode:
+    __slots__ = ('children',)
+
+    def __init__(self):
+        # case-folded name -> (actual name, child node); child is None for files
+        self.children = {}
+
+
+class ProjectIndex:
+    """Snapshot of the files under ``root``, minus excluded and ignored directories.
+
+    ``ignore(rel_path, is_dir)`` may filter further entries during the walk; ignored
+    directories are not descended into. Since a callable cannot be persisted, pass an
+    ``ignore_key`` that changes whenever its behaviour does, and name the rule files
+    it reads per directory in ``ignore_files``. The cache keeps one snapshot per
+    ``exclude_dirs``/``ignore_files`` combination (one per tool); a new ignore_key
+    replaces it. Paths outside ``root`` are answered from the filesystem.
+    """
+
+    def __init__(self, root, exclude_dirs=DEFAULT_EXCLUDE_DIRS, ignore=None, ignore_key='', ignore_files=()):
+        self.root = os.path.abspath(root)
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.ignore = ignore
+        self.ignore_files = tuple(ignore_files)
+        self.ignore_key = ignore_key
+        self.config_key = json.dumps([sorted(self.exclude_dirs), list(self.ignore_files)])
+        # relative dir ('' for root) -> [mtime_ns, [[name, kind], ...], rule files mtime_ns]
+        self.listings = {}
+        self.files = set()
+        self.by_basename = defaultdict(list)
+        self.trie = _TrieNode()
+        self.scanned_dirs = 0
+        self.reused_dirs = 0
+        self.changed = False
+        # Directories listed again whose entries were unchanged, only their mtime moved
+        self.restamped_dirs = set()
+
+    @classmethod
+    def load(cls, root, exclude_dirs=DEFAULT_EXCLUDE_DIRS, ignore=None, ignore_key='', ignore_files=(),
+             cache_path=True):
+        """Build the index, reusing the persisted listings of unchanged directories.
+
+        cache_path=True stores the cache as <root>/.project-index-cache.json;
+        None/False disables persistence.
+        """
+        index = cls(root, exclude_dirs, ignore, ignore_key, ignore_files)
+        if cache_path is True:
+            cache_path = os.path.join(index.root, CACHE_NAME)
+        stored = read_cache(cache_path, CACHE_VERSION, 'snapshots') if cache_path else {}
+        # [ignore_key, listings]; listings made under other ignore rules are not reused
+        snapshot = stored.get(index.config_key)
+        index._walk(snapshot[1] if snapshot and snapshot[0] == index.ignore_key else {})
+        # Only rewrite the cache when a listing or a directory mtime differs. Writing it
+        # touches the mtime of the directory holding it, so that directory alone is left
+        # to be re-listed next run; recording it would rewrite the cache on every run.
+        own_dir = index.relpath(os.path.dirname(os.path.abspath(cache_path))) if cache_path else None
+        if cache_path and (index.changed or index.restamped_dirs - {own_dir}):
+            stored[index.config_key] = [index.ignore_key, index.listings]
+            write_cache(cache_path, CACHE_VERSION, 'snapshots', stored)
+        return index
+
+    def _walk(self, previous):
+        # (relative dir, whether a rule file above it changed)
+        stack = [('', False)]
+        while stack:
+            rel_dir, rules_changed = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir)
+            try:
+                mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            rules_mtime = self._rules_mtime(abs_dir)
+            cached = previous.get(rel_dir)
+            rules_changed = rules_changed or cached is None or cached[2] != rules_mtime
+            if not rules_changed and cached[0] == mtime:
+                entries = cached[1]
+                self.reused_dirs += 1
+            else:
+                entries = self._scan(rel_dir, abs_dir)
+                self.scanned_dirs += 1
+                if cached is None or cached[1] != entries or cached[2] != rules_mtime:
+                    self.changed = True
+                elif cached[0] != mtime:
+                    # e.g. an editor's temp file came and went; store the new mtime
+                    # or the directory is listed again on every run
+                    self.restamped_dirs.add(rel_dir)
+            self.listings[rel_dir] = [mtime, entries, rules_mtime]
+            self._add_entries(rel_dir, entries)
+            # Reversed so directories are visited in sorted (os.walk-like) order.
+            for name, kind in reversed(entries):
+                if kind == DIR:
+                    stack.append((f'{rel_dir}/{name}' if rel_dir else name, rules_changed))
+
+    def _rules_mtime(self, abs_dir):
+        mtime = 0
+        for name in self.ignore_files:
+            try:
+                mtime = max(mtime, os.stat(os.path.join(abs_dir, name)).st_mtime_ns)
+            except OSError:
+                pass
+        return mtime
+
+    def _scan(self, rel_dir, abs_dir):
+        entries = []
+        try:
+            with os.scandir(abs_dir) as it:
+                for entry in it:
+                    if entry.name.startswith(CACHE_NAME):
+                        continue
+                    rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir and entry.name in self.exclude_dirs:
+                        continue
+                    if self.ignore is not None and self.ignore(rel_path, is_dir):
+                        continue
+                    if is_dir:
+                        entries.append([entry.name, LINKED_DIR if entry.is_symlink() else DIR])
+                    else:
+                        entries.append([entry.name, FILE])
+        except OSError:
+            pass
+        entries.sort()
+        return entries
+
+    def _add_entries(self, rel_dir, entries):
+        node = self._node(rel_dir, create=True)
+        for name, kind in entries:
+            folded = name.lower()
+            if kind == FILE:
+                rel_path = f'{rel_dir}/{name}' if rel_dir else name
+                self.files.add(rel_path)
+                self.by_basename[name].append(rel_path)
+                node.children.setdefault(folded, (name, None))
+            else:
+                previous = node.children.get(folded)
+                if previous is None or previous[1] is None:
+                    node.children[folded] = (name, _TrieNode())
+
+    def _node(self, rel_dir, create=False):
+        node = self.trie
+        if not rel_dir:
+            return node
+        for part in rel_dir.split('/'):
+            child = node.children.get(part.lower())
+            if child is None or child[1] is None:
+                if not create:
+                    return None
+                child = node.children[part.lower()] = (part, _TrieNode())
+            node = child[1]
+        return node
+
+    def relpath(self, path):
+        """Index key of an absolute or root-relative path, or None if outside the root."""
+        rel_path = os.path.relpath(os.path.normpath(os.path.join(self.root, path)), self.root)
+        if rel_path == '.':
+            return ''
+        if rel_path == '..' or rel_path.startswith('..' + os.sep):
+            return None
+        return rel_path.replace(os.sep, '/')
+
+    def abspath(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def is_file(self, path):
+        rel_path = self.relpath(path)
+        if rel_path is None:
+            return os.path.isfile(path)
+        return rel_path in self.files
+
+    def is_dir(self, path):
+        rel_path = self.relpath(path)
+        if rel_path is None:
+            return os.path.isdir(path)
+        return rel_path in self.listings or self._is_linked_dir(rel_path)
+
+    def exists(self, path):
+        return self.is_file(path) or self.is_dir(path)
+
+    def _is_linked_dir(self, rel_path):
+        parent, _, name = rel_path.rpartition('/')
+        listing = self.listings.get(parent)
+        return listing is not None and [name, LINKED_DIR] in listing[1]
+
+    def listdir(self, path):
+        """Cached entry names of a directory (os.listdir for directories outside the root)."""
+        rel_path = self.relpath(path)
+        if rel_path is None:
+            return os.listdir(path)
+        listing = self.listings.get(rel_path)
+        return [name for name, _ in listing[1]] if listing is not None else []
+
+    def find(self, basename):
+        """Absolute paths of every indexed file named ``basename``, in walk order."""
+        return [self.abspath(rel_path) for rel_path in self.by_basename.get(basename, ())]
+
+    def iter_files(self, extensions=None):
+        """Absolute Paths of the indexed files, directory by directory in walk order."""
+        suffixes = tuple(extensions) if extensions is not None else None
+        for rel_dir, (_, entries, _) in self.listings.items():
+            for name, kind in entries:
+                if kind == FILE and (suffixes is None or name.endswith(suffixes)):
+                    yield Path(self.root, rel_dir, name)
+
+    def actual_case(self, dir_path, part):
+        """Name on disk matching ``part`` case-insensitively inside ``dir_path``, or None."""
+        rel_dir = self.relpath(dir_path)
+        if rel_dir is None:
+            try:
+                names = os.listdir(dir_path)
+            except OSError:
+                return None
+            folded = part.lower()
+            for name in names:
+                if name.lower() == folded:
+                    return name
+            return None
+        node = self._node(rel_dir)
+        if node is None:
+            return None
+        folded = part.lower()
+        child = node.children.get(folded)
+        return child[0] if child is not None else None
+
+
+def read_cache(cache_path, version, field):
+    """``field`` of a JSON cache written by write_cache; {} if it is missing, unreadable or of another version."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if stored.get('version') != version:
+        return {}
+    return stored.get(field, {})
+
+
+def write_cache(cache_path, version, field, value):
+    """Atomically replace the JSON cache at ``cache_path`` with {version, field: value}."""
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, field: value}, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache only saves time; a read-only checkout still works.
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
@@ -0,0 +1,233 @@
+"""
+Single-pass source scanner shared by the repo maintenance scripts (fix.py,
+debug-tools.py, import_graph.py, maintenance_sweep.py, ../fix_casing.py and
+../inspect_translations.py).
+
+The files come from the shared project index (see project_index.py), so nothing is
+walked twice. Every file is read once, decoded with Python's universal newlines
+(what open(..., 'r') would give) and handed to every analyzer that wants it. Files
+of MMAP_THRESHOLD bytes or more (bundles, generated code) are decoded straight from
+a memory map instead of being read into a bytes buffer first.
+
+An analyzer is a subclass of Analyzer with a unique ``name``, a ``version`` (bump it
+whenever its results change shape or meaning), ``wants(rel_path)`` and
+``analyze(rel_path, content)``, which returns JSON-serializable facts about that one
+file. Checks that depend on other files (does this import resolve?) belong to the
+caller, after the scan, against the index.
+
+Facts are cached in .source-scan-cache.json per file (mtime + size) and per analyzer
+version: a file is only read again when it changed or when an analyzer that has not
+seen it yet asks for it.
+"""
+
+import mmap
+import multiprocessing
+import os
+import re
+from bisect import bisect_right
+
+from project_index import FILE, read_cache, write_cache
+
+CACHE_NAME = '.source-scan-cache.json'
+CACHE_VERSION = 1
+MMAP_THRESHOLD = 1024 * 1024
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
+STATIC, REQUIRE, DYNAMIC = 'static', 'require', 'dynamic'
+IMPORT_RE = re.compile(
+    r"""(?<![\w$.])(?:import|export)\s+(?:type\s+)?(?:[\w$*{}\s,]+?\s*from\s*)?['"]([^'"\n]+)['"]"""
+    r"""|(?<![\w$.])require\s*\(\s*['"]([^'"\n]+)['"]\s*\)"""
+    r"""|(?<![\w$.])import\s*\(\s*['"]([^'"\n]+)['"]\s*\)"""
+)
+# Comments are blanked before matching (usage examples in doc comments are not imports);
+# string literals are matched first so '//' or '/*' inside them is left alone.
+COMMENT_RE = re.compile(
+    r"""('(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)|/\*.*?\*/|//[^\n]*""",
+    re.DOTALL,
+)
+NOT_NEWLINE_RE = re.compile(r'[^\n]')
+
+
+def _blank_comment(match):
+    # Same length and line breaks, so offsets and line numbers stay valid
+    return match.group(1) or NOT_NEWLINE_RE.sub(' ', match.group(0))
+
+
+def extract_imports(content):
+    """[[specifier, kind, line], ...] of every import in ``content``, in source order.
+
+    ``line`` is the line of the specifier itself, which is where a rewrite has to happen.
+    """
+    content = COMMENT_RE.sub(_blank_comment, content)
+    imports = []
+    line_starts = None
+    for match in IMPORT_RE.finditer(content):
+        if line_starts is None:
+            line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+        static, required, dynamic = match.groups()
+        spec, kind = (static, STATIC) if static else (required, REQUIRE) if required else (dynamic, DYNAMIC)
+        imports.append([spec, kind, bisect_right(line_starts, match.start(match.lastindex))])
+    return imports
+
+
+def read_source(path):
+    """Text of a source file, decoded like open(path, 'r', encoding='utf-8') would.
+
+    Raises OSError and UnicodeDecodeError.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, 'utf-8')
+        else:
+            content = f.read().decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+class Analyzer:
+    """Base class of the per-file analyzers run by SourceScan.
+
+    ``roots`` limits an analyzer to these root-relative directories (None: everywhere).
+    """
+
+    name = None
+    version = 1
+    extensions = JS_EXTENSIONS
+    roots = None
+
+    def wants(self, rel_path):
+        if not rel_path.endswith(self.extensions):
+            return False
+        return self.roots is None or any(rel_path.startswith(f'{root}/') for root in self.roots)
+
+    def analyze(self, rel_path, content):
+        raise NotImplementedError
+
+
+class ImportAnalyzer(Analyzer):
+    """Every import, export-from, require() and import() as [specifier, kind, line] (see extract_imports)."""
+
+    name = 'imports'
+
+    def analyze(self, rel_path, content):
+        return extract_imports(content)
+
+
+# Set once per scan worker by _init_worker.
+_ANALYZERS = None
+
+
+def _init_worker(analyzers):
+    global _ANALYZERS
+    _ANALYZERS = {analyzer.name: analyzer for analyzer in analyzers}
+
+
+def _scan_task(task):
+    """(rel_path, {analyzer name: facts}, error) of one file (pool task)."""
+    rel_path, path, names = task
+    try:
+        content = read_source(path)
+    except (OSError, UnicodeDecodeError) as e:
+        return rel_path, None, str(e)
+    return rel_path, {name: _ANALYZERS[name].analyze(rel_path, content) for name in names}, None
+
+
+class SourceScan:
+    """One pass of ``analyzers`` over the files of a ProjectIndex.
+
+    After run(), ``results[analyzer name]`` maps the root-relative path of every file
+    the analyzer wants to its facts, in index walk order. ``sizes`` has the byte size of
+    every scanned file; files that could not be read or decoded are in ``errors``
+    instead and have no results.
+    """
+
+    def __init__(self, index, analyzers, cache_path=True, jobs=1):
+        self.index = index
+        self.analyzers = list(analyzers)
+        if cache_path is True:
+            cache_path = os.path.join(index.root, CACHE_NAME)
+        self.cache_path = cache_path
+        self.jobs = jobs
+        self.results = {analyzer.name: {} for analyzer in self.analyzers}
+        self.sizes = {}
+        self.errors = {}
+        self.read_files = 0
+        self.cached_files = 0
+
+    def _files(self):
+        for rel_dir, (_, entries, _) in self.index.listings.items():
+            for name, kind in entries:
+                if kind == FILE:
+                    rel_path = f'{rel_dir}/{name}' if rel_dir else name
+                    names = [analyzer.name for analyzer in self.analyzers if analyzer.wants(rel_path)]
+                    if names:
+                        yield rel_path, names
+
+    def run(self):
+        cached = read_cache(self.cache_path, CACHE_VERSION, 'files') if self.cache_path else {}
+        versions = {analyzer.name: analyzer.version for analyzer in self.analyzers}
+        files = []
+        facts = {}
+        entries = {}
+        tasks = []
+        for rel_path, names in self._files():
+            path = self.index.abspath(rel_path)
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                self.errors[rel_path] = str(e)
+                continue
+            files.append((rel_path, names))
+            self.sizes[rel_path] = st.st_size
+            entry = cached.get(rel_path)
+            if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                entry = [st.st_mtime_ns, st.st_size, {}]
+            entries[rel_path] = entry
+            stored = entry[2]
+            facts[rel_path] = {name: stored[name][1] for name in names
+                               if name in stored and stored[name][0] == versions[name]}
+            missing = [name for name in names if name not in facts[rel_path]]
+            if missing:
+                tasks.append((rel_path, path, missing))
+
+        if self.jobs > 1 and len(tasks) > 1:
+            with multiprocessing.Pool(self.jobs, initializer=_init_worker, initargs=(self.analyzers,)) as pool:
+                scanned = pool.map(_scan_task, tasks, chunksize=max(1, len(tasks) // (self.jobs * 4)))
+        else:
+            _init_worker(self.analyzers)
+            scanned = map(_scan_task, tasks)
+        for rel_path, new_facts, error in scanned:
+            if error is not None:
+                self.errors[rel_path] = error
+                continue
+            facts[rel_path].update(new_facts)
+            for name, value in new_facts.items():
+                entries[rel_path][2][name] = [versions[name], value]
+        self.read_files = len(tasks)
+        self.cached_files = len(files) - len(tasks)
+
+        for rel_path, names in files:
+            if rel_path in self.errors:
+                continue
+            for name in names:
+                self.results[name][rel_path] = facts[rel_path][name]
+
+        if self.cache_path:
+            # Entries of files this index does not cover (other ignore rules, other
+            # analyzers' roots) are kept for as long as the files exist.
+            pruned = False
+            for rel_path, entry in cached.items():
+                if rel_path in entries:
+                    continue
+                if os.path.isfile(self.index.abspath(rel_path)):
+                    entries[rel_path] = entry
+                else:
+                    pruned = True
+            for rel_path in self.errors:
+                pruned = entries.pop(rel_path, None) is not None or pruned
+            if tasks or pruned:
+                write_cache(self.cache_path, CACHE_VERSION, 'files', entries)
+        return self
+
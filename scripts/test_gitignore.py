@@ -0,0 +1,178 @@
+"""
+Table-driven checks of the gitignore matcher (gitignore.py).
+
+Every case is created on disk below a temporary directory holding ROOT_RULES as its
+.gitignore and SUB_RULES as sub/.gitignore. The expected results are what
+``git check-ignore`` says for the same tree; when git is available they are checked
+against it too, so the table cannot drift from git's semantics.
+
+Usage:
+    python3 scripts/test_gitignore.py
+    python3 -m pytest scripts/test_gitignore.py
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from gitignore import FILENAME, GitIgnore
+
+ROOT_RULES = [
+    '# comment',
+    '*.log',
+    '!keep.log',
+    '/build',
+    'dist/',
+    'docs/**/*.tmp',
+    '**/cache',
+    'logs/**',
+    'a/**/b',
+    '[Tt]humbs.db',
+    'file[0-9].txt',
+    '[!a-c]x.cfg',
+    'tmp?',
+    '\\#hash',
+    'trail\\ ',
+    'spaces   ',
+    '\\!bang',
+]
+SUB_RULES = [
+    '*.txt',
+    '!important.txt',
+    '!trace.log',
+    '/local',
+]
+
+# (path, is_dir, ignored)
+CASES = [
+    # unanchored patterns match at any depth, negation re-includes
+    ('debug.log', False, True),
+    ('sub/x/debug.log', False, True),
+    ('keep.log', False, False),
+    ('sub/keep.log', False, False),
+    # a leading slash anchors to the .gitignore directory
+    ('build', True, True),
+    ('sub/build', True, False),
+    # a trailing slash only matches directories
+    ('dist', True, True),
+    ('sub/dist', True, True),
+    ('out/dist', False, False),
+    # ** in middle, leading and trailing position
+    ('docs/a.tmp', False, True),
+    ('docs/x/y/a.tmp', False, True),
+    ('other/a.tmp', False, False),
+    ('cache', True, True),
+    ('deep/cache', True, True),
+    ('logs/x', False, True),
+    ('logs', True, False),
+    ('a/b', True, True),
+    ('a/x/y/b', True, True),
+    ('z/a/b', True, False),
+    # bracket classes, negated classes and ?
+    ('Thumbs.db', False, True),
+    ('thumbs.db', False, True),
+    ('THUMBS.db', False, False),
+    ('file5.txt', False, True),
+    ('filex.txt', False, False),
+    ('dx.cfg', False, True),
+    ('ax.cfg', False, False),
+    ('tmp1', False, True),
+    ('tmp12', False, False),
+    # escaped #, ! and trailing space; unescaped trailing spaces are dropped
+    ('#hash', False, True),
+    ('!bang', False, True),
+    ('trail ', False, True),
+    ('trail', False, False),
+    ('spaces', False, True),
+    ('spaces ', False, False),
+    # sub/.gitignore applies below sub/ only and wins over the root file
+    ('sub/notes.txt', False, True),
+    ('sub/deep/notes.txt', False, True),
+    ('sub/important.txt', False, False),
+    ('notes.txt', False, False),
+    ('sub/local', True, True),
+    ('sub/x/local', True, False),
+    ('trace.log', False, True),
+    ('sub/trace.log', False, False),
+    # nothing inside an ignored directory can be re-included
+    ('build/keep.log', False, True),
+    ('dist/keep.log', False, True),
+]
+
+
+def make_tree():
+    """Temporary directory with both .gitignore files and every case path created."""
+    root = tempfile.mkdtemp(prefix='gitignore-test-')
+    os.makedirs(os.path.join(root, 'sub'))
+    for rel_dir, rules in (('', ROOT_RULES), ('sub', SUB_RULES)):
+        with open(os.path.join(root, rel_dir, FILENAME), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(rules) + '\n')
+    for rel_path, is_dir, _ in CASES:
+        path = os.path.join(root, *rel_path.split('/'))
+        if is_dir:
+            os.makedirs(path, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+    return root
+
+
+def test_cases():
+    root = make_tree()
+    try:
+        ignore = GitIgnore(root)
+        wrong = [(rel_path, expected) for rel_path, is_dir, expected in CASES
+                 if ignore.is_ignored(rel_path, is_dir) != expected]
+        assert not wrong, f"expected (path, ignored): {wrong}"
+    finally:
+        shutil.rmtree(root)
+
+
+def test_cases_match_git():
+    if shutil.which('git') is None:
+        return
+    root = make_tree()
+    try:
+        subprocess.run(['git', 'init', '-q', root], check=True)
+        # a global excludes file would add rules of its own
+        proc = subprocess.run(['git', '-c', 'core.excludesFile=', 'check-ignore', '-z', '--stdin'], cwd=root,
+                              capture_output=True, input=''.join(f'{rel_path}\0' for rel_path, _, _ in CASES).encode('utf-8'))
+        assert proc.returncode in (0, 1), proc.stderr.decode('utf-8', 'replace')
+        ignored = set(proc.stdout.decode('utf-8').split('\0'))
+        wrong = [(rel_path, expected) for rel_path, _, expected in CASES if (rel_path in ignored) != expected]
+        assert not wrong, f"git disagrees with the table (path, ignored): {wrong}"
+    finally:
+        shutil.rmtree(root)
+
+
+def test_match_assumes_parents_not_ignored():
+    root = make_tree()
+    try:
+        ignore = GitIgnore(root)
+        assert ignore.match('build/keep.log') is False
+        assert ignore.is_ignored('build/keep.log') is True
+        assert ignore('build', True) is True
+    finally:
+        shutil.rmtree(root)
+
+
+def test_extra_patterns_precede_root_file():
+    root = make_tree()
+    try:
+        ignore = GitIgnore(root, ['*.bak', 'keep.log', '!debug.log'])
+        assert ignore.is_ignored('x.bak') is True
+        assert ignore.is_ignored('sub/x.bak') is True
+        # the root .gitignore comes after the extra patterns, so its lines win
+        assert ignore.is_ignored('keep.log') is False
+        assert ignore.is_ignored('debug.log') is True
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    tests = [test for name, test in sorted(globals().items()) if name.startswith('test_')]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"\n{len(tests)} checks passed")